@@ -4,14 +4,33 @@ import time
 
 from abc import ABC
 
+from concurrent.futures import ThreadPoolExecutor
+
+from game_record import GameRecord
+
+from http_cache import HTTPCache
+
 from logger import logger
 
-from requests import get, Response, Timeout, ConnectionError, HTTPError, RequestException
+from metrics import metrics
+
+from rate_limiter import TokenBucket
+
+from requests import Session, Response, Timeout, ConnectionError, HTTPError, RequestException
+
+from requests.adapters import HTTPAdapter
 
-from typing import Iterable
+from typing import Callable, Iterable
 
 from random import choice
 
+from threading import Event, BoundedSemaphore
+
+from urllib.parse import urlparse
+
+from urllib3.util.retry import Retry
+
+
 
 class Request:
     
@@ -24,13 +43,101 @@ class Request:
 
 class API(ABC):
 
-    def __init__(self, api_key: str) -> None:
+    _rate_limits: dict[str, tuple[float, float]] = {}
+    _max_in_flight: int = 8
+    _max_retries: int = 3
+    _pool_connections: int = 4
+    _pool_maxsize: int = 8
+    _hosts_pool_maxsize: dict[str, int] = {}
+    _hosts_max_in_flight: dict[str, int] = {}
+    _retry_total: int = 2
+    _retry_backoff_factor: float = 0.5
+    _retry_status_forcelist: tuple[int, ...] = (500, 502, 503, 504)
+    _http_cache_ttls_sec: dict[str, (float | None)] = {}
+    _metrics_endpoints: tuple[str, ...] = ()
+    _not_found_statuses: tuple[int, ...] = (404, 410)
+
+    def __init__(self, api_key: str, rate_limiters: (dict[str, TokenBucket] | None) = None, session: (Session | None) = None, http_cache: (HTTPCache | None) = None) -> None:
         self._api_key = api_key
+        self._http_cache = http_cache
+        self._rate_limiters = rate_limiters if rate_limiters is not None else {host: TokenBucket(rate, capacity) for host, (rate, capacity) in self._rate_limits.items()}
+        self._session = session if session is not None else self.__create_session()
+        self._hosts_semaphores = {host: BoundedSemaphore(max_in_flight) for host, max_in_flight in self._hosts_max_in_flight.items()}
+        
+    def pool_statistics(self) -> dict[str, dict[str, int]]:
+        statistics = {}
+        
+        for adapter in set(self._session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            
+            for pool_key in pools.keys():
+                pool = pools[pool_key]
+                host_statistics = statistics.setdefault(f"{pool_key.key_host}:{pool_key.key_port}", {"connections": 0, "requests": 0, "idle_connections": 0})
+                host_statistics["connections"] += pool.num_connections
+                host_statistics["requests"] += pool.num_requests
+                host_statistics["idle_connections"] += pool.pool.qsize() if pool.pool else 0
+                
+        return statistics
+    
+    def close(self) -> None:
+        self._session.close()
 
     def _make_get_request(self, request: Request) -> Response:
-        response = get(request.url, request.params, headers=request.headers, timeout=request.timeout)
-        response.raise_for_status()
-        return response
+        url = urlparse(request.url)
+        host = url.hostname
+        endpoint = self.__get_metrics_endpoint(url.path)
+        rate_limiter = self._rate_limiters.get(host)
+        host_semaphore = self._hosts_semaphores.get(host)
+        http_cache_rule = self.__find_http_cache_rule(request.url)
+        cache_entry = self._http_cache.get(request.url, request.params) if http_cache_rule is not None else None
+        headers = request.headers
+        throttled_retries = 0
+        server_error_retries = 0
+        
+        if cache_entry is not None:
+            
+            if cache_entry["fresh"]:
+                metrics.increment("http_cache_hits_total", host=host, endpoint=endpoint)
+                return self._http_cache.create_response(cache_entry)
+            
+            headers = dict(request.headers or {}, **self._http_cache.get_conditional_headers(cache_entry))
+        
+        while True:
+            
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            
+            if host_semaphore is not None:
+                with host_semaphore:
+                    response = self.__send_get_request(request, headers, host, endpoint)
+            else:
+                response = self.__send_get_request(request, headers, host, endpoint)
+            
+            if response.status_code == 429 and rate_limiter is not None and throttled_retries < self._max_retries:
+                logger.warning(f"Limite de peticiones alcanzado en {response.url}, reintentando")
+                rate_limiter.throttle(self.__get_retry_after_sec(response))
+                throttled_retries += 1
+                continue
+            
+            if response.status_code in self._retry_status_forcelist and rate_limiter is not None and server_error_retries < self._retry_total:
+                # Los hosts con limite de peticiones no reintentan en el adaptador, asi cada reintento consume su token
+                time.sleep(self._retry_backoff_factor * 2 ** server_error_retries)
+                server_error_retries += 1
+                continue
+            
+            if response.status_code == 304 and cache_entry is not None:
+                cache_entry = self._http_cache.refresh(request.url, request.params, response, self._http_cache_ttls_sec[http_cache_rule]) or cache_entry
+                response = self._http_cache.create_response(cache_entry)
+            
+            elif http_cache_rule is not None and response.ok:
+                self._http_cache.store(request.url, request.params, response, self._http_cache_ttls_sec[http_cache_rule])
+            
+            response.raise_for_status()
+            
+            if rate_limiter is not None:
+                rate_limiter.reward()
+                
+            return response
     
     def _make_tolerant_get_request(self, request: Request) -> (Response | None):
         try:
@@ -41,54 +148,44 @@ class API(ABC):
             raise
             
         except HTTPError as e:
-            logger.error(repr(e))
+            if e.response is None or e.response.status_code not in self._not_found_statuses:
+                logger.error(repr(e))
+                raise
+            
+            logger.info(repr(e))
             
         except RequestException as e:
             logger.error(repr(e))
+            raise
 
-    def _make_get_requests(self, requests: list[Request], save_responses: list[Response]) -> None:
-        while len(requests) > 0:
-
-            try:
-                response = self._make_get_request(requests[-1])
-                save_responses.append(response)
-                del requests[-1]
-
-            except Timeout as e:
-                logger.error(repr(e))
-
-            except ConnectionError as e:
-                logger.error(repr(e))
-                raise
-
-            except HTTPError as e:
-                logger.error(repr(e))
-                raise
-
-            except RequestException as e:
-                logger.error(repr(e))
-                raise
-
-    def _make_get_requests_in_chunks(self, requests: list[Request], chunk_size: int, chunk_wait_sec: float) -> list[Response]:
-        chunked_requests = [requests[start_slice:start_slice+chunk_size] for start_slice in range(0, len(requests), chunk_size)]
-        responses = []
+    def _make_concurrent_get_requests(self, requests: list[Request], max_in_flight: (int | None) = None, connection_lost: (Event | None) = None) -> list[Response]:
+        connection_lost = connection_lost if connection_lost is not None else Event()
         
-        while len(chunked_requests) > 0:
-
-            try:
-                self._make_get_requests(chunked_requests[-1], responses)
-                del chunked_requests[-1]
+        def make_request(request: Request) -> (Response | None):
+            for _ in range(self._max_retries + 1):
                 
-            except ConnectionError as e:
-                logger.warning("Conexión perdida: "+ str(e))
-                break
-            
-            except RequestException as e:
-                logger.warning("Ocurrio un error mientras se realizaban peticiones a la API: " + str(e))  
-                break
+                if connection_lost.is_set():
+                    return None
+                
+                try:
+                    return self._make_get_request(request)
+                
+                except Timeout as e:
+                    logger.error(repr(e))
+                
+                except ConnectionError as e:
+                    logger.warning("Conexión perdida: " + str(e))
+                    connection_lost.set()
                 
-            if chunked_requests:
-                time.sleep(chunk_wait_sec)
+                except RequestException as e:
+                    logger.warning("Ocurrio un error mientras se realizaban peticiones a la API: " + str(e))
+                    return None
+        
+        with ThreadPoolExecutor(max_workers=max_in_flight or self._max_in_flight) as executor:
+            responses = [response for response in executor.map(make_request, requests) if response is not None]
+        
+        if self._http_cache is not None:
+            self._http_cache.close_finished_threads_connections()
             
         return responses
     
@@ -97,67 +194,173 @@ class API(ABC):
         response = self._make_tolerant_get_request(request)
         image_bytes = response.content if response else None 
         return image_bytes
+    
+    def __create_session(self) -> Session:
+        session = Session()
+        retry = Retry(total=self._retry_total, backoff_factor=self._retry_backoff_factor, status_forcelist=self._retry_status_forcelist, allowed_methods=("GET",), respect_retry_after_header=False, raise_on_status=False)
+        no_retry = Retry(total=0, raise_on_status=False)
+        
+        session.mount("http://", HTTPAdapter(self._pool_connections, self._pool_maxsize, retry))
+        session.mount("https://", HTTPAdapter(self._pool_connections, self._pool_maxsize, retry))
+        
+        for host in dict.fromkeys(list(self._hosts_pool_maxsize) + list(self._rate_limiters)):
+            host_retry = no_retry if host in self._rate_limiters else retry
+            pool_maxsize = self._hosts_pool_maxsize.get(host, self._pool_maxsize)
+            session.mount(f"https://{host}", HTTPAdapter(1, pool_maxsize, host_retry))
+            session.mount(f"http://{host}", HTTPAdapter(1, pool_maxsize, host_retry))
+        
+        return session
+    
+    def __send_get_request(self, request: Request, headers: (dict[str] | None), host: str, endpoint: str) -> Response:
+        start = time.perf_counter()
+        
+        try:
+            response = self._session.get(request.url, params=request.params, headers=headers, timeout=request.timeout)
+        
+        except RequestException as e:
+            metrics.increment("http_request_errors_total", host=host, endpoint=endpoint, error=type(e).__name__)
+            raise
+        
+        metrics.observe("http_request_seconds", time.perf_counter() - start, host=host, endpoint=endpoint)
+        metrics.increment("http_requests_total", host=host, endpoint=endpoint, status=str(response.status_code))
+        metrics.increment("http_response_bytes_total", len(response.content), host=host)
+        
+        return response
+    
+    def __find_http_cache_rule(self, url: str) -> (str | None):
+        if self._http_cache is None:
+            return None
+        
+        path = urlparse(url).path
+        return next((path_prefix for path_prefix in self._http_cache_ttls_sec if path.startswith(path_prefix)), None)
+    
+    def __get_metrics_endpoint(self, path: str) -> str:
+        return next((path_prefix for path_prefix in self._metrics_endpoints if path.startswith(path_prefix)), "other")
+    
+    def __get_retry_after_sec(self, response: Response) -> (float | None):
+        retry_after = response.headers.get("Retry-After")
+        return float(retry_after) if retry_after and retry_after.isdigit() else None
 
 
 class SteamAPI(API):
 
+    _rate_limits = {"store.steampowered.com": (65 / 70, 5)}
+    _hosts_pool_maxsize = {"store.steampowered.com": 8, "steamcdn-a.akamaihd.net": 16}
+    _hosts_max_in_flight = {"steamcdn-a.akamaihd.net": 8}
+    _http_cache_ttls_sec = {"/ISteamUser/GetPlayerSummaries": 0, "/IPlayerService/GetOwnedGames": 0}
+    _metrics_endpoints = ("/ISteamUser/GetPlayerSummaries", "/IPlayerService/GetOwnedGames", "/api/appdetails", "/steam/apps/")
+    _api_url = "https://api.steampowered.com"
+    _store_url = "https://store.steampowered.com"
+    _cdn_url = "https://steamcdn-a.akamaihd.net"
+    _app_details_filters = "basic,developers,publishers,categories,genres,release_date"
+
     def get_player_summaries(self, steam_id: str) -> (dict[str, str] | None):
-        request = Request("https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v0002", {"key": self._api_key, "steamids": steam_id})
+        request = Request(f"{self._api_url}/ISteamUser/GetPlayerSummaries/v0002", {"key": self._api_key, "steamids": steam_id})
         response = self._make_get_request(request).json()["response"]["players"]
         player_summaries = {"steamid": steam_id, "personaname": response[0]["personaname"], "avatarfull": response[0]["avatarfull"], "profileurl": response[0]["profileurl"]} if response else None
         return player_summaries
 
     def get_owned_games(self, steam_id: str) -> (dict[int, str] | None):
-        request = Request("https://api.steampowered.com/IPlayerService/GetOwnedGames/v1", {"key": self._api_key, "steamid": steam_id, "include_appinfo": 1})
+        request = Request(f"{self._api_url}/IPlayerService/GetOwnedGames/v1", {"key": self._api_key, "steamid": steam_id, "include_appinfo": 1})
         response = self._make_get_request(request).json()["response"]
         owned_games = {game["appid"]: game["name"] for game in response["games"]} if response else None
         return owned_games
 
-    def get_apps_details(self, steam_apps_ids: Iterable[int], owned_games: dict[int, str]) -> dict[int, dict[str]]:
-        requests = [Request("http://store.steampowered.com/api/appdetails", {"key": self._api_key, "appids": steam_appid}) for steam_appid in steam_apps_ids]
-        responses = self._make_get_requests_in_chunks(requests, 65, 70)
+    def get_apps_details(self, steam_apps_ids: Iterable[int], owned_games: dict[int, str], on_chunk: (Callable[[dict[int, GameRecord], list[int]], None] | None) = None, 
+                         chunk_size: int = 200) -> tuple[dict[int, GameRecord], list[int]]:
+        steam_apps_ids = list(steam_apps_ids)
+        connection_lost = Event()
         apps_details = {}
+        failed_apps_ids = []
         
-        for response in responses:
+        for start_slice in range(0, len(steam_apps_ids), chunk_size):
+            requests = [self._create_app_details_request(steam_appid) for steam_appid in steam_apps_ids[start_slice:start_slice+chunk_size]]
+            responses = self._make_concurrent_get_requests(requests, connection_lost=connection_lost)
+            chunk_apps_details = {}
+            chunk_failed_apps_ids = []
+            
+            for response in responses:
+                
+                steam_appid, app_details = self._parse_app_details_response(response, owned_games)
+                
+                if app_details is None:
+                    chunk_failed_apps_ids.append(steam_appid)
+                else:
+                    chunk_apps_details[steam_appid] = app_details
             
-            steam_appid, response = response.json().popitem()
-            steam_appid = int(steam_appid)
-            app_details = {}
-            data = response.get("data", {})
+            if on_chunk is not None:
+                on_chunk(chunk_apps_details, chunk_failed_apps_ids)
                 
-            app_details["description"] = data.get("detailed_description", "")
-            app_details["developers"] = data.get("developers", [])
-            app_details["publishers"] = data.get("publishers", [])
-            app_details["categories"] = [categorie["description"] for categorie in data.get("categories", [])]
-            app_details["genres"] = [genre["description"] for genre in data.get("genres", [])]
-            app_details["release_date"] = data.get("release_date", {}).get("date", "")
-            app_details["name"] = owned_games[steam_appid]
+            apps_details.update(chunk_apps_details)
+            failed_apps_ids.extend(chunk_failed_apps_ids)
             
-            apps_details[steam_appid] = app_details
+            if connection_lost.is_set():
+                logger.warning(f"Conexión perdida, se obtuvieron {len(apps_details) + len(failed_apps_ids)} de {len(steam_apps_ids)} juegos")
+                break
             
-        return apps_details
+        return apps_details, failed_apps_ids
+    
+    def _create_app_details_request(self, steam_appid: int) -> Request:
+        params = {"key": self._api_key, "appids": steam_appid}
+        
+        if self._app_details_filters:
+            params["filters"] = self._app_details_filters
+        
+        return Request(f"{self._store_url}/api/appdetails", params)
+    
+    def _parse_app_details_response(self, response: Response, owned_games: dict[int, str]) -> tuple[int, (GameRecord | None)]:
+        start = time.perf_counter()
+        metrics.increment("appdetails_response_bytes_total", len(response.content))
+        metrics.increment("appdetails_responses_total")
+        
+        steam_appid, response = response.json().popitem()
+        steam_appid = int(steam_appid)
+        metrics.observe("appdetails_parse_seconds", time.perf_counter() - start)
+        
+        if not response.get("success") or not isinstance(response.get("data", {}), dict):
+            return steam_appid, None
+        
+        data = response.get("data", {})
+        app_details = GameRecord(owned_games[steam_appid], 
+                                 data.get("detailed_description", ""), 
+                                 data.get("developers", []), 
+                                 data.get("publishers", []), 
+                                 [categorie["description"] for categorie in data.get("categories", [])], 
+                                 [genre["description"] for genre in data.get("genres", [])], 
+                                 data.get("release_date", {}).get("date", ""))
+        
+        return steam_appid, app_details
     
     def get_grid(self, steam_appid: int) -> (tuple[bytes, str] | None):
-        grid_bytes = self._request_image_bytes(f"https://steamcdn-a.akamaihd.net/steam/apps/{steam_appid}/library_600x900_2x.jpg")
+        grid_bytes = self._request_image_bytes(f"{self._cdn_url}/steam/apps/{steam_appid}/library_600x900_2x.jpg")
         grid = (grid_bytes, "jpg") if grid_bytes else None
         return grid
     
     def get_heroe(self, steam_appid: int) -> (tuple[bytes, str] | None):
-        heroe_bytes = self._request_image_bytes(f"https://steamcdn-a.akamaihd.net/steam/apps/{steam_appid}/library_hero.jpg")
+        heroe_bytes = self._request_image_bytes(f"{self._cdn_url}/steam/apps/{steam_appid}/library_hero.jpg")
         heroe = (heroe_bytes, "jpg") if heroe_bytes else None
         return heroe
         
 
 class SteamGridAPI(API):
 
+    _rate_limits = {"www.steamgriddb.com": (5, 10)}
+    _hosts_pool_maxsize = {"www.steamgriddb.com": 8, "cdn2.steamgriddb.com": 16}
+    _hosts_max_in_flight = {"www.steamgriddb.com": 4, "cdn2.steamgriddb.com": 8}
+    _retry_total = 3
+    _retry_backoff_factor = 1
+    _http_cache_ttls_sec = {"/api/v2/grids/steam/": 86400, "/api/v2/heroes/steam/": 86400}
+    _metrics_endpoints = ("/api/v2/grids/steam/", "/api/v2/heroes/steam/", "/grid/", "/hero/", "/file/")
+    _api_url = "https://www.steamgriddb.com/api/v2"
+
     def get_grid(self, steam_appid: int) -> (tuple[bytes, str] | None):
-        request = Request(f"https://www.steamgriddb.com/api/v2/grids/steam/{steam_appid}", {"dimensions": "600x900"}, {"Authorization": f"Bearer {self._api_key}"})
+        request = Request(f"{self._api_url}/grids/steam/{steam_appid}", {"dimensions": "600x900"}, {"Authorization": f"Bearer {self._api_key}"})
         response = self._make_tolerant_get_request(request)
         grid = self.__get_image_bytes_and_file_type_from_response(response) if response else None
         return grid
     
     def get_heroe(self, steam_appid: int) -> (tuple[bytes, str] | None):
-        request = Request(f"https://www.steamgriddb.com/api/v2/heroes/steam/{steam_appid}", {"dimensions": "1920x620"}, {"Authorization": f"Bearer {self._api_key}"})
+        request = Request(f"{self._api_url}/heroes/steam/{steam_appid}", {"dimensions": "1920x620"}, {"Authorization": f"Bearer {self._api_key}"})
         response = self._make_tolerant_get_request(request)
         heroe = self.__get_image_bytes_and_file_type_from_response(response) if response else None
         return heroe
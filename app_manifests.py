@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+
+from logger import logger
+from vdf import lower_keys, parse_vdf
+
+
+MANIFEST_NAME_PATTERN = re.compile(r"appmanifest_(\d+)\.acf", re.IGNORECASE)
+
+
+class AppManifestScanner:
+
+    UPDATE_REQUIRED = 2
+    FULLY_INSTALLED = 4
+    UPDATING = 256 | 512 | 1024
+
+    def __init__(self, steam_path: str) -> None:
+        self.__steam_apps_path: str = os.path.join(steam_path, "steamapps")
+        self.__library_folders_path: str = os.path.join(self.__steam_apps_path, "libraryfolders.vdf")
+        self.__lock: threading.Lock = threading.Lock()
+        self.__manifests: dict[str, tuple[int, int, (int | None), (int | None)]] = {}
+        self.__library_folders: tuple[(int | None), list[str]] = (None, [])
+
+    def get_games_states(self) -> dict[int, str]:
+        with self.__lock:
+            scanned_manifests = {}
+
+            for steam_apps_path in self.__get_steam_apps_paths():
+                self.__scan_steam_apps_folder(steam_apps_path, scanned_manifests)
+
+            self.__manifests = scanned_manifests
+
+            return {steam_appid: self.get_state(state_flags) for _, _, steam_appid, state_flags in scanned_manifests.values() if steam_appid is not None}
+
+    def get_library_folders(self) -> list[str]:
+        with self.__lock:
+            return self.__get_steam_apps_paths()
+
+    @classmethod
+    def get_state(cls, state_flags: int) -> str:
+        if state_flags & cls.FULLY_INSTALLED:
+            return "Installed, need to update" if state_flags & cls.UPDATE_REQUIRED else "Installed"
+
+        if state_flags & cls.UPDATING:
+            return "Not installed, updating"
+
+        return "?"
+
+    def __get_steam_apps_paths(self) -> list[str]:
+        try:
+            mtime_ns = os.stat(self.__library_folders_path).st_mtime_ns
+
+        except OSError:
+            return [self.__steam_apps_path]
+
+        if self.__library_folders[0] != mtime_ns:
+            self.__library_folders = (mtime_ns, self.__read_library_folders())
+
+        steam_apps_paths = [self.__steam_apps_path] + self.__library_folders[1]
+        return list(dict.fromkeys(os.path.normcase(os.path.normpath(steam_apps_path)) for steam_apps_path in steam_apps_paths))
+
+    def __read_library_folders(self) -> list[str]:
+        try:
+            with open(self.__library_folders_path, encoding="utf-8", errors="replace") as library_folders_file:
+                library_folders = lower_keys(parse_vdf(library_folders_file.read())).get("libraryfolders", {})
+
+        except (OSError, ValueError) as e:
+            logger.error(f"No se pudo leer el archivo {self.__library_folders_path}: {e!r}")
+            return []
+
+        steam_apps_paths = []
+
+        for key, library_folder in library_folders.items():
+            if not key.isdigit():
+                continue
+
+            library_path = lower_keys(library_folder).get("path") if isinstance(library_folder, dict) else library_folder
+
+            if isinstance(library_path, str) and library_path:
+                steam_apps_paths.append(os.path.join(library_path, "steamapps"))
+
+        return steam_apps_paths
+
+    def __scan_steam_apps_folder(self, steam_apps_path: str, scanned_manifests: dict[str, tuple[int, int, (int | None), (int | None)]]) -> None:
+        try:
+            entries = list(os.scandir(steam_apps_path))
+
+        except OSError:
+            return
+
+        for entry in entries:
+            if not MANIFEST_NAME_PATTERN.fullmatch(entry.name):
+                continue
+
+            try:
+                stat = entry.stat()
+
+            except OSError:
+                continue
+
+            cached_manifest = self.__manifests.get(entry.path)
+
+            if cached_manifest is not None and cached_manifest[:2] == (stat.st_mtime_ns, stat.st_size):
+                scanned_manifests[entry.path] = cached_manifest
+            else:
+                scanned_manifests[entry.path] = (stat.st_mtime_ns, stat.st_size) + self.__read_manifest(entry.path)
+
+    def __read_manifest(self, manifest_path: str) -> tuple[(int | None), (int | None)]:
+        try:
+            with open(manifest_path, encoding="utf-8", errors="replace") as manifest_file:
+                app_state = lower_keys(lower_keys(parse_vdf(manifest_file.read())).get("appstate", {}))
+
+            return int(app_state["appid"]), int(app_state.get("stateflags", 0))
+
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            logger.error(f"No se pudo leer el manifiesto {manifest_path}: {e!r}")
+
+        return None, None
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from apis import API, SteamAPI, SteamGridAPI
+from game_record import GameRecord
+from logger import logger
+from requests import ConnectionError, RequestException, Timeout
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class AsyncAPI:
+
+    def __init__(self, api: API, max_in_flight: int = 16) -> None:
+        self._api = api
+        self.__max_in_flight: int = max_in_flight
+        self.__semaphores: dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+    async def _run(self, function: Callable[..., T], *args: Any) -> T:
+        # Cancelling only drops the result, a request already sent keeps running in its thread and keeps its slot until it ends
+        semaphore = self.__get_semaphore()
+        await semaphore.acquire()
+
+        def release_slot(future: asyncio.Future) -> None:
+            semaphore.release()
+
+            if not future.cancelled():
+                future.exception()
+
+        future = asyncio.ensure_future(asyncio.to_thread(function, *args))
+        future.add_done_callback(release_slot)
+
+        return await asyncio.shield(future)
+
+    def __get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+
+        if loop not in self.__semaphores:
+            self.__semaphores = {loop: asyncio.Semaphore(self.__max_in_flight)}
+
+        return self.__semaphores[loop]
+
+    def close(self) -> None:
+        self._api.close()
+
+
+class AsyncSteamAPI(AsyncAPI):
+
+    def __init__(self, api_key_or_api: (str | SteamAPI), max_in_flight: int = 16) -> None:
+        super().__init__(api_key_or_api if isinstance(api_key_or_api, SteamAPI) else SteamAPI(api_key_or_api), max_in_flight)
+
+    async def get_player_summaries(self, steam_id: str) -> (dict[str, str] | None):
+        return await self._run(self._api.get_player_summaries, steam_id)
+
+    async def get_owned_games(self, steam_id: str) -> (dict[int, str] | None):
+        return await self._run(self._api.get_owned_games, steam_id)
+
+    async def get_apps_details(self, steam_apps_ids: Iterable[int], owned_games: dict[int, str]) -> tuple[dict[int, GameRecord], list[int]]:
+        results = await asyncio.gather(*(self.__get_app_details(steam_appid, owned_games) for steam_appid in steam_apps_ids))
+        apps_details = {}
+        failed_apps_ids = []
+
+        for result in results:
+
+            if result is None:
+                continue
+
+            steam_appid, app_details = result
+
+            if app_details is None:
+                failed_apps_ids.append(steam_appid)
+            else:
+                apps_details[steam_appid] = app_details
+
+        return apps_details, failed_apps_ids
+
+    async def get_grid(self, steam_appid: int) -> (tuple[bytes, str] | None):
+        return await self._run(self._api.get_grid, steam_appid)
+
+    async def get_heroe(self, steam_appid: int) -> (tuple[bytes, str] | None):
+        return await self._run(self._api.get_heroe, steam_appid)
+
+    async def __get_app_details(self, steam_appid: int, owned_games: dict[int, str]) -> (tuple[int, (GameRecord | None)] | None):
+        try:
+            response = await self._run(self._api._make_get_request, self._api._create_app_details_request(steam_appid))
+            return self._api._parse_app_details_response(response, owned_games)
+
+        except (Timeout, ConnectionError) as e:
+            logger.warning("Conexión perdida: " + str(e))
+
+        except RequestException as e:
+            logger.warning("Ocurrio un error mientras se realizaban peticiones a la API: " + str(e))
+
+        return None
+
+
+class AsyncSteamGridAPI(AsyncAPI):
+
+    def __init__(self, api_key_or_api: (str | SteamGridAPI), max_in_flight: int = 16) -> None:
+        super().__init__(api_key_or_api if isinstance(api_key_or_api, SteamGridAPI) else SteamGridAPI(api_key_or_api), max_in_flight)
+
+    async def get_grid(self, steam_appid: int) -> (tuple[bytes, str] | None):
+        return await self._run(self._api.get_grid, steam_appid)
+
+    async def get_heroe(self, steam_appid: int) -> (tuple[bytes, str] | None):
+        return await self._run(self._api.get_heroe, steam_appid)
+
+
+def run_blocking(awaitable: Awaitable[T]) -> T:
+    try:
+        asyncio.get_running_loop()
+
+    except RuntimeError:
+        return asyncio.run(awaitable)
+
+    result = {}
+
+    def run_in_thread() -> None:
+        try:
+            result["value"] = asyncio.run(awaitable)
+
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run_in_thread)
+    thread.start()
+    thread.join()
+
+    if "error" in result:
+        raise result["error"]
+
+    return result["value"]
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+
+@contextmanager
+def atomic_write(file_path: str, mode: str = "wb") -> Iterator[IO]:
+    file_folder_path = os.path.dirname(file_path) or "."
+    os.makedirs(file_folder_path, exist_ok=True)
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=file_folder_path, prefix=".", suffix=".tmp")
+
+    try:
+        with os.fdopen(file_descriptor, mode) as temporary_file:
+            yield temporary_file
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+
+        os.replace(temporary_path, file_path)
+
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
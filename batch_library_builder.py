@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+
+from apis import SteamAPI, SteamGridAPI
+from atomic_file import atomic_write
+from concurrent.futures import ThreadPoolExecutor
+from databases import GamesDatabase
+from http_cache import HTTPCache
+from image_store import ImageStore
+from library_data_manager import LibraryDataManager
+from logger import logger
+from stage_pipeline import StagePipeline
+from steam import Steam
+from typing import Iterable
+
+
+class BatchLibraryBuilder:
+
+    def __init__(self, steam_ids: Iterable[str], steam_api_key: str, steam_grid_api_key: str, max_workers: int = 4, 
+                 steam_api: (SteamAPI | None) = None, steam_grid_api: (SteamGridAPI | None) = None, 
+                 games_db: (GamesDatabase | None) = None, image_store: (ImageStore | None) = None,
+                 report_path: str = os.path.join("library", "data", "batch_report.json")) -> None:
+        self.__steam_ids: list[str] = list(dict.fromkeys(str(steam_id) for steam_id in steam_ids))
+        self.__max_workers: int = max_workers
+        self.__report_path: str = report_path
+        self.__steam: Steam = Steam()
+        http_cache = HTTPCache() if steam_api is None or steam_grid_api is None else None
+        self.__owned_resources: list[SteamAPI | SteamGridAPI | GamesDatabase | HTTPCache] = [http_cache] if http_cache is not None else []
+        
+        if steam_api is None:
+            steam_api = SteamAPI(steam_api_key, http_cache=http_cache)
+            self.__owned_resources.append(steam_api)
+        
+        if steam_grid_api is None:
+            steam_grid_api = SteamGridAPI(steam_grid_api_key, http_cache=http_cache)
+            self.__owned_resources.append(steam_grid_api)
+        
+        if games_db is None:
+            games_db = GamesDatabase()
+            self.__owned_resources.append(games_db)
+        
+        image_store = image_store or ImageStore()
+        self.__data_managers: dict[str, LibraryDataManager] = {steam_id: LibraryDataManager(steam_id, steam_api_key, steam_grid_api_key, steam_api, steam_grid_api, games_db, image_store) 
+                                                               for steam_id in self.__steam_ids}
+    
+    def build(self) -> dict[str]:
+        start = time.perf_counter()
+        
+        with ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix="account") as executor:
+            accounts = dict(zip(self.__steam_ids, executor.map(self.__get_account, self.__steam_ids)))
+            accounts_sec = time.perf_counter() - start
+            
+            owned_games = {}
+            owned_games_count = 0
+            
+            for user_data, account_owned_games in accounts.values():
+                if user_data is not None and account_owned_games is not None:
+                    owned_games.update(account_owned_games)
+                    owned_games_count += len(account_owned_games)
+            
+            shared_stages = self.__fetch_shared_data(owned_games)
+            steam_installation = self.__steam.is_steam_installed()
+            
+            libraries_start = time.perf_counter()
+            results = dict(zip(self.__steam_ids, executor.map(lambda steam_id: self.__write_library(steam_id, *accounts[steam_id], steam_installation), self.__steam_ids)))
+            libraries_sec = time.perf_counter() - libraries_start
+        
+        report = {"accounts": results,
+                  "owned_games": owned_games_count,
+                  "unique_games": len(owned_games),
+                  "deduplicated_games": owned_games_count - len(owned_games),
+                  "images": shared_stages.get("images", {}),
+                  "timings": dict(shared_stages.get("timings", {}), accounts=accounts_sec, libraries=libraries_sec, total=time.perf_counter() - start)}
+        
+        self.__write_report(report)
+        
+        return report
+    
+    def close(self) -> None:
+        for resource in self.__owned_resources:
+            resource.close()
+            
+        self.__owned_resources.clear()
+    
+    def __enter__(self) -> BatchLibraryBuilder:
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def __get_account(self, steam_id: str) -> tuple[(dict[str, str] | None), (dict[int, str] | None)]:
+        data_manager = self.__data_managers[steam_id]
+        user_data = data_manager.get_user_data()
+        owned_games = data_manager.get_owned_games() if user_data is not None else None
+        
+        return user_data, owned_games
+    
+    def __fetch_shared_data(self, owned_games: dict[int, str]) -> dict[str]:
+        if not owned_games:
+            return {}
+        
+        data_manager = self.__data_managers[self.__steam_ids[0]]
+        pipeline = StagePipeline()
+        # Sin revalidacion en segundo plano, el proceso termina en cuanto se escriben las librerias
+        pipeline.add_stage("games_details", lambda: data_manager.get_games_details(owned_games, max_revalidations=0))
+        pipeline.add_stage("images", lambda: data_manager.get_images(owned_games))
+        shared_stages = pipeline.run()
+        shared_stages["timings"] = {name: elapsed_sec for name, elapsed_sec in pipeline.timings.items() if name != "total"}
+        
+        return shared_stages
+    
+    def __write_library(self, steam_id: str, user_data: (dict[str, str] | None), owned_games: (dict[int, str] | None), steam_installation: dict[str, bool]) -> dict[str]:
+        if user_data is None:
+            return {"response": "account information error"}
+        
+        if owned_games is None:
+            return {"response": "error games account"}
+        
+        try:
+            data_manager = self.__data_managers[steam_id]
+            library_data = {"response": "success", "user_data": user_data}
+            library_data.update(data_manager.get_stored_games_data(owned_games))
+            library_data.update(steam_installation)
+            data_manager.write_library_data(library_data)
+            
+            return {"response": "success", "games_count": len(library_data["games_data"])}
+        
+        except Exception as e:
+            logger.error(f"Ocurrio un error mientras se creaba la libreria de la cuenta {steam_id}: {e!r}")
+            
+        return {"response": "library error"}
+    
+    def __write_report(self, report: dict[str]) -> None:
+        try:
+            with atomic_write(self.__report_path, "w") as report_file:
+                json.dump(report, report_file, indent=5)
+        
+        except IOError as e:
+            logger.error(f"No se pudo escribir el reporte del lote en {self.__report_path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Crea las librerias de varias cuentas de Steam compartiendo cache y limites de peticiones")
+    parser.add_argument("steam_ids", nargs="+")
+    parser.add_argument("--steam-api-key", required=True)
+    parser.add_argument("--steam-grid-api-key", required=True)
+    parser.add_argument("--max-workers", type=int, default=4)
+    arguments = parser.parse_args()
+    
+    with BatchLibraryBuilder(arguments.steam_ids, arguments.steam_api_key, arguments.steam_grid_api_key, arguments.max_workers) as builder:
+        report = builder.build()
+        
+    print(json.dumps(report, indent=5))
+
+
+if __name__ == "__main__":
+    main()
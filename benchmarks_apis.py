@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+import time
+
+from apis import SteamAPI
+from requests import Response
+
+
+def create_full_app_details(steam_appid: int) -> dict[str]:
+    description = "<h1>About</h1><p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 60 + "</p>"
+    requirements = {"minimum": "<strong>Minimum:</strong><ul><li>OS: Windows 10</li><li>Memory: 8 GB RAM</li></ul>" * 4,
+                    "recommended": "<strong>Recommended:</strong><ul><li>OS: Windows 11</li><li>Memory: 16 GB RAM</li></ul>" * 4}
+
+    return {"type": "game", "name": f"Game {steam_appid}", "steam_appid": steam_appid, "required_age": 0, "is_free": False,
+            "detailed_description": description, "about_the_game": description, "short_description": "Lorem ipsum " * 20,
+            "supported_languages": "English<strong>*</strong>, French, German, Spanish - Spain, Japanese<br><strong>*</strong>languages with full audio support",
+            "header_image": f"https://cdn.akamai.steamstatic.com/steam/apps/{steam_appid}/header.jpg",
+            "pc_requirements": requirements, "mac_requirements": requirements, "linux_requirements": requirements,
+            "developers": [f"Developer {steam_appid % 300}"], "publishers": [f"Publisher {steam_appid % 200}"],
+            "price_overview": {"currency": "EUR", "initial": 1999, "final": 999, "discount_percent": 50, "final_formatted": "9,99€"},
+            "packages": [steam_appid * 10 + index for index in range(4)],
+            "package_groups": [{"name": "default", "subs": [{"packageid": steam_appid * 10 + index, "option_text": f"Edition {index} - 9,99€", "price_in_cents_with_discount": 999}
+                                                           for index in range(4)]}],
+            "platforms": {"windows": True, "mac": False, "linux": False},
+            "categories": [{"id": index, "description": f"Category {index}"} for index in range(8)],
+            "genres": [{"id": str(index), "description": f"Genre {index}"} for index in range(3)],
+            "screenshots": [{"id": index, "path_thumbnail": f"https://cdn.akamai.steamstatic.com/steam/apps/{steam_appid}/ss_{index:040x}.600x338.jpg",
+                             "path_full": f"https://cdn.akamai.steamstatic.com/steam/apps/{steam_appid}/ss_{index:040x}.1920x1080.jpg"} for index in range(20)],
+            "movies": [{"id": index, "name": f"Trailer {index}", "thumbnail": f"https://cdn.akamai.steamstatic.com/steam/apps/{index}/movie.jpg",
+                        "webm": {"480": f"https://cdn.akamai.steamstatic.com/steam/apps/{index}/movie480.webm", "max": f"https://cdn.akamai.steamstatic.com/steam/apps/{index}/movie_max.webm"},
+                        "mp4": {"480": f"https://cdn.akamai.steamstatic.com/steam/apps/{index}/movie480.mp4", "max": f"https://cdn.akamai.steamstatic.com/steam/apps/{index}/movie_max.mp4"},
+                        "highlight": True} for index in range(4)],
+            "achievements": {"total": 50, "highlighted": [{"name": f"Achievement {index}", "path": f"https://cdn.akamai.steamstatic.com/{index}.jpg"} for index in range(10)]},
+            "release_date": {"coming_soon": False, "date": "14 Jan, 2021"},
+            "support_info": {"url": "", "email": "support@example.com"},
+            "content_descriptors": {"ids": [], "notes": None}}
+
+
+def create_filtered_app_details(full_app_details: dict[str]) -> dict[str]:
+    basic_fields = ("type", "name", "steam_appid", "required_age", "is_free", "detailed_description", "about_the_game", "short_description", "supported_languages",
+                    "header_image", "pc_requirements", "mac_requirements", "linux_requirements")
+    return {field: full_app_details[field] for field in basic_fields + tuple(SteamAPI._app_details_filters.split(",")[1:])}
+
+
+def create_response(steam_appid: int, app_details: dict[str]) -> Response:
+    response = Response()
+    response.status_code = 200
+    response.encoding = "utf-8"
+    response._content = json.dumps({str(steam_appid): {"success": True, "data": app_details}}).encode()
+    return response
+
+
+def benchmark_parse(responses: list[Response], owned_games: dict[int, str]) -> float:
+    steam_api = SteamAPI("key", {})
+    start = time.perf_counter()
+
+    for response in responses:
+        steam_api._parse_app_details_response(response, owned_games)
+
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'apps':>6} {'payload':>9} {'bytes/app':>10} {'parse (s)':>10} {'us/app':>8}")
+
+    for apps_count in (100, 1000, 10000):
+        owned_games = {steam_appid: f"Game {steam_appid}" for steam_appid in range(1, apps_count + 1)}
+        full_apps_details = {steam_appid: create_full_app_details(steam_appid) for steam_appid in owned_games}
+
+        for payload_name, create_app_details in (("full", lambda app_details: app_details), ("filtered", create_filtered_app_details)):
+            responses = [create_response(steam_appid, create_app_details(app_details)) for steam_appid, app_details in full_apps_details.items()]
+            bytes_per_app = sum(len(response.content) for response in responses) / apps_count
+            parse_sec = benchmark_parse(responses, owned_games)
+            print(f"{apps_count:>6} {payload_name:>9} {bytes_per_app:>10.0f} {parse_sec:>10.4f} {parse_sec / apps_count * 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
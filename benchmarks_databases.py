@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+
+from databases import GamesDatabase
+
+
+def create_games_data(games_count: int) -> dict[int, dict[str]]:
+    return {app_id: {"description": f"<p>Description {app_id}</p>" * 20,
+                     "developers": [f"Developer {app_id % 300}"],
+                     "publishers": [f"Publisher {app_id % 200}"],
+                     "categories": ["Single-player", "Steam Achievements", "Full controller support"],
+                     "genres": ["Action", "Indie"],
+                     "release_date": "14 Jan, 2021",
+                     "name": f"Game {app_id}"} for app_id in range(1, games_count + 1)}
+
+
+def add_and_get_games_row_by_row(games_data: dict[int, dict[str]]) -> tuple[float, float]:
+    games_db = GamesDatabase(journal_mode=None, synchronous=None, cache_size=None)
+
+    start = time.perf_counter()
+    for app_id, game in games_data.items():
+        games_db.add_games({app_id: game})
+    write_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for app_id in games_data:
+        games_db.get_games([app_id])
+    read_sec = time.perf_counter() - start
+
+    games_db.close()
+    return write_sec, read_sec
+
+
+def add_and_get_games_in_bulk(games_data: dict[int, dict[str]]) -> tuple[float, float]:
+    games_db = GamesDatabase()
+
+    start = time.perf_counter()
+    games_db.add_games(games_data)
+    write_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    games_db.get_games(games_data)
+    read_sec = time.perf_counter() - start
+
+    games_db.close()
+    return write_sec, read_sec
+
+
+def main() -> None:
+    print(f"{'games':>7} {'path':>12} {'write (s)':>10} {'read (s)':>10}")
+
+    for games_count in (100, 1000, 10000):
+        games_data = create_games_data(games_count)
+
+        for path_name, benchmark in (("row by row", add_and_get_games_row_by_row), ("bulk", add_and_get_games_in_bulk)):
+            with tempfile.TemporaryDirectory() as working_directory:
+                previous_directory = os.getcwd()
+                os.chdir(working_directory)
+
+                try:
+                    write_sec, read_sec = benchmark(games_data)
+                finally:
+                    os.chdir(previous_directory)
+
+            print(f"{games_count:>7} {path_name:>12} {write_sec:>10.4f} {read_sec:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
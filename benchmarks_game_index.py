@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import random
+import time
+
+from game_index import GameIndex
+
+
+GENRES = ["Action", "Adventure", "Indie", "RPG", "Strategy", "Simulation", "Casual", "Racing", "Sports", "Puzzle"]
+CATEGORIES = ["Single-player", "Multi-player", "Co-op", "Steam Achievements", "Full controller support", "Steam Cloud", "Trading Cards", "VR Support"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+WORDS = ["dark", "souls", "space", "quest", "legend", "city", "star", "night", "war", "farm", "tales", "hero", "dungeon", "racer", "island"]
+
+
+def create_games_data(games_count: int) -> dict[int, dict[str]]:
+    randomizer = random.Random(games_count)
+    return {app_id: {"name": " ".join(randomizer.sample(WORDS, 3)) + f" {app_id}",
+                     "developers": [f"Developer {randomizer.randrange(games_count // 5)}"],
+                     "publishers": [f"Publisher {randomizer.randrange(games_count // 10)}"],
+                     "categories": randomizer.sample(CATEGORIES, 3),
+                     "genres": randomizer.sample(GENRES, 2),
+                     "release_date": f"{randomizer.randint(1, 28)} {randomizer.choice(MONTHS)}, {randomizer.randint(1998, 2024)}"} for app_id in range(1, games_count + 1)}
+
+
+def scan_games(games_data: dict[int, dict[str]], genre: (str | None), category: (str | None), search: (str | None), sort_by: str) -> list[int]:
+    steam_apps_ids = [steam_appid for steam_appid, game in games_data.items() 
+                      if (genre is None or genre in game["genres"]) and (category is None or category in game["categories"]) and (not search or search in game["name"].lower())]
+    return sorted(steam_apps_ids, key=lambda steam_appid: str(games_data[steam_appid][sort_by]).lower())
+
+
+def measure(function, repetitions: int = 20) -> float:
+    start = time.perf_counter()
+    
+    for _ in range(repetitions):
+        function()
+        
+    return (time.perf_counter() - start) / repetitions
+
+
+def main() -> None:
+    print(f"{'games':>7} {'query':>32} {'matches':>8} {'scan (ms)':>10} {'index (ms)':>11} {'count (us)':>11}")
+
+    for games_count in (10000, 50000):
+        games_data = create_games_data(games_count)
+        
+        start = time.perf_counter()
+        games_index = GameIndex(games_data)
+        print(f"{games_count:>7} {'build':>32} {'':>8} {'':>10} {(time.perf_counter() - start) * 1000:>11.1f}")
+        
+        for label, genre, category, search, sort_by in (("genre AND category by release", "Action", "Co-op", None, "release_date"), 
+                                                        ("genre by name", "Puzzle", None, None, "name"),
+                                                        ("search", None, None, "dungeon", "name"),
+                                                        ("genre AND category AND search", "RPG", "Steam Cloud", "star", "name")):
+            genres = [genre] if genre else ()
+            categories = [category] if category else ()
+            matches = games_index.count(genres, categories, search=search)
+            scan_sec = measure(lambda: scan_games(games_data, genre, category, search, sort_by))
+            index_sec = measure(lambda: games_index.query(genres, categories, search=search, sort_by=sort_by))
+            count_sec = measure(lambda: games_index.count(genres, categories, search=search), 200)
+            print(f"{games_count:>7} {label:>32} {matches:>8} {scan_sec * 1000:>10.2f} {index_sec * 1000:>11.2f} {count_sec * 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import gc
+import tracemalloc
+
+from game_record import GameRecord
+from typing import Callable
+
+
+GENRES = ("Action", "Adventure", "Indie", "RPG", "Strategy", "Simulation", "Casual", "Sports")
+CATEGORIES = ("Single-player", "Multi-player", "Steam Achievements", "Full controller support", "Steam Cloud", "Steam Trading Cards")
+
+
+def create_rows(games_count: int) -> list[tuple]:
+    # Strings are rebuilt for every game, as sqlite3 and json do when they return rows
+    return [(app_id, "", "".join(["14 Jan, ", str(2000 + app_id % 24)]), "".join(["Game ", str(app_id)]),
+             ["".join(["Developer ", str(app_id % 300)])], ["".join(["Publisher ", str(app_id % 200)])],
+             ["".join([category]) for index, category in enumerate(CATEGORIES) if app_id % (index + 2) == 0],
+             ["".join([genre]) for index, genre in enumerate(GENRES) if app_id % (index + 2) == 0]) for app_id in range(1, games_count + 1)]
+
+
+def create_dicts(rows: list[tuple]) -> dict[int, dict[str]]:
+    return {app_id: {"description": description, "developers": developers, "publishers": publishers, "categories": categories, "genres": genres,
+                     "release_date": release_date, "name": name} for app_id, description, release_date, name, developers, publishers, categories, genres in rows}
+
+
+def create_records(rows: list[tuple]) -> dict[int, GameRecord]:
+    return {app_id: GameRecord(name, description, developers, publishers, categories, genres, release_date)
+            for app_id, description, release_date, name, developers, publishers, categories, genres in rows}
+
+
+def measure_games_data(games_count: int, create_games_data: Callable[[list[tuple]], dict]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    games_data = create_games_data(create_rows(games_count))
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del games_data
+
+    return memory
+
+
+def main() -> None:
+    print(f"{'games':>7} {'shape':>8} {'memory (MiB)':>13} {'bytes/game':>11}")
+
+    for games_count in (10000, 50000):
+        for shape_name, create_games_data in (("dict", create_dicts), ("record", create_records)):
+            memory = measure_games_data(games_count, create_games_data)
+            print(f"{games_count:>7} {shape_name:>8} {memory / 1024 / 1024:>13.2f} {memory / games_count:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from apis import SteamAPI, SteamGridAPI
+from fake_http_server import FakeHTTPServer
+from http_cache import HTTPCache
+from library import Library
+from library_data_manager import LibraryDataManager
+from metrics import metrics
+from rate_limiter import TokenBucket
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+GENRES = ("Action", "Adventure", "Indie", "RPG", "Strategy", "Simulation", "Casual", "Sports")
+CATEGORIES = ("Single-player", "Multi-player", "Steam Achievements", "Full controller support", "Steam Cloud", "Steam Trading Cards")
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def create_image_bytes() -> bytes:
+    if Image is None:
+        return b"\xff\xd8\xff\xe0" + b"\x00" * 2048 + b"\xff\xd9"
+
+    image_file = io.BytesIO()
+    Image.new("RGB", (120, 180), (40, 90, 160)).save(image_file, format="JPEG", quality=80)
+    return image_file.getvalue()
+
+
+def create_app_details(steam_appid: int) -> dict[str]:
+    return {"detailed_description": f"<h1>Game {steam_appid}</h1><p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40 + "</p>",
+            "developers": [f"Developer {steam_appid % 300}"],
+            "publishers": [f"Publisher {steam_appid % 200}"],
+            "categories": [{"id": index, "description": category} for index, category in enumerate(CATEGORIES) if steam_appid % (index + 2) == 0],
+            "genres": [{"id": str(index), "description": genre} for index, genre in enumerate(GENRES) if steam_appid % (index + 2) == 0],
+            "release_date": {"coming_soon": False, "date": f"{steam_appid % 28 + 1} {MONTHS[steam_appid % 12]}, {2000 + steam_appid % 24}"}}
+
+
+def create_routes(games_count: int) -> dict[str]:
+    image_bytes = create_image_bytes()
+
+    def json_response(body: dict[str]) -> tuple[int, dict[str, str], bytes]:
+        return 200, {"Content-Type": "application/json"}, json.dumps(body).encode()
+
+    def player_summaries_route(path, query, headers):
+        return json_response({"response": {"players": [{"steamid": query["steamids"][0], "personaname": "Benchmark", "avatarfull": "", "profileurl": ""}]}})
+
+    def owned_games_route(path, query, headers):
+        return json_response({"response": {"game_count": games_count, "games": [{"appid": steam_appid, "name": f"Game {steam_appid}"} for steam_appid in range(1, games_count + 1)]}})
+
+    def app_details_route(path, query, headers):
+        steam_appid = int(query["appids"][0])
+        return json_response({str(steam_appid): {"success": True, "data": create_app_details(steam_appid)}})
+
+    def image_route(path, query, headers):
+        return 200, {"Content-Type": "image/jpeg"}, image_bytes + path.encode()
+
+    return {"/ISteamUser/GetPlayerSummaries": player_summaries_route, "/IPlayerService/GetOwnedGames": owned_games_route,
+            "/api/appdetails": app_details_route, "/steam/apps/": image_route}
+
+
+def create_library(server_url: str, rate: float) -> Library:
+    class FakeSteamAPI(SteamAPI):
+        _api_url = server_url
+        _store_url = server_url
+        _cdn_url = server_url
+
+    class FakeSteamGridAPI(SteamGridAPI):
+        _api_url = server_url + "/api/v2"
+
+    http_cache = HTTPCache()
+    steam_api = FakeSteamAPI("key", {"127.0.0.1": TokenBucket(rate, rate / 10)}, http_cache=http_cache)
+    steam_grid_api = FakeSteamGridAPI("key", {}, http_cache=http_cache)
+
+    return Library("1", "key", "key", LibraryDataManager("1", "key", "key", steam_api, steam_grid_api))
+
+
+def benchmark_create_user_library(games_count: int, latency_sec: float, too_many_requests_every: int, rate: float, trace_memory: bool = True) -> dict[str, float]:
+    with FakeHTTPServer(create_routes(games_count), latency_sec, retry_after_sec=0, too_many_requests_every=too_many_requests_every) as server:
+        metrics.reset()
+
+        if trace_memory:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+
+        library = create_library(server.url, rate)
+        library_data = library.create_user_library()
+
+        wall_sec = time.perf_counter() - start
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else float("nan")
+        tracemalloc.stop()
+        statuses = [status for _, _, status in server.requests_log]
+
+    db_sec = sum(histogram["sum"] for histogram in metrics.to_dict()["histograms"] if histogram["name"] == "db_operation_seconds")
+
+    return {"games": len(library_data.get("games_data", {})), "wall_sec": wall_sec, "requests": len(statuses), "throttled": statuses.count(429),
+            "db_sec": db_sec, "peak_memory_mib": peak_memory / 1024 / 1024, "stages": library.stages_timings}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mide la creacion de la libreria contra un servidor local que imita a Steam y SteamGridDB")
+    parser.add_argument("--games", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--too-many-requests-every", type=int, default=0)
+    parser.add_argument("--rate", type=float, default=500)
+    parser.add_argument("--skip-memory", action="store_true", help="no mide la memoria pico, tracemalloc ralentiza la ejecucion")
+    arguments = parser.parse_args()
+
+    print(f"{'games':>7} {'wall (s)':>10} {'requests':>9} {'429':>6} {'db (s)':>8} {'peak (MiB)':>11}  stages (s)")
+
+    for games_count in arguments.games:
+        with tempfile.TemporaryDirectory() as working_directory:
+            previous_directory = os.getcwd()
+            os.chdir(working_directory)
+
+            try:
+                result = benchmark_create_user_library(games_count, arguments.latency_ms / 1000, arguments.too_many_requests_every, arguments.rate,
+                                                       not arguments.skip_memory)
+            finally:
+                os.chdir(previous_directory)
+
+        stages = " ".join(f"{stage}={elapsed_sec:.2f}" for stage, elapsed_sec in result["stages"].items())
+        print(f"{result['games']:>7} {result['wall_sec']:>10.2f} {result['requests']:>9} {result['throttled']:>6} {result['db_sec']:>8.2f} {result['peak_memory_mib']:>11.1f}  {stages}")
+
+
+if __name__ == "__main__":
+    main()
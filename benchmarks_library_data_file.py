@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+
+from library_data_file import LibraryDataFile
+
+
+def create_library_data(games_count: int) -> dict[str]:
+    games_data = {app_id: {"description": f"<h1>Game {app_id}</h1><p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 60 + "</p><img src=\"https://cdn.akamai.steamstatic.com/steam/apps/1/extras/x.gif\">",
+                           "developers": [f"Developer {app_id % 300}"],
+                           "publishers": [f"Publisher {app_id % 200}"],
+                           "categories": ["Single-player", "Steam Achievements", "Full controller support", "Steam Cloud"],
+                           "genres": ["Action", "Indie"],
+                           "release_date": "14 Jan, 2021",
+                           "name": f"Game {app_id}"} for app_id in range(1, games_count + 1)}
+
+    return {"response": "success", "user_data": {"steamid": "1", "personaname": "Player"}, "games_data": games_data,
+            "categories": {"Single-player": list(games_data)}, "genres": {"Action": list(games_data), "Indie": list(games_data)},
+            "favorite_games": {}, "eliminated_games": {}, "is_steam_installed": False}
+
+
+def get_folder_size(folder_path: str) -> int:
+    return sum(os.path.getsize(os.path.join(folder_path, file_name)) for file_name in os.listdir(folder_path))
+
+
+def benchmark_legacy(folder_path: str, library_data: dict[str]) -> tuple[float, int, float]:
+    file_path = os.path.join(folder_path, "data.json")
+
+    start = time.perf_counter()
+    with open(file_path, "w") as file:
+        json.dump(library_data, file, indent=5)
+    write_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with open(file_path) as file:
+        json.load(file)
+    load_sec = time.perf_counter() - start
+
+    return write_sec, get_folder_size(folder_path), load_sec
+
+
+def benchmark_compact(folder_path: str, library_data: dict[str], compress: bool) -> tuple[float, int, float]:
+    start = time.perf_counter()
+    LibraryDataFile(folder_path, compress=compress).write(library_data)
+    write_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    LibraryDataFile(folder_path, compress=compress).read()
+    load_sec = time.perf_counter() - start
+
+    return write_sec, get_folder_size(folder_path), load_sec
+
+
+def main() -> None:
+    print(f"{'games':>7} {'format':>16} {'write (s)':>10} {'size (KiB)':>11} {'load (s)':>10}")
+
+    for games_count in (1000, 10000):
+        library_data = create_library_data(games_count)
+        benchmarks = (("indented json", lambda folder_path: benchmark_legacy(folder_path, library_data)),
+                      ("compact", lambda folder_path: benchmark_compact(folder_path, library_data, False)),
+                      ("compact gzip", lambda folder_path: benchmark_compact(folder_path, library_data, True)))
+
+        for format_name, benchmark in benchmarks:
+            with tempfile.TemporaryDirectory() as folder_path:
+                write_sec, size, load_sec = benchmark(folder_path)
+
+            print(f"{games_count:>7} {format_name:>16} {write_sec:>10.4f} {size / 1024:>11.1f} {load_sec:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
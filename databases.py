@@ -2,94 +2,409 @@ from __future__ import annotations
 
 import os
 import sqlite3
+import threading
+import time
 
 from abc import ABC
-from typing import Iterable
+from contextlib import contextmanager
+from datetime import date
+from game_record import GameRecord
+from metrics import metrics
+from release_dates import parse_release_date
+from typing import Iterable, Iterator
 
 class Database(ABC):
     
-    def __init__(self, table_name: str, columns_type: dict[str, str]) -> None:
+    _schema_version: int = 1
+    __schema_lock: threading.Lock = threading.Lock()
+    
+    def __init__(self, table_name: str, columns_type: dict[str, str], journal_mode: (str | None) = "WAL", synchronous: (str | None) = "NORMAL", cache_size: (int | None) = -16000) -> None:
         
         self.__database_folder_path = os.path.join("library", "data")
         self.__database_path = os.path.join(self.__database_folder_path , table_name + ".db")
+        self.__local = threading.local()
+        self.__connections: dict[threading.Thread, sqlite3.Connection] = {}
+        self.__connections_lock = threading.Lock()
+        self.__pragmas = {"journal_mode": journal_mode, "synchronous": synchronous, "cache_size": cache_size}
+        
+        primary_key = next(iter(columns_type))
         
+        self._table_name = table_name
         self.__create_table = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join([f'{column} {datatype}' for column, datatype in columns_type.items()])})"
-        self.__select_row = f"SELECT * FROM {table_name} WHERE {next(iter(columns_type))} = ?"
-        self.__insert_row = f"INSERT INTO {table_name} ({', '.join(columns_type)}) VALUES ({', '.join('?' for _ in range(len(columns_type)))})"
+        self.__columns_type = columns_type
+        self.__select_row = f"SELECT {', '.join(columns_type)} FROM {table_name} WHERE {primary_key} = ?"
+        self.__select_rows = f"SELECT {', '.join(columns_type)} FROM {table_name} WHERE {primary_key} IN ({{}})"
+        self.__insert_row = (f"INSERT INTO {table_name} ({', '.join(columns_type)}) VALUES ({', '.join('?' for _ in range(len(columns_type)))}) "
+                             f"ON CONFLICT({primary_key}) DO UPDATE SET {', '.join(f'{column} = excluded.{column}' for column in columns_type if column != primary_key)}")
+        
+    def __enter__(self) -> Database:
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
         
     def _get_row(self, primary_key_value) -> tuple | None:
-        self.__cursor.execute(self.__select_row, (primary_key_value,))
-        return self.__cursor.fetchone()
+        with metrics.timer("db_operation_seconds", table=self._table_name, operation="get_row"):
+            return self._get_connection().execute(self.__select_row, (primary_key_value,)).fetchone()
+    
+    def _get_rows(self, primary_key_values: Iterable, chunk_size: int = 500) -> list[tuple]:
+        return self._select_in_chunks(self.__select_rows, primary_key_values, chunk_size)
+    
+    def _select_in_chunks(self, query: str, values: Iterable, chunk_size: int = 500, parameters: tuple = ()) -> list[tuple]:
+        conn = self._get_connection()
+        values = list(values)
+        rows = []
+        
+        with metrics.timer("db_operation_seconds", table=self._table_name, operation="select"):
+            for start_slice in range(0, len(values), chunk_size):
+                chunk = values[start_slice:start_slice+chunk_size]
+                rows.extend(conn.execute(query.format(", ".join("?" for _ in chunk)), chunk + list(parameters)).fetchall())
+            
+        return rows
     
     def _add_row(self, row_values: tuple) -> None:
-        self.__cursor.execute(self.__insert_row, row_values)
-        self.__conn.commit()
+        with metrics.timer("db_operation_seconds", table=self._table_name, operation="add_row"), self._transaction() as conn:
+            conn.execute(self.__insert_row, row_values)
+        
+    def _add_rows(self, rows_values: Iterable[tuple]) -> None:
+        with metrics.timer("db_operation_seconds", table=self._table_name, operation="add_rows"), self._transaction() as conn:
+            conn.executemany(self.__insert_row, rows_values)
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._get_connection()
+        depth = getattr(self.__local, "transaction_depth", 0)
+        self.__local.transaction_depth = depth + 1
+        
+        try:
+            if depth == 0 and not conn.in_transaction:
+                conn.execute("BEGIN")
+            
+            yield conn
+            
+            if depth == 0:
+                conn.commit()
+        
+        except BaseException:
+            if depth == 0:
+                conn.rollback()
+            raise
+        
+        finally:
+            self.__local.transaction_depth = depth
+    
+    def _create_schema(self, conn: sqlite3.Connection, schema_version: int) -> None:
+        conn.execute(self.__create_table)
+        
+        existing_columns = {column[1] for column in conn.execute(f"PRAGMA table_info({self._table_name})")}
+        
+        for column, datatype in list(self.__columns_type.items())[1:]:
+            if column not in existing_columns:
+                conn.execute(f"ALTER TABLE {self._table_name} ADD COLUMN {column} {datatype}")
+        
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = getattr(self.__local, "conn", None)
+        
+        if conn is None:
+            conn = self.__connect()
+            
+        return conn
+    
+    def close(self) -> None:
+        with self.__connections_lock:
+            for conn in self.__connections.values():
+                conn.close()
+                
+            self.__connections.clear()
+            self.__local = threading.local()
+            metrics.set_gauge("db_connections", 0, table=self._table_name)
+    
+    def close_thread_connection(self) -> None:
+        conn = getattr(self.__local, "conn", None)
         
-    def _connect(self) -> None:
+        if conn is not None:
+            with self.__connections_lock:
+                self.__connections.pop(threading.current_thread(), None)
+                metrics.set_gauge("db_connections", len(self.__connections), table=self._table_name)
+            
+            self.__local.conn = None
+            conn.close()
+    
+    def close_finished_threads_connections(self) -> int:
+        with self.__connections_lock:
+            finished_threads = [thread for thread in self.__connections if not thread.is_alive()]
+            
+            for thread in finished_threads:
+                self.__connections.pop(thread).close()
+            
+            metrics.set_gauge("db_connections", len(self.__connections), table=self._table_name)
+            
+        return len(finished_threads)
+        
+    def __connect(self) -> sqlite3.Connection:
         os.makedirs(self.__database_folder_path, exist_ok=True)
-        self.__conn = sqlite3.connect(self.__database_path)
-        self.__cursor = self.__conn.cursor()
-        self.__cursor.execute(self.__create_table)
+        conn = sqlite3.connect(self.__database_path, timeout=30, check_same_thread=False, cached_statements=256)
+        
+        for pragma, value in self.__pragmas.items():
+            if value is not None:
+                conn.execute(f"PRAGMA {pragma} = {value}")
+        
+        self.close_finished_threads_connections()
+        
+        with self.__connections_lock:
+            self.__connections[threading.current_thread()] = conn
+            metrics.set_gauge("db_connections", len(self.__connections), table=self._table_name)
+            
+        self.__local.conn = conn
+        
+        if self.__get_schema_version(conn) < self._schema_version:
+            with Database.__schema_lock:
+                conn.execute("BEGIN IMMEDIATE")
+                
+                with self._transaction():
+                    schema_version = self.__get_schema_version(conn)
+                    
+                    if schema_version < self._schema_version:
+                        self._create_schema(conn, schema_version)
+                        conn.execute(f"PRAGMA user_version = {self._schema_version}")
+            
+        return conn
     
-    def _close(self) -> None:
-        self.__conn.close()
+    def __get_schema_version(self, conn: sqlite3.Connection) -> int:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
 
 
 class GamesDatabase(Database):
+    
+    CLASSIFICATION_TYPES = ("developers", "publishers", "categories", "genres")
+    # A single appdetails request refreshes every field of a game, so one fetched_at per row decides when it is stale
+    APP_DETAILS_TTL_SEC = 7 * 86400
+    FAILED_FETCH_RETRY_SEC = 86400
+    MISSING_IMAGE_RETRY_SEC = 14 * 86400
+    
+    _schema_version = 6
 
-    def __init__(self) -> None:
+    def __init__(self, journal_mode: (str | None) = "WAL", synchronous: (str | None) = "NORMAL", cache_size: (int | None) = -16000) -> None:
         super().__init__("GamesDatabase", 
                          {"steam_appid": "INTEGER PRIMARY KEY", 
                           "description": "TEXT", 
-                          "developers": "TEXT", 
-                          "publishers": "TEXT", 
-                          "categories": "TEXT", 
-                          "genres": "TEXT", 
                           "release_date": "TEXT",
-                          "name": "TEXT"})
-
-    def get_games(self, steam_apps_ids: Iterable[int]) -> dict[int, dict[str]]:
-        self._connect()
+                          "name": "TEXT",
+                          "fetched_at": "REAL",
+                          "release_date_value": "TEXT",
+                          "release_date_precision": "TEXT"},
+                         journal_mode, synchronous, cache_size)
         
-        games = {}
+        self.__create_classifications_tables = (
+            "CREATE TABLE IF NOT EXISTS classifications (classification_id INTEGER PRIMARY KEY, type TEXT NOT NULL, name TEXT NOT NULL, UNIQUE (type, name))",
+            "CREATE TABLE IF NOT EXISTS games_classifications (steam_appid INTEGER NOT NULL, classification_id INTEGER NOT NULL, position INTEGER NOT NULL, PRIMARY KEY (steam_appid, classification_id)) WITHOUT ROWID",
+            "CREATE INDEX IF NOT EXISTS games_classifications_by_classification ON games_classifications (classification_id, steam_appid)",
+            "CREATE TABLE IF NOT EXISTS failed_fetches (steam_appid INTEGER PRIMARY KEY, failed_at REAL NOT NULL)",
+            "CREATE TABLE IF NOT EXISTS missing_images (steam_appid INTEGER NOT NULL, image_name TEXT NOT NULL, source TEXT NOT NULL, checked_at REAL NOT NULL, PRIMARY KEY (steam_appid, image_name, source)) WITHOUT ROWID",
+            "CREATE TABLE IF NOT EXISTS pending_appdetails (steam_appid INTEGER PRIMARY KEY, name TEXT NOT NULL, queued_at REAL NOT NULL)",
+            f"CREATE INDEX IF NOT EXISTS {self._table_name}_by_release_date ON {self._table_name} (release_date_value, steam_appid)")
+        self.__select_games_classifications = ("SELECT games_classifications.steam_appid, classifications.type, classifications.name FROM games_classifications "
+                                               "JOIN classifications USING (classification_id) WHERE games_classifications.steam_appid IN ({}) "
+                                               "ORDER BY games_classifications.steam_appid, games_classifications.position")
+        self.__select_appids_by_classification = ("SELECT games_classifications.steam_appid FROM games_classifications JOIN classifications USING (classification_id) "
+                                                  "WHERE classifications.type = ? AND classifications.name = ? ORDER BY games_classifications.steam_appid")
+        self.__select_classifications_summary = ("SELECT classifications.name, games_classifications.steam_appid FROM classifications "
+                                                 "JOIN games_classifications USING (classification_id) JOIN selected_apps USING (steam_appid) "
+                                                 "WHERE classifications.type = ? ORDER BY classifications.name, games_classifications.steam_appid")
+        self.__count_games_by_classification = ("SELECT classifications.name, COUNT(*) FROM classifications JOIN games_classifications USING (classification_id) "
+                                                "WHERE classifications.type = ? GROUP BY classifications.classification_id ORDER BY COUNT(*) DESC, classifications.name")
+
+    def get_games(self, steam_apps_ids: Iterable[int]) -> dict[int, GameRecord]:
+        steam_apps_ids = list(steam_apps_ids)
+        games_rows = {}
         
-        for steam_appid in steam_apps_ids:
+        for app_data in self._get_rows(steam_apps_ids):
+                
+            steam_appid, description, release_date, name, fetched_at, release_date_value, release_date_precision = app_data
             
-            app_data = self._get_row(steam_appid)
+            games_rows[steam_appid] = (description, release_date, name)
+        
+        classifications = {steam_appid: {classification_type: [] for classification_type in self.CLASSIFICATION_TYPES} for steam_appid in games_rows}
             
-            if app_data is not None:
-                
-                steam_appid, description, developers, publishers, categories, genres, release_date, name = app_data
-                
-                game = {}
+        for steam_appid, classification_type, classification_name in self._select_in_chunks(self.__select_games_classifications, games_rows):
+            classifications[steam_appid][classification_type].append(classification_name)
                 
-                game["description"] = description
-                game["developers"] = developers.split(", ") if developers else []
-                game["publishers"] = publishers.split(", ") if publishers else []
-                game["categories"] = categories.split(", ") if categories else []
-                game["genres"] = genres.split(", ") if genres else []
-                game["release_date"] = release_date
-                game["name"] = name
-                
-                games[steam_appid] = game
+        return {steam_appid: GameRecord(name, description or "", release_date=release_date, **classifications[steam_appid]) 
+                for steam_appid, (description, release_date, name) in games_rows.items()}
+    
+    def add_games(self, games_data: dict[int, dict[str]], fetched_at: (float | None) = None) -> None:
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        rows = [(app_id, 
+                 game["description"], 
+                 game["release_date"], 
+                 game["name"],
+                 fetched_at,
+                 *parse_release_date(game["release_date"])) for app_id, game in games_data.items()]
+        
+        with self._transaction() as conn:
+            self._add_rows(rows)
+            self.__add_games_classifications(conn, games_data)
+            conn.executemany("DELETE FROM failed_fetches WHERE steam_appid = ?", ((app_id,) for app_id in games_data))
+            
+    def get_stale_appids(self, steam_apps_ids: Iterable[int], ttl_sec: (float | None) = None, now: (float | None) = None) -> list[int]:
+        now = time.time() if now is None else now
+        ttl_sec = self.APP_DETAILS_TTL_SEC if ttl_sec is None else ttl_sec
+        rows = self._select_in_chunks(f"SELECT {self._table_name}.steam_appid FROM {self._table_name} LEFT JOIN failed_fetches USING (steam_appid) "
+                                      f"WHERE {self._table_name}.steam_appid IN ({{}}) AND ({self._table_name}.fetched_at IS NULL OR {self._table_name}.fetched_at < ?) "
+                                      f"AND (failed_fetches.failed_at IS NULL OR failed_fetches.failed_at < ?)", steam_apps_ids, parameters=(now - ttl_sec, now - self.FAILED_FETCH_RETRY_SEC))
+        return [steam_appid for steam_appid, in rows]
+    
+    def add_failed_fetches(self, steam_apps_ids: Iterable[int], failed_at: (float | None) = None) -> None:
+        failed_at = time.time() if failed_at is None else failed_at
+        
+        with self._transaction() as conn:
+            conn.executemany("INSERT INTO failed_fetches (steam_appid, failed_at) VALUES (?, ?) ON CONFLICT(steam_appid) DO UPDATE SET failed_at = excluded.failed_at", 
+                             ((steam_appid, failed_at) for steam_appid in steam_apps_ids))
+    
+    def add_pending_appdetails(self, owned_games: dict[int, str], queued_at: (float | None) = None) -> None:
+        queued_at = time.time() if queued_at is None else queued_at
+        
+        with self._transaction() as conn:
+            conn.executemany("INSERT OR IGNORE INTO pending_appdetails (steam_appid, name, queued_at) VALUES (?, ?, ?)", 
+                             ((steam_appid, name, queued_at) for steam_appid, name in owned_games.items()))
+            
+    def get_pending_appdetails(self) -> dict[int, str]:
+        return dict(self._get_connection().execute("SELECT steam_appid, name FROM pending_appdetails ORDER BY queued_at, steam_appid").fetchall())
+    
+    def add_crawled_games(self, games_data: dict[int, dict[str]], failed_apps_ids: Iterable[int], fetched_at: (float | None) = None) -> None:
+        failed_apps_ids = list(failed_apps_ids)
+        
+        with self._transaction() as conn:
+            self.add_games(games_data, fetched_at)
+            self.add_failed_fetches(failed_apps_ids, fetched_at)
+            conn.executemany("DELETE FROM pending_appdetails WHERE steam_appid = ?", ((steam_appid,) for steam_appid in list(games_data) + failed_apps_ids))
+    
+    def get_recently_failed_appids(self, steam_apps_ids: Iterable[int], now: (float | None) = None) -> set[int]:
+        now = time.time() if now is None else now
+        rows = self._select_in_chunks("SELECT steam_appid FROM failed_fetches WHERE steam_appid IN ({}) AND failed_at >= ?", steam_apps_ids, parameters=(now - self.FAILED_FETCH_RETRY_SEC,))
+        return {steam_appid for steam_appid, in rows}
+            
+    def add_missing_images(self, missing_images: Iterable[tuple[int, str, str]], checked_at: (float | None) = None) -> None:
+        checked_at = time.time() if checked_at is None else checked_at
+        
+        with self._transaction() as conn:
+            conn.executemany("INSERT INTO missing_images (steam_appid, image_name, source, checked_at) VALUES (?, ?, ?, ?) "
+                             "ON CONFLICT(steam_appid, image_name, source) DO UPDATE SET checked_at = excluded.checked_at", 
+                             ((steam_appid, image_name, source, checked_at) for steam_appid, image_name, source in missing_images))
+            
+    def get_missing_image_sources(self, steam_appid: int, image_name: str, now: (float | None) = None) -> set[str]:
+        now = time.time() if now is None else now
+        rows = self._get_connection().execute("SELECT source FROM missing_images WHERE steam_appid = ? AND image_name = ? AND checked_at >= ?", 
+                                              (steam_appid, image_name, now - self.MISSING_IMAGE_RETRY_SEC)).fetchall()
+        return {source for source, in rows}
+            
+    def get_release_dates(self, steam_apps_ids: Iterable[int]) -> dict[int, tuple[(str | None), str]]:
+        rows = self._select_in_chunks(f"SELECT steam_appid, release_date_value, release_date_precision FROM {self._table_name} WHERE steam_appid IN ({{}})", steam_apps_ids)
+        return {steam_appid: (release_date_value, release_date_precision) for steam_appid, release_date_value, release_date_precision in rows}
+    
+    def get_appids_by_release_date(self, start: (str | date | None) = None, end: (str | date | None) = None, steam_apps_ids: (Iterable[int] | None) = None, 
+                                   descending: bool = False) -> list[int]:
+        conditions = ["release_date_value IS NOT NULL"]
+        parameters = []
+        
+        if start is not None:
+            conditions.append("release_date_value >= ?")
+            parameters.append(str(start))
+            
+        if end is not None:
+            conditions.append("release_date_value <= ?")
+            parameters.append(str(end))
+        
+        order = "DESC" if descending else "ASC"
+        query = (f"SELECT steam_appid FROM {self._table_name} {'JOIN selected_apps USING (steam_appid)' if steam_apps_ids is not None else ''} "
+                 f"WHERE {' AND '.join(conditions)} ORDER BY release_date_value {order}, steam_appid {order}")
+        
+        if steam_apps_ids is None:
+            return [steam_appid for steam_appid, in self._get_connection().execute(query, parameters)]
+        
+        with self.__selected_apps(steam_apps_ids) as conn:
+            return [steam_appid for steam_appid, in conn.execute(query, parameters)]
+            
+    def get_appids_by_classification(self, classification_type: str, classification_name: str) -> list[int]:
+        rows = self._get_connection().execute(self.__select_appids_by_classification, (classification_type, classification_name)).fetchall()
+        return [steam_appid for steam_appid, in rows]
+    
+    def get_games_by_developer(self, developer: str) -> dict[int, GameRecord]:
+        return self.get_games(self.get_appids_by_classification("developers", developer))
+    
+    def count_games_by_classification(self, classification_type: str) -> dict[str, int]:
+        return dict(self._get_connection().execute(self.__count_games_by_classification, (classification_type,)).fetchall())
+    
+    def summarize_classifications(self, classification_type: str, steam_apps_ids: Iterable[int]) -> dict[str, list[int]]:
+        classifications = {}
+        
+        with self.__selected_apps(steam_apps_ids) as conn:
+            for classification_name, steam_appid in conn.execute(self.__select_classifications_summary, (classification_type,)):
+                classifications.setdefault(classification_name, []).append(steam_appid)
+            
+        return classifications
+    
+    @contextmanager
+    def __selected_apps(self, steam_apps_ids: Iterable[int]) -> Iterator[sqlite3.Connection]:
+        with self._transaction() as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS selected_apps (steam_appid INTEGER PRIMARY KEY)")
+            conn.execute("DELETE FROM selected_apps")
+            conn.executemany("INSERT OR IGNORE INTO selected_apps VALUES (?)", ((steam_appid,) for steam_appid in steam_apps_ids))
+            
+            try:
+                yield conn
                 
-        self._close()
-        return games
+            finally:
+                conn.execute("DELETE FROM selected_apps")
     
-    def add_games(self, games_data: dict[int, dict[str]]) -> None:
-        self._connect()
+    def _create_schema(self, conn: sqlite3.Connection, schema_version: int) -> None:
+        legacy_columns = {column[1] for column in conn.execute(f"PRAGMA table_info({self._table_name})")}
+        is_legacy_schema = "developers" in legacy_columns
         
-        games_data_copy = {app_id: game.copy() for app_id, game in games_data.items()}
+        if is_legacy_schema:
+            conn.execute(f"ALTER TABLE {self._table_name} RENAME TO {self._table_name}_legacy")
         
-        for app_id, game in games_data_copy.items():
-
-            game["developers"] = ", ".join(game["developers"])
-            game["publishers"] = ", ".join(game["publishers"])
-            game["categories"] = ", ".join(game["categories"])
-            game["genres"] = ", ".join(game["genres"])
+        super()._create_schema(conn, schema_version)
+        
+        for statement in self.__create_classifications_tables:
+            conn.execute(statement)
+            
+        if is_legacy_schema:
+            self.__migrate_legacy_schema(conn)
             
-            row = (app_id,) + tuple(game.values())
+        if 0 < schema_version < 5:
+            self.__parse_stored_release_dates(conn)
             
-            self._add_row(row)
+    def __parse_stored_release_dates(self, conn: sqlite3.Connection) -> None:
+        rows = conn.execute(f"SELECT steam_appid, release_date FROM {self._table_name} WHERE release_date_precision IS NULL").fetchall()
+        conn.executemany(f"UPDATE {self._table_name} SET release_date_value = ?, release_date_precision = ? WHERE steam_appid = ?", 
+                         (parse_release_date(release_date) + (steam_appid,) for steam_appid, release_date in rows))
             
-        self._close()
\ No newline at end of file
+    def __migrate_legacy_schema(self, conn: sqlite3.Connection) -> None:
+        legacy_table_name = self._table_name + "_legacy"
+        games_data = {}
+        
+        for steam_appid, description, developers, publishers, categories, genres, release_date, name in conn.execute(f"SELECT steam_appid, description, developers, publishers, categories, genres, release_date, name FROM {legacy_table_name}"):
+            games_data[steam_appid] = {"description": description, 
+                                       "developers": developers.split(", ") if developers else [], 
+                                       "publishers": publishers.split(", ") if publishers else [], 
+                                       "categories": categories.split(", ") if categories else [], 
+                                       "genres": genres.split(", ") if genres else [], 
+                                       "release_date": release_date, 
+                                       "name": name}
+            
+        self.add_games(games_data, fetched_at=0)
+        conn.execute(f"DROP TABLE {legacy_table_name}")
+            
+    def __add_games_classifications(self, conn: sqlite3.Connection, games_data: dict[int, dict[str]]) -> None:
+        conn.executemany("DELETE FROM games_classifications WHERE steam_appid = ?", ((app_id,) for app_id in games_data))
+        conn.executemany("INSERT OR IGNORE INTO classifications (type, name) VALUES (?, ?)", 
+                         {(classification_type, classification_name) for game in games_data.values() for classification_type in self.CLASSIFICATION_TYPES for classification_name in game[classification_type]})
+        
+        classifications_ids = {(classification_type, classification_name): classification_id for classification_id, classification_type, classification_name in conn.execute("SELECT classification_id, type, name FROM classifications")}
+        
+        conn.executemany("INSERT OR IGNORE INTO games_classifications (steam_appid, classification_id, position) VALUES (?, ?, ?)", 
+                         ((app_id, classifications_ids[(classification_type, classification_name)], position) 
+                          for app_id, game in games_data.items() 
+                          for classification_type in self.CLASSIFICATION_TYPES 
+                          for position, classification_name in enumerate(game[classification_type])))
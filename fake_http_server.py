@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+from urllib.parse import urlparse, parse_qs
+
+
+Route = Callable[[str, dict[str, list[str]], dict[str, str]], tuple[int, dict[str, str], bytes]]
+
+
+class FakeHTTPServer:
+
+    def __init__(self, routes: (dict[str, Route] | None) = None, latency_sec: float = 0, too_many_requests: int = 0, retry_after_sec: (int | None) = None,
+                 too_many_requests_every: int = 0) -> None:
+        self.__routes: dict[str, Route] = routes or {}
+        self.__latency_sec: float = latency_sec
+        self.__too_many_requests: int = too_many_requests
+        self.__retry_after_sec: (int | None) = retry_after_sec
+        self.__too_many_requests_every: int = too_many_requests_every
+        self.__requests_count: int = 0
+        self.__lock: threading.Lock = threading.Lock()
+        self.__in_flight: int = 0
+        self.__max_in_flight: int = 0
+        self.__requests_log: list[tuple[float, str, int]] = []
+        self.__server: ThreadingHTTPServer = ThreadingHTTPServer(("127.0.0.1", 0), self.__create_handler())
+        self.__server.daemon_threads = True
+        self.__thread: threading.Thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+
+    def start(self) -> FakeHTTPServer:
+        self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def __enter__(self) -> FakeHTTPServer:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def add_route(self, path_prefix: str, route: Route) -> None:
+        self.__routes[path_prefix] = route
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests_log(self) -> list[tuple[float, str, int]]:
+        with self.__lock:
+            return list(self.__requests_log)
+
+    @property
+    def max_in_flight(self) -> int:
+        return self.__max_in_flight
+
+    def _respond(self, path: str, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+        status, response_headers, body = self.__route(path, headers)
+
+        with self.__lock:
+            self.__requests_log.append((time.monotonic(), path, status))
+
+        return status, response_headers, body
+
+    def __route(self, path: str, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+        with self.__lock:
+            self.__in_flight += 1
+            self.__max_in_flight = max(self.__max_in_flight, self.__in_flight)
+            self.__requests_count += 1
+            throttled = self.__too_many_requests > 0
+            self.__too_many_requests -= 1 if throttled else 0
+            throttled = throttled or (self.__too_many_requests_every > 0 and self.__requests_count % self.__too_many_requests_every == 0)
+
+        try:
+            if self.__latency_sec:
+                time.sleep(self.__latency_sec)
+
+            if throttled:
+                retry_after = {"Retry-After": str(self.__retry_after_sec)} if self.__retry_after_sec is not None else {}
+                return 429, retry_after, b""
+
+            parsed_url = urlparse(path)
+
+            for path_prefix, route in sorted(self.__routes.items(), key=lambda item: len(item[0]), reverse=True):
+                if parsed_url.path.startswith(path_prefix):
+                    return route(parsed_url.path, parse_qs(parsed_url.query), headers)
+
+            return 404, {}, b""
+
+        finally:
+            with self.__lock:
+                self.__in_flight -= 1
+
+    def __create_handler(self) -> type[BaseHTTPRequestHandler]:
+        fake_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                status, headers, body = fake_server._respond(self.path, dict(self.headers))
+                self.send_response(status)
+                for header, value in headers.items():
+                    self.send_header(header, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
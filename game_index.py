@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import re
+
+from array import array
+from bisect import bisect_left
+from release_dates import PRECISIONS, parse_release_date
+from typing import Iterable, Iterator
+
+
+class GameIndex:
+
+    CLASSIFICATION_TYPES = ("developers", "publishers", "categories", "genres")
+    TOKEN_PATTERN = re.compile(r"\w+")
+    DENSE_RATIO = 32
+    MAX_CACHED_TOKEN_PREFIXES = 256
+
+    def __init__(self, games_data: dict[int, dict[str]], release_dates: (dict[int, tuple[(str | None), (str | None)]] | None) = None) -> None:
+        self.__steam_apps_ids: list[int] = list(games_data)
+        self.__all_games: int = (1 << len(self.__steam_apps_ids)) - 1
+        self.__classifications: dict[str, dict[str, (int | array)]] = {classification_type: {} for classification_type in self.CLASSIFICATION_TYPES}
+        self.__sort_keys: dict[str, list] = {}
+        self.__orders: dict[str, list[int]] = {}
+        self.__ranks: dict[str, list[int]] = {}
+        self.__token_prefixes_bitsets: dict[str, int] = {}
+
+        tokens_positions = {}
+
+        for position, game in enumerate(games_data.values()):
+            for classification_type in self.CLASSIFICATION_TYPES:
+                classifications = self.__classifications[classification_type]
+
+                for classification_name in game.get(classification_type, ()):
+                    classifications.setdefault(classification_name, array("I")).append(position)
+
+            for token in set(self.tokenize(" ".join([game.get("name", "")] + list(game.get("developers", ()))))):
+                tokens_positions.setdefault(token, array("I")).append(position)
+
+        for classifications in self.__classifications.values():
+            for classification_name, positions in classifications.items():
+                if len(positions) * self.DENSE_RATIO >= len(self.__steam_apps_ids):
+                    classifications[classification_name] = self.__create_bitset(positions)
+
+        self.__tokens: dict[str, array] = tokens_positions
+        self.__sorted_tokens: list[str] = sorted(tokens_positions)
+        self.__sort_keys["steam_appid"] = self.__steam_apps_ids
+        self.__sort_keys["name"] = [game.get("name", "").lower() for game in games_data.values()]
+        self.__sort_keys["release_date"] = self.__create_release_date_keys(games_data, release_dates or {})
+
+        for sort_by in self.__sort_keys:
+            self.__create_order(sort_by)
+
+    def query(self, genres: Iterable[str] = (), categories: Iterable[str] = (), developers: Iterable[str] = (), publishers: Iterable[str] = (), 
+              search: (str | None) = None, sort_by: str = "name", descending: bool = False) -> list[int]:
+        bitset = self.filter(genres, categories, developers, publishers, search)
+
+        if bitset == self.__all_games:
+            positions = self.__orders[sort_by]
+        else:
+            positions = sorted(self.iter_positions(bitset), key=self.__ranks[sort_by].__getitem__)
+
+        steam_apps_ids = [self.__steam_apps_ids[position] for position in positions]
+
+        return steam_apps_ids[::-1] if descending else steam_apps_ids
+
+    def count(self, genres: Iterable[str] = (), categories: Iterable[str] = (), developers: Iterable[str] = (), publishers: Iterable[str] = (), search: (str | None) = None) -> int:
+        return self.filter(genres, categories, developers, publishers, search).bit_count()
+
+    def filter(self, genres: Iterable[str] = (), categories: Iterable[str] = (), developers: Iterable[str] = (), publishers: Iterable[str] = (), search: (str | None) = None) -> int:
+        bitset = self.__all_games
+
+        for classification_type, classifications_names in (("genres", genres), ("categories", categories), ("developers", developers), ("publishers", publishers)):
+            for classification_name in classifications_names:
+                bitset &= self.__get_bitset(self.__classifications[classification_type].get(classification_name, 0))
+
+                if not bitset:
+                    return 0
+
+        for token in self.tokenize(search or ""):
+            bitset &= self.__get_token_prefix_bitset(token)
+
+            if not bitset:
+                return 0
+
+        return bitset
+
+    def add_sort_key(self, sort_by: str, games_data: dict[int, dict[str]]) -> None:
+        if sort_by not in self.__sort_keys:
+            self.__sort_keys[sort_by] = [str(game.get(sort_by, "")).lower() for game in games_data.values()]
+            self.__create_order(sort_by)
+
+    def has_sort_key(self, sort_by: str) -> bool:
+        return sort_by in self.__sort_keys
+
+    def iter_positions(self, bitset: int) -> Iterator[int]:
+        binary = bin(bitset)[:1:-1]
+        position = binary.find("1")
+
+        while position != -1:
+            yield position
+            position = binary.find("1", position + 1)
+
+    @classmethod
+    def tokenize(cls, text: str) -> list[str]:
+        return cls.TOKEN_PATTERN.findall(text.lower())
+
+    @classmethod
+    def get_release_date_key(cls, release_date: str) -> tuple[str, int]:
+        return cls.create_release_date_key(*parse_release_date(release_date))
+
+    @staticmethod
+    def create_release_date_key(release_date_value: (str | None), release_date_precision: str) -> tuple[str, int]:
+        return release_date_value or "9999-12-31", PRECISIONS.index(release_date_precision)
+
+    def __create_release_date_keys(self, games_data: dict[int, dict[str]], release_dates: dict[int, tuple[(str | None), (str | None)]]) -> list[tuple[str, int]]:
+        release_date_keys = []
+        parsed_release_dates_keys = {}
+
+        for steam_appid, game in games_data.items():
+            release_date_value, release_date_precision = release_dates.get(steam_appid, (None, None))
+
+            if release_date_precision is not None:
+                release_date_keys.append(self.create_release_date_key(release_date_value, release_date_precision))
+            else:
+                release_date = game.get("release_date", "")
+                release_date_keys.append(parsed_release_dates_keys.get(release_date) or parsed_release_dates_keys.setdefault(release_date, self.get_release_date_key(release_date)))
+
+        return release_date_keys
+
+    def __create_order(self, sort_by: str) -> None:
+        sort_keys = self.__sort_keys[sort_by]
+        order = sorted(range(len(sort_keys)), key=lambda position: (sort_keys[position], self.__steam_apps_ids[position]))
+        ranks = [0] * len(order)
+
+        for rank, position in enumerate(order):
+            ranks[position] = rank
+
+        self.__orders[sort_by] = order
+        self.__ranks[sort_by] = ranks
+
+    def __get_token_prefix_bitset(self, token_prefix: str) -> int:
+        if token_prefix in self.__token_prefixes_bitsets:
+            return self.__token_prefixes_bitsets[token_prefix]
+
+        start = bisect_left(self.__sorted_tokens, token_prefix)
+        end = start
+
+        while end < len(self.__sorted_tokens) and self.__sorted_tokens[end].startswith(token_prefix):
+            end += 1
+
+        if len(self.__token_prefixes_bitsets) >= self.MAX_CACHED_TOKEN_PREFIXES:
+            self.__token_prefixes_bitsets.clear()
+
+        bitset = self.__create_bitset(position for token in self.__sorted_tokens[start:end] for position in self.__tokens[token])
+        self.__token_prefixes_bitsets[token_prefix] = bitset
+
+        return bitset
+
+    def __get_bitset(self, bitset_or_positions: (int | array)) -> int:
+        return bitset_or_positions if isinstance(bitset_or_positions, int) else self.__create_bitset(bitset_or_positions)
+
+    def __create_bitset(self, positions: Iterable[int]) -> int:
+        bitset_bytes = bytearray((len(self.__steam_apps_ids) >> 3) + 1)
+
+        for position in positions:
+            bitset_bytes[position >> 3] |= 1 << (position & 7)
+
+        return int.from_bytes(bitset_bytes, "little")
+
+    def __len__(self) -> int:
+        return len(self.__steam_apps_ids)
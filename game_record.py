@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import sys
+
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator
+
+
+class GameRecord(Mapping):
+
+    FIELDS = ("description", "developers", "publishers", "categories", "genres", "release_date", "name")
+    CLASSIFICATION_TYPES = ("developers", "publishers", "categories", "genres")
+
+    __slots__ = FIELDS
+
+    def __init__(self, name: str, description: (str | None) = None, developers: Iterable[str] = (), publishers: Iterable[str] = (), categories: Iterable[str] = (),
+                 genres: Iterable[str] = (), release_date: str = "") -> None:
+        # Los campos solo se asignan aqui, despues el registro es de solo lectura
+        set_field = object.__setattr__
+        set_field(self, "name", name)
+        set_field(self, "description", description)
+        set_field(self, "developers", self.intern_classifications(developers))
+        set_field(self, "publishers", self.intern_classifications(publishers))
+        set_field(self, "categories", self.intern_classifications(categories))
+        set_field(self, "genres", self.intern_classifications(genres))
+        set_field(self, "release_date", sys.intern(release_date))
+
+    @classmethod
+    def from_dict(cls, game: dict[str]) -> GameRecord:
+        return cls(game.get("name", ""), game.get("description"), game.get("developers", ()), game.get("publishers", ()), game.get("categories", ()),
+                   game.get("genres", ()), game.get("release_date", ""))
+
+    @staticmethod
+    def intern_classifications(classifications_names: Iterable[str]) -> tuple[str, ...]:
+        return tuple(sys.intern(classification_name) for classification_name in classifications_names)
+
+    def with_description(self, description: str) -> GameRecord:
+        return GameRecord(self.name, description, self.developers, self.publishers, self.categories, self.genres, self.release_date)
+
+    def to_dict(self, include_description: bool = True) -> dict[str]:
+        return {field: list(value) if isinstance(value, tuple) else value for field, value in self.items() if include_description or field != "description"}
+
+    def get(self, field: str, default: Any = None) -> Any:
+        value = getattr(self, field, None) if field in self.FIELDS else None
+        return default if value is None else value
+
+    def __getitem__(self, field: str) -> Any:
+        value = getattr(self, field) if field in self.FIELDS else None
+
+        if value is None:
+            raise KeyError(field)
+
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return (field for field in self.FIELDS if field != "description" or self.description is not None)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS) - (self.description is None)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+
+        return self.to_dict() == (other.to_dict() if isinstance(other, GameRecord) else dict(other))
+
+    __hash__ = None
+
+    def __setattr__(self, field: str, value: Any) -> None:
+        raise AttributeError(f"GameRecord.{field} is read-only")
+
+    def __delattr__(self, field: str) -> None:
+        raise AttributeError(f"GameRecord.{field} is read-only")
+
+    def __repr__(self) -> str:
+        return f"GameRecord({self.to_dict()!r})"
+
+
+def games_to_dicts(games_data: dict[int, GameRecord], include_description: bool = True) -> dict[int, dict[str]]:
+    return {steam_appid: game.to_dict(include_description) for steam_appid, game in games_data.items()}
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import email.utils
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from databases import Database
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from urllib.parse import urlencode
+
+
+class HTTPCache(Database):
+
+    IGNORED_PARAMS = ("key",)
+    STORED_HEADERS = ("Content-Type", "Cache-Control", "ETag", "Last-Modified", "Expires")
+
+    _schema_version = 2
+
+    def __init__(self, max_size_bytes: int = 256 * 1024 * 1024, journal_mode: (str | None) = "WAL", synchronous: (str | None) = "NORMAL", cache_size: (int | None) = -16000) -> None:
+        super().__init__("HTTPCache",
+                         {"cache_key": "TEXT PRIMARY KEY",
+                          "url": "TEXT NOT NULL",
+                          "status": "INTEGER NOT NULL",
+                          "size": "INTEGER NOT NULL",
+                          "stored_at": "REAL NOT NULL",
+                          "expires_at": "REAL NOT NULL",
+                          "accessed_at": "REAL NOT NULL",
+                          "headers": "TEXT NOT NULL",
+                          "body": "BLOB NOT NULL"},
+                         journal_mode, synchronous, cache_size)
+        
+        self.__max_size_bytes: int = max_size_bytes
+        self.__total_size: (int | None) = None
+        self.__total_size_lock: threading.Lock = threading.Lock()
+        
+    def get(self, url: str, params: (dict[str] | None) = None, now: (float | None) = None) -> (dict[str] | None):
+        cache_key = self.create_key(url, params)
+        row = self._get_row(cache_key)
+        
+        if row is None:
+            return None
+        
+        now = time.time() if now is None else now
+        
+        with self._transaction() as conn:
+            conn.execute(f"UPDATE {self._table_name} SET accessed_at = ? WHERE cache_key = ?", (now, cache_key))
+        
+        cache_key, url, status, size, stored_at, expires_at, accessed_at, headers, body = row
+        
+        return {"url": url, "status": status, "headers": json.loads(headers), "body": body, "stored_at": stored_at, "expires_at": expires_at, "fresh": expires_at > now}
+    
+    def store(self, url: str, params: (dict[str] | None), response: Response, ttl_sec: (float | None) = None, now: (float | None) = None) -> bool:
+        cache_control = self.__parse_cache_control(response.headers.get("Cache-Control", ""))
+        
+        if response.status_code != 200 or "no-store" in cache_control:
+            return False
+        
+        headers = {header: response.headers[header] for header in self.STORED_HEADERS if header in response.headers}
+        now = time.time() if now is None else now
+        expires_at = now + self.__get_ttl_sec(headers, cache_control, ttl_sec, now)
+        
+        if expires_at <= now and "ETag" not in headers and "Last-Modified" not in headers:
+            return False
+        
+        body = response.content
+        cache_key = self.create_key(url, params)
+        
+        with self.__total_size_lock:
+            with self._transaction() as conn:
+                total_size = self.__get_total_size(conn)
+                previous_row = conn.execute(f"SELECT size FROM {self._table_name} WHERE cache_key = ?", (cache_key,)).fetchone()
+                self._add_row((cache_key, url, response.status_code, len(body), now, expires_at, now, json.dumps(headers), sqlite3.Binary(body)))
+            
+            self.__total_size = total_size + len(body) - (previous_row[0] if previous_row else 0)
+            over_max_size = self.__total_size > self.__max_size_bytes
+        
+        if over_max_size:
+            self.evict()
+        
+        return True
+    
+    def refresh(self, url: str, params: (dict[str] | None), response: Response, ttl_sec: (float | None) = None, now: (float | None) = None) -> (dict[str] | None):
+        entry = self.get(url, params, now)
+        
+        if entry is None:
+            return None
+        
+        now = time.time() if now is None else now
+        headers = dict(entry["headers"], **{header: response.headers[header] for header in self.STORED_HEADERS if header in response.headers and header != "Content-Type"})
+        expires_at = now + self.__get_ttl_sec(headers, self.__parse_cache_control(headers.get("Cache-Control", "")), ttl_sec, now)
+        
+        with self._transaction() as conn:
+            conn.execute(f"UPDATE {self._table_name} SET headers = ?, stored_at = ?, expires_at = ? WHERE cache_key = ?", (json.dumps(headers), now, expires_at, self.create_key(url, params)))
+        
+        return dict(entry, headers=headers, stored_at=now, expires_at=expires_at, fresh=expires_at > now)
+    
+    def get_total_size(self) -> int:
+        with self.__total_size_lock:
+            return self.__get_total_size(self._get_connection())
+    
+    def evict(self) -> int:
+        with self.__total_size_lock, self._transaction() as conn:
+            total_size, = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self._table_name}").fetchone()
+            evicted_keys = []
+            
+            if total_size > self.__max_size_bytes:
+                for cache_key, size in conn.execute(f"SELECT cache_key, size FROM {self._table_name} ORDER BY accessed_at").fetchall():
+                    if total_size <= self.__max_size_bytes:
+                        break
+                    
+                    evicted_keys.append((cache_key,))
+                    total_size -= size
+                
+                conn.executemany(f"DELETE FROM {self._table_name} WHERE cache_key = ?", evicted_keys)
+            
+            self.__total_size = total_size
+            
+        return len(evicted_keys)
+    
+    def create_key(self, url: str, params: (dict[str] | None) = None) -> str:
+        query = urlencode(sorted((name, str(value)) for name, value in (params or {}).items() if name not in self.IGNORED_PARAMS))
+        return hashlib.sha256(f"{url}?{query}".encode()).hexdigest()
+    
+    def get_conditional_headers(self, entry: dict[str]) -> dict[str, str]:
+        conditional_headers = {}
+        
+        if "ETag" in entry["headers"]:
+            conditional_headers["If-None-Match"] = entry["headers"]["ETag"]
+            
+        if "Last-Modified" in entry["headers"]:
+            conditional_headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+            
+        return conditional_headers
+    
+    def create_response(self, entry: dict[str]) -> Response:
+        response = Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.url = entry["url"]
+        response._content = bytes(entry["body"])
+        response.encoding = "utf-8" if "json" in entry["headers"].get("Content-Type", "") else None
+        
+        return response
+    
+    def _create_schema(self, conn: sqlite3.Connection, schema_version: int) -> None:
+        if schema_version < 2:
+            # Version 1 stored size and accessed_at after the body, so summing sizes read every overflow page
+            conn.execute(f"DROP TABLE IF EXISTS {self._table_name}")
+        
+        super()._create_schema(conn, schema_version)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {self._table_name}_by_accessed_at ON {self._table_name} (accessed_at)")
+    
+    def __get_total_size(self, conn: sqlite3.Connection) -> int:
+        if self.__total_size is None:
+            self.__total_size = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self._table_name}").fetchone()[0]
+        
+        return self.__total_size
+    
+    def __get_ttl_sec(self, headers: dict[str, str], cache_control: dict[str, (str | None)], ttl_sec: (float | None), now: float) -> float:
+        if ttl_sec is not None:
+            return ttl_sec
+        
+        if "no-cache" in cache_control:
+            return 0
+        
+        max_age = cache_control.get("max-age")
+        
+        if max_age is not None and max_age.isdigit():
+            return int(max_age)
+        
+        if "Expires" in headers:
+            try:
+                return max(email.utils.parsedate_to_datetime(headers["Expires"]).timestamp() - now, 0)
+            
+            except (TypeError, ValueError):
+                pass
+            
+        return 0
+    
+    def __parse_cache_control(self, cache_control: str) -> dict[str, (str | None)]:
+        directives = {}
+        
+        for directive in cache_control.split(","):
+            name, _, value = directive.strip().partition("=")
+            
+            if name:
+                directives[name.lower()] = value.strip('"') or None
+                
+        return directives
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from logger import logger
+from metrics import metrics
+from queue import Queue
+from requests import ConnectionError
+from typing import Callable, Iterable
+
+
+ImageTask = tuple[int, str]
+ImageFetcher = Callable[[int, str], (tuple[bytes, str, str] | None)]
+ImageWriter = Callable[[int, bytes, str, str, str], None]
+
+
+class ImageDownloader:
+
+    def __init__(self, max_workers: int = 8, progress_interval_sec: float = 5, max_consecutive_connection_errors: int = 10) -> None:
+        self.__max_workers: int = max_workers
+        self.__progress_interval_sec: float = progress_interval_sec
+        self.__max_consecutive_connection_errors: int = max_consecutive_connection_errors
+
+    def download(self, tasks: Iterable[ImageTask], fetch: ImageFetcher, write: ImageWriter) -> dict[str, float]:
+        tasks = list(tasks)
+        statistics = {"total": len(tasks), "downloaded": 0, "missing": 0, "failed": 0, "skipped": 0, "bytes": 0, "elapsed_sec": 0}
+        lock = threading.Lock()
+        connection_lost = threading.Event()
+        consecutive_connection_errors = 0
+        write_queue = Queue(maxsize=self.__max_workers * 2)
+        start = time.monotonic()
+        last_report = start
+        metrics.set_gauge("build_images_total", len(tasks))
+        metrics.set_gauge("build_images_done", 0)
+
+        def report_progress(force: bool = False) -> None:
+            nonlocal last_report
+            now = time.monotonic()
+            done = statistics["downloaded"] + statistics["missing"] + statistics["failed"] + statistics["skipped"]
+            metrics.set_gauge("build_images_done", done)
+
+            if force or now - last_report >= self.__progress_interval_sec:
+                last_report = now
+                elapsed_sec = max(now - start, 1e-9)
+                logger.info(f"Imagenes: {done}/{statistics['total']} procesadas, {statistics['downloaded'] / elapsed_sec:.1f} imagenes/s, {statistics['bytes'] / elapsed_sec / 1024:.1f} KiB/s")
+
+        def fetch_image(task: ImageTask) -> None:
+            nonlocal consecutive_connection_errors
+            steam_appid, image_name = task
+
+            if connection_lost.is_set():
+                with lock:
+                    statistics["skipped"] += 1
+                return
+
+            try:
+                image = fetch(steam_appid, image_name)
+
+            except ConnectionError as e:
+                logger.error(f"Error de conexion al conseguir la imagen {image_name} del juego {steam_appid}: {e!r}")
+                with lock:
+                    statistics["failed"] += 1
+                    consecutive_connection_errors += 1
+                    if consecutive_connection_errors >= self.__max_consecutive_connection_errors:
+                        logger.error("Se perdio la conexion mientras se conseguian las imagenes de los juegos")
+                        connection_lost.set()
+                return
+
+            except Exception as e:
+                logger.error(f"Ocurrio un error mientras se conseguia la imagen {image_name} del juego {steam_appid}: {e!r}")
+                with lock:
+                    statistics["failed"] += 1
+                return
+
+            with lock:
+                consecutive_connection_errors = 0
+                if image is None:
+                    statistics["missing"] += 1
+                    report_progress()
+
+            if image is not None:
+                write_queue.put((steam_appid, image_name, image))
+
+        def write_images() -> None:
+            while (item := write_queue.get()) is not None:
+                steam_appid, image_name, (image_bytes, file_type, source) = item
+
+                try:
+                    write(steam_appid, image_bytes, image_name, file_type, source)
+                    with lock:
+                        statistics["downloaded"] += 1
+                        statistics["bytes"] += len(image_bytes)
+
+                except Exception as e:
+                    logger.error(f"Ocurrio un error mientras se escribia la imagen {image_name} del juego {steam_appid}: {e!r}")
+                    with lock:
+                        statistics["failed"] += 1
+
+                with lock:
+                    report_progress()
+
+        writer = threading.Thread(target=write_images, daemon=True)
+        writer.start()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+                for _ in executor.map(fetch_image, tasks):
+                    pass
+
+        finally:
+            write_queue.put(None)
+            writer.join()
+
+        statistics["elapsed_sec"] = time.monotonic() - start
+        report_progress(force=True)
+
+        return statistics
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+
+from atomic_file import atomic_write
+from logger import logger
+from typing import Iterable
+
+
+class ImageStore:
+
+    IMAGES_NAMES = ("library_600x900_2x", "library_hero")
+    ACCEPTED_FILE_TYPES = {"jpg", "png", "webp"}
+
+    def __init__(self, images_folder_path: str = os.path.join("src", "images"), save_every_writes: int = 50) -> None:
+        self.__images_folder_path: str = images_folder_path
+        self.__manifest_path: str = os.path.join(images_folder_path, "manifest.json")
+        self.__save_every_writes: int = save_every_writes
+        self.__lock: threading.RLock = threading.RLock()
+        self.__images: (dict[int, dict[str, dict[str]]] | None) = None
+        self.__paths_by_hash: dict[str, str] = {}
+        self.__unsaved_writes: int = 0
+
+    @property
+    def images_folder_path(self) -> str:
+        return self.__images_folder_path
+
+    def get_missing_images(self, steam_apps_ids: Iterable[int]) -> dict[str, set[int]]:
+        images = self.__get_images()
+        missing_images = {image_name: set() for image_name in self.IMAGES_NAMES}
+
+        with self.__lock:
+            for steam_appid in steam_apps_ids:
+                game_images = images.get(steam_appid, {})
+
+                for image_name in self.IMAGES_NAMES:
+                    if image_name not in game_images:
+                        missing_images[image_name].add(steam_appid)
+
+        return missing_images
+
+    def get_image(self, steam_appid: int, image_name: str) -> (dict[str] | None):
+        with self.__lock:
+            return self.__get_images().get(steam_appid, {}).get(image_name)
+
+    def get_image_path(self, steam_appid: int, image_name: str, variant_name: (str | None) = None) -> (str | None):
+        relative_path = self.get_relative_image_path(steam_appid, image_name, variant_name)
+        return os.path.join(self.__images_folder_path, relative_path) if relative_path else None
+
+    def get_relative_image_path(self, steam_appid: int, image_name: str, variant_name: (str | None) = None) -> (str | None):
+        image = self.get_image(steam_appid, image_name)
+
+        if image is None:
+            return None
+
+        variant = image.get("variants", {}).get(variant_name) if variant_name else None
+        return (variant or image)["path"]
+
+    def get_images_without_variants(self, steam_apps_ids: Iterable[int], variants_names: dict[str, Iterable[str]]) -> list[tuple[int, str, list[str]]]:
+        images = self.__get_images()
+        images_without_variants = []
+
+        with self.__lock:
+            for steam_appid in steam_apps_ids:
+                for image_name, image in images.get(steam_appid, {}).items():
+                    missing_variants_names = [variant_name for variant_name in variants_names.get(image_name, ()) if variant_name not in image.get("variants", {})]
+
+                    if missing_variants_names:
+                        images_without_variants.append((steam_appid, image_name, missing_variants_names))
+
+        return images_without_variants
+
+    def create_variant_path(self, steam_appid: int, image_name: str, variant_name: str, file_type: str) -> str:
+        return os.path.join(str(steam_appid), f"{image_name}_{variant_name}.{file_type}")
+
+    def add_image_variant(self, steam_appid: int, image_name: str, variant_name: str, variant: dict[str]) -> None:
+        with self.__lock:
+            image = self.__get_images().get(steam_appid, {}).get(image_name)
+
+            if image is None:
+                return
+
+            image.setdefault("variants", {})[variant_name] = variant
+            self.__unsaved_writes += 1
+
+            if self.__unsaved_writes >= self.__save_every_writes:
+                self.save_manifest()
+
+    def write_image(self, steam_appid: int, image_name: str, image_bytes: bytes, file_type: str, source: str) -> str:
+        image_hash = hashlib.sha256(image_bytes).hexdigest()
+        relative_path = os.path.join(str(steam_appid), image_name + "." + file_type)
+        image_path = os.path.join(self.__images_folder_path, relative_path)
+        os.makedirs(os.path.dirname(image_path), exist_ok=True)
+
+        with self.__lock:
+            images = self.__get_images()
+            previous_image = images.get(steam_appid, {}).get(image_name)
+            duplicated_path = self.__paths_by_hash.get(image_hash)
+
+            if not (duplicated_path and self.__link_atomically(os.path.join(self.__images_folder_path, duplicated_path), image_path)):
+                self.__write_atomically(image_path, image_bytes)
+
+            if previous_image and self.__paths_by_hash.get(previous_image["hash"]) == previous_image["path"]:
+                del self.__paths_by_hash[previous_image["hash"]]
+
+            if previous_image and previous_image["path"] != relative_path:
+                self.__remove_image_file(previous_image)
+
+            for variant in (previous_image or {}).get("variants", {}).values():
+                self.__remove_image_file(variant)
+
+            images.setdefault(steam_appid, {})[image_name] = {"hash": image_hash, "size": len(image_bytes), "format": file_type, "source": source, "path": relative_path}
+            self.__paths_by_hash[image_hash] = relative_path
+            self.__unsaved_writes += 1
+
+            if self.__unsaved_writes >= self.__save_every_writes:
+                self.save_manifest()
+
+        return image_path
+
+    def save_manifest(self) -> None:
+        with self.__lock:
+            if self.__images is None:
+                return
+
+            manifest = {"images": {str(steam_appid): game_images for steam_appid, game_images in self.__images.items()}}
+            os.makedirs(self.__images_folder_path, exist_ok=True)
+            self.__write_atomically(self.__manifest_path, json.dumps(manifest).encode())
+            self.__unsaved_writes = 0
+
+    def __get_images(self) -> dict[int, dict[str, dict[str]]]:
+        with self.__lock:
+            if self.__images is None:
+                self.__images = self.__load_manifest()
+                self.__paths_by_hash = {image["hash"]: image["path"] for game_images in self.__images.values() for image in game_images.values()}
+
+            return self.__images
+
+    def __load_manifest(self) -> dict[int, dict[str, dict[str]]]:
+        try:
+            with open(self.__manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+
+            return {int(steam_appid): game_images for steam_appid, game_images in manifest["images"].items()}
+
+        except FileNotFoundError:
+            images = self.__scan_images_folder()
+
+            if images:
+                self.__images = images
+                self.save_manifest()
+
+            return images
+
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"No se pudo leer el indice de imagenes, se reconstruira: {e!r}")
+            return self.__scan_images_folder()
+
+    def __scan_images_folder(self) -> dict[int, dict[str, dict[str]]]:
+        images = {}
+
+        if not os.path.isdir(self.__images_folder_path):
+            return images
+
+        for game_folder in os.scandir(self.__images_folder_path):
+            if not (game_folder.is_dir() and game_folder.name.isdigit()):
+                continue
+
+            for file in os.scandir(game_folder.path):
+                image_name, file_type = os.path.splitext(file.name)
+                file_type = file_type.lstrip(".")
+
+                if image_name not in self.IMAGES_NAMES or file_type not in self.ACCEPTED_FILE_TYPES:
+                    continue
+
+                with open(file.path, "rb") as image_file:
+                    image_bytes = image_file.read()
+
+                images.setdefault(int(game_folder.name), {})[image_name] = {"hash": hashlib.sha256(image_bytes).hexdigest(), "size": len(image_bytes), "format": file_type,
+                                                                            "source": "unknown", "path": os.path.join(game_folder.name, file.name)}
+
+        return images
+
+    def __write_atomically(self, file_path: str, file_bytes: bytes) -> None:
+        with atomic_write(file_path) as file:
+            file.write(file_bytes)
+
+    def __link_atomically(self, source_path: str, file_path: str) -> bool:
+        if os.path.abspath(source_path) == os.path.abspath(file_path):
+            return os.path.exists(file_path)
+
+        temporary_path = os.path.join(os.path.dirname(file_path), f".{os.path.basename(file_path)}.link")
+
+        try:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+            os.link(source_path, temporary_path)
+            os.replace(temporary_path, file_path)
+            return True
+
+        except OSError:
+            return False
+
+    def __remove_image_file(self, image: dict[str]) -> None:
+        try:
+            os.remove(os.path.join(self.__images_folder_path, image["path"]))
+
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import io
+import os
+import time
+
+from atomic_file import atomic_write
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from image_store import ImageStore
+from logger import logger
+from typing import Iterable
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+PILLOW_FORMATS = {"jpg": "JPEG", "png": "PNG", "webp": "WEBP"}
+
+
+def create_image_variant(source_path: str, variant_path: str, size: tuple[int, int], file_type: str, quality: int) -> dict[str, int]:
+    with Image.open(source_path) as image:
+        image = image.convert("RGBA" if file_type != "jpg" and image.mode in ("RGBA", "LA", "P") else "RGB")
+        image.thumbnail(size, Image.LANCZOS)
+        variant_file = io.BytesIO()
+        image.save(variant_file, format=PILLOW_FORMATS[file_type], quality=quality, optimize=True)
+        width, height = image.size
+
+    with atomic_write(variant_path) as file:
+        file.write(variant_file.getvalue())
+
+    return {"size": variant_file.tell(), "width": width, "height": height}
+
+
+class ImageVariantsProcessor:
+
+    VARIANTS = {"library_600x900_2x": {"tile": (200, 300)},
+                "library_hero": {"banner": (960, 310)}}
+
+    def __init__(self, image_store: ImageStore, variants: (dict[str, dict[str, tuple[int, int]]] | None) = None, file_type: str = "webp", quality: int = 80, max_workers: (int | None) = None,
+                 process_pool_min_variants: (int | None) = None) -> None:
+        self.__image_store: ImageStore = image_store
+        self.__variants: dict[str, dict[str, tuple[int, int]]] = variants if variants is not None else self.VARIANTS
+        self.__file_type: str = file_type
+        self.__quality: int = quality
+        self.__max_workers: int = max_workers or os.cpu_count() or 1
+        # Starting worker processes costs more than a few thumbnails, especially on Windows where each worker imports the app again
+        self.__process_pool_min_variants: int = process_pool_min_variants if process_pool_min_variants is not None else 4 * self.__max_workers
+
+    def process(self, steam_apps_ids: Iterable[int]) -> dict[str, float]:
+        tasks = self.__image_store.get_images_without_variants(steam_apps_ids, self.__variants)
+        statistics = {"total": sum(len(variants_names) for _, _, variants_names in tasks), "created": 0, "failed": 0, "skipped": 0, "bytes": 0, "source_bytes": 0, "elapsed_sec": 0, 
+                      "processes": False}
+        start = time.monotonic()
+
+        if not tasks:
+            return statistics
+
+        if not self.available:
+            logger.info("Pillow no esta instalado, no se generaran variantes de las imagenes")
+            statistics["skipped"] = statistics["total"]
+            return statistics
+
+        statistics["processes"] = statistics["total"] >= self.__process_pool_min_variants
+
+        with self.__create_executor(statistics["processes"]) as executor:
+            futures = {}
+
+            for steam_appid, image_name, variants_names in tasks:
+                image = self.__image_store.get_image(steam_appid, image_name)
+                source_path = self.__image_store.get_image_path(steam_appid, image_name)
+
+                for variant_name in variants_names:
+                    relative_path = self.__image_store.create_variant_path(steam_appid, image_name, variant_name, self.__file_type)
+                    variant_path = os.path.join(self.__image_store.images_folder_path, relative_path)
+                    future = executor.submit(create_image_variant, source_path, variant_path, self.__variants[image_name][variant_name], self.__file_type, self.__quality)
+                    futures[future] = (steam_appid, image_name, variant_name, relative_path, image["size"])
+
+            for future in as_completed(futures):
+                steam_appid, image_name, variant_name, relative_path, source_size = futures[future]
+
+                try:
+                    variant = future.result()
+
+                except Exception as e:
+                    logger.error(f"No se pudo generar la variante {variant_name} de la imagen {image_name} del juego {steam_appid}: {e!r}")
+                    statistics["failed"] += 1
+                    continue
+
+                self.__image_store.add_image_variant(steam_appid, image_name, variant_name, dict(variant, format=self.__file_type, path=relative_path))
+                statistics["created"] += 1
+                statistics["bytes"] += variant["size"]
+                statistics["source_bytes"] += source_size
+
+        self.__image_store.save_manifest()
+        statistics["elapsed_sec"] = time.monotonic() - start
+        logger.info(f"Variantes de imagenes: {statistics['created']}/{statistics['total']} creadas, {statistics['bytes'] / 1024:.1f} KiB de {statistics['source_bytes'] / 1024:.1f} KiB originales")
+
+        return statistics
+
+    def __create_executor(self, processes: bool) -> Executor:
+        return ProcessPoolExecutor(max_workers=self.__max_workers) if processes else ThreadPoolExecutor(max_workers=self.__max_workers)
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
@@ -1,16 +1,137 @@
 from __future__ import annotations
 
+from game_index import GameIndex
 from library_data_manager import LibraryDataManager
+from metrics import metrics
+from stage_pipeline import StagePipeline
 from steam import Steam
+from typing import Iterable
 
 
 class Library:
     
-    def __init__(self, steam_id: str, steam_api_key: str, steam_grid_api_key: str) -> None:
-        self.__data_manager: LibraryDataManager = LibraryDataManager(steam_id, steam_api_key, steam_grid_api_key)
+    SORT_KEYS = ("name", "release_date", "steam_appid")
+    
+    def __init__(self, steam_id: str, steam_api_key: str, steam_grid_api_key: str, data_manager: (LibraryDataManager | None) = None) -> None:
+        self.__data_manager: LibraryDataManager = data_manager or LibraryDataManager(steam_id, steam_api_key, steam_grid_api_key)
+        self.__owns_data_manager: bool = data_manager is None
         self.__steam: Steam = Steam()
+        self.__library_data: (dict[str] | None) = None
+        self.__sorted_games_cache: dict[tuple, list[int]] = {}
+        self.__games_index: (GameIndex | None) = None
+        self.__stages_timings: dict[str, float] = {}
         
     def create_user_library(self) -> dict[str]:
+        pipeline = StagePipeline()
+        pipeline.add_stage("user_data", self.__data_manager.get_user_data)
+        pipeline.add_stage("owned_games", self.__data_manager.get_owned_games)
+        pipeline.add_stage("steam_installation", self.__steam.is_steam_installed)
+        pipeline.add_stage("games_data", lambda user_data, owned_games: self.__data_manager.get_games_data(owned_games), ("user_data", "owned_games"))
+        pipeline.add_stage("images", lambda user_data, owned_games: self.__data_manager.get_images(owned_games), ("user_data", "owned_games"))
+        
+        stages_results = pipeline.run()
+        self.__stages_timings = pipeline.timings
+        
+        if "user_data" not in stages_results:
+            return {"response": "account information error"}
+        
+        if "owned_games" not in stages_results:
+            return {"response": "error games account"}
+        
+        library_data = {"response": "success", "user_data": stages_results["user_data"]}
+        
+        library_data.update(stages_results["games_data"])
+        library_data.update(stages_results["steam_installation"])
+        
+        self.__data_manager.write_library_data(library_data)
+        self.__set_library_data(library_data)
+        
+        return library_data
+    
+    def load_user_library(self) -> dict[str]:
+        library_data = self.__data_manager.get_saved_library_data()
+        
+        if library_data is None:
+            library_data = self.create_user_library()
+            return dict(self.get_library_summary(), cached=False) if library_data["response"] == "success" else library_data
+        
+        self.__set_library_data(library_data)
+            
+        return dict(self.get_library_summary(), cached=True)
+    
+    def close(self) -> None:
+        if self.__owns_data_manager:
+            self.__data_manager.close()
+    
+    def get_library_summary(self) -> dict[str]:
+        if self.__library_data is None:
+            return {"response": "library not loaded"}
+        
+        library_data = self.__library_data
+        
+        return {"response": "success",
+                "user_data": library_data["user_data"],
+                "games_count": len(library_data["games_data"]),
+                "categories": {category: len(steam_apps_ids) for category, steam_apps_ids in library_data["categories"].items()},
+                "genres": {genre: len(steam_apps_ids) for genre, steam_apps_ids in library_data["genres"].items()},
+                "favorite_games": library_data.get("favorite_games", {}),
+                "eliminated_games": library_data.get("eliminated_games", {}),
+                "is_steam_installed": library_data.get("is_steam_installed", False)}
+    
+    def get_games_page(self, offset: int = 0, limit: int = 100, sort_by: str = "name", descending: bool = False, 
+                       genre: (str | None) = None, category: (str | None) = None, developer: (str | None) = None, search: (str | None) = None) -> dict[str]:
+        if self.__library_data is None:
+            return {"response": "library not loaded"}
+        
+        if sort_by not in self.SORT_KEYS:
+            return {"response": "invalid sort"}
+        
+        games_data = self.__library_data["games_data"]
+        steam_apps_ids = self.__get_sorted_games(sort_by, descending, genre, category, developer, search)
+        page = steam_apps_ids[max(offset, 0):max(offset, 0) + max(limit, 0)]
+        
+        return {"response": "success", 
+                "total": len(steam_apps_ids), 
+                "offset": offset, 
+                "games": [dict(games_data[steam_appid].to_dict(include_description=False), steam_appid=steam_appid, 
+                                grid_image=self.__data_manager.get_grid_image_path(steam_appid)) for steam_appid in page]}
+    
+    def filter_games(self, genres: Iterable[str] = (), categories: Iterable[str] = (), developers: Iterable[str] = (), publishers: Iterable[str] = (), 
+                     search: (str | None) = None, sort_by: str = "name", descending: bool = False) -> dict[str]:
+        if self.__library_data is None:
+            return {"response": "library not loaded"}
+        
+        if sort_by not in self.SORT_KEYS:
+            return {"response": "invalid sort"}
+        
+        steam_apps_ids = self.__get_games_index().query(genres, categories, developers, publishers, search, sort_by, descending)
+        
+        return {"response": "success", "total": len(steam_apps_ids), "steam_apps_ids": steam_apps_ids}
+    
+    def get_games_states(self) -> dict[int, str]:
+        if self.__library_data is None:
+            return {}
+        
+        return self.__steam.get_games_states(self.__library_data["games_data"])
+    
+    def get_game_description(self, steam_appid: int) -> (str | None):
+        game = self.__library_data["games_data"].get(steam_appid) if self.__library_data else None
+        
+        if game is None:
+            return None
+        
+        if game.description is None:
+            game = self.__library_data["games_data"][steam_appid] = game.with_description(self.__data_manager.get_saved_game_description(steam_appid) or "")
+            
+        return game.description
+    
+    def refresh_user_library(self) -> dict[str]:
+        previous_owned_games = self.__data_manager.get_saved_owned_games()
+        previous_library_data = self.__data_manager.get_saved_library_data(include_descriptions=True)
+        
+        if previous_owned_games is None or previous_library_data is None:
+            return self.create_user_library()
+        
         user_data = self.__data_manager.get_user_data()
         
         if user_data is None:
@@ -21,16 +142,23 @@ class Library:
         if owned_games is None:
             return {"response": "error games account"}
         
-        library_data = {"response": "success", "user_data": user_data}
+        previous_games_data = previous_library_data["games_data"]
+        added_games = {steam_appid: name for steam_appid, name in owned_games.items() if steam_appid not in previous_owned_games or steam_appid not in previous_games_data}
+        removed_games = [steam_appid for steam_appid in previous_games_data if steam_appid not in owned_games]
         
-        library_data.update(self.__data_manager.get_games_data(owned_games))
-        library_data.update(self.__steam.is_steam_installed())
-
-        self.__data_manager.get_images(library_data["games_data"])
+        library_delta = {"response": "success", "incremental": True, "user_data": user_data, "removed_games": removed_games}
+        library_delta["added_games"] = self.__data_manager.get_games_details(added_games) if added_games else {}
+        library_delta.update(self.__data_manager.get_games_classifications(owned_games))
+        library_delta.update(self.__steam.is_steam_installed())
         
-        self.__data_manager.write_user_json_file("data", library_data)
+        if added_games:
+            self.__data_manager.get_images(added_games)
         
-        return library_data
+        library_data = self.__apply_library_delta(previous_library_data, library_delta)
+        self.__data_manager.write_library_data(library_data)
+        self.__set_library_data(library_data)
+        
+        return library_delta
     
     def update_favorite_games(self, favorite_games: dict[str, int]) -> None:
         self.__data_manager.write_user_json_file("favorite_games", favorite_games)
@@ -38,6 +166,60 @@ class Library:
     def update_eliminated_games(self, eliminated_games: dict[str, int]) -> None:
         self.__data_manager.write_user_json_file("eliminated_games", eliminated_games)
         
+    def __set_library_data(self, library_data: dict[str]) -> None:
+        self.__library_data = library_data
+        self.__games_index = None
+        self.__sorted_games_cache.clear()
+        
+    def __get_sorted_games(self, sort_by: str, descending: bool, genre: (str | None), category: (str | None), developer: (str | None), search: (str | None)) -> list[int]:
+        cache_key = (sort_by, descending, genre, category, developer, search)
+        
+        if cache_key not in self.__sorted_games_cache:
+            games_index = self.__get_games_index()
+            
+            if len(self.__sorted_games_cache) >= 32:
+                self.__sorted_games_cache.clear()
+                
+            self.__sorted_games_cache[cache_key] = games_index.query([genre] if genre is not None else (), [category] if category is not None else (), 
+                                                                     [developer] if developer is not None else (), search=search, sort_by=sort_by, descending=descending)
+            
+        return self.__sorted_games_cache[cache_key]
+    
+    def __get_games_index(self) -> GameIndex:
+        if self.__games_index is None:
+            self.__games_index = GameIndex(self.__library_data["games_data"], self.__data_manager.get_release_dates(self.__library_data["games_data"]))
+            
+        return self.__games_index
+        
+    @staticmethod
+    def get_build_progress() -> dict[str]:
+        running_stages = [dict(labels_key)["stage"] for labels_key, running in metrics.get_gauges("build_stage_running").items() if running]
+        progress = {"running_stages": running_stages}
+        
+        for step in ("appdetails", "images"):
+            total = metrics.get_gauges(f"build_{step}_total").get((), 0)
+            done = metrics.get_gauges(f"build_{step}_done").get((), 0)
+            progress[step] = {"done": done, "total": total}
+        
+        return progress
+        
+    def __apply_library_delta(self, library_data: dict[str], library_delta: dict[str]) -> dict[str]:
+        games_data = library_data["games_data"]
+        
+        for steam_appid in library_delta["removed_games"]:
+            games_data.pop(steam_appid, None)
+        
+        games_data.update(library_delta["added_games"])
+        
+        for key in ("user_data", "categories", "genres", "is_steam_installed"):
+            library_data[key] = library_delta[key]
+        
+        return library_data
+        
+    @property
+    def stages_timings(self) -> dict[str, float]:
+        return dict(self.__stages_timings)
+        
     @property
     def steam(self):
         return self.__steam
\ No newline at end of file
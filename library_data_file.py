@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import os
+import time
+import zlib
+
+from atomic_file import atomic_write
+from game_record import GameRecord
+from logger import logger
+from typing import Any, IO, Iterable, Iterator
+
+
+class LibraryDataFile:
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, folder_path: str, file_name: str = "data", compress: bool = False) -> None:
+        self.__compress: bool = compress
+        self.__data_path: str = os.path.join(folder_path, file_name + ".jsonl" + (".gz" if compress else ""))
+        self.__other_data_path: str = os.path.join(folder_path, file_name + ".jsonl" + ("" if compress else ".gz"))
+        self.__folder_path: str = folder_path
+        self.__descriptions_prefix: str = file_name + "_descriptions_"
+        self.__legacy_data_path: str = os.path.join(folder_path, file_name + ".json")
+        self.__encoder: json.JSONEncoder = json.JSONEncoder(separators=(",", ":"))
+        self.__header: (dict[str] | None) = None
+        self.__header_mtime_ns: (int | None) = None
+
+    def write(self, library_data: dict[str]) -> None:
+        games_data = library_data.get("games_data", {})
+        descriptions_file_name = f"{self.__descriptions_prefix}{time.time_ns()}.bin"
+
+        with atomic_write(os.path.join(self.__folder_path, descriptions_file_name)) as descriptions_file:
+            descriptions_index = self.__write_descriptions(descriptions_file, games_data)
+
+        header = {"format": self.FORMAT_VERSION,
+                  "descriptions_file": descriptions_file_name,
+                  "compressed_descriptions": self.__compress,
+                  "descriptions_index": descriptions_index,
+                  "library_data": {key: value for key, value in library_data.items() if key != "games_data"}}
+
+        with atomic_write(self.__data_path) as data_file:
+            binary_file = gzip.GzipFile(fileobj=data_file, mode="wb", compresslevel=6) if self.__compress else data_file
+            text_file = io.TextIOWrapper(binary_file, encoding="utf-8")
+            self.__write_line(text_file, header)
+
+            for steam_appid, game in games_data.items():
+                self.__write_line(text_file, [int(steam_appid), {field: value for field, value in game.items() if field != "description"}])
+
+            text_file.flush()
+            text_file.detach()
+
+            if self.__compress:
+                binary_file.close()
+
+        stale_paths = [self.__other_data_path, self.__legacy_data_path]
+        stale_paths += [os.path.join(self.__folder_path, file_name) for file_name in os.listdir(self.__folder_path) if file_name.startswith(self.__descriptions_prefix) and file_name != descriptions_file_name]
+
+        for stale_path in stale_paths:
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
+
+        self.__header = None
+
+    def read(self, include_descriptions: bool = False) -> (dict[str] | None):
+        if not os.path.exists(self.__data_path) and not os.path.exists(self.__other_data_path):
+            return self.__read_legacy_data()
+
+        try:
+            library_data = dict(self.__read_header()["library_data"])
+            library_data["games_data"] = dict(self.iter_games())
+
+            if include_descriptions:
+                descriptions = self.read_descriptions(library_data["games_data"])
+
+                library_data["games_data"] = {steam_appid: game.with_description(descriptions.get(steam_appid, "")) for steam_appid, game in library_data["games_data"].items()}
+
+            return library_data
+
+        except (OSError, ValueError, KeyError) as e:
+            logger.info(f"No se pudo leer el archivo {self.__data_path}: {e!r}")
+
+        return None
+
+    def iter_games(self) -> Iterator[tuple[int, GameRecord]]:
+        with self.__open_text_reader() as text_file:
+            next(text_file)
+
+            for line in text_file:
+                steam_appid, game = json.loads(line)
+                yield steam_appid, GameRecord.from_dict(game)
+
+    def read_description(self, steam_appid: int) -> (str | None):
+        return self.read_descriptions([steam_appid]).get(steam_appid)
+
+    def read_descriptions(self, steam_apps_ids: Iterable[int]) -> dict[int, str]:
+        header = self.__read_header()
+        descriptions_index = header["descriptions_index"]
+        descriptions = {}
+
+        with open(os.path.join(self.__folder_path, header["descriptions_file"]), "rb") as descriptions_file:
+            for steam_appid in sorted(steam_apps_ids, key=lambda steam_appid: descriptions_index.get(str(steam_appid), (0, 0))[0]):
+                position = descriptions_index.get(str(steam_appid))
+
+                if position is None:
+                    continue
+
+                offset, length = position
+                descriptions_file.seek(offset)
+                description_bytes = descriptions_file.read(length)
+                descriptions[steam_appid] = (zlib.decompress(description_bytes) if header["compressed_descriptions"] else description_bytes).decode()
+
+        return descriptions
+
+    def __write_descriptions(self, descriptions_file: IO[bytes], games_data: dict[int, GameRecord]) -> dict[str, tuple[int, int]]:
+        descriptions_index = {}
+        offset = 0
+
+        for steam_appid, game in games_data.items():
+            description_bytes = (game.get("description") or "").encode()
+            description_bytes = zlib.compress(description_bytes) if self.__compress else description_bytes
+            descriptions_file.write(description_bytes)
+            descriptions_index[str(steam_appid)] = (offset, len(description_bytes))
+            offset += len(description_bytes)
+
+        return descriptions_index
+
+    def __write_line(self, text_file: IO[str], value: Any) -> None:
+        for chunk in self.__encoder.iterencode(value):
+            text_file.write(chunk)
+        text_file.write("\n")
+
+    def __get_existing_data_path(self) -> str:
+        return self.__data_path if os.path.exists(self.__data_path) else self.__other_data_path
+
+    def __open_text_reader(self) -> IO[str]:
+        data_path = self.__get_existing_data_path()
+        return gzip.open(data_path, "rt", encoding="utf-8") if data_path.endswith(".gz") else open(data_path, encoding="utf-8")
+
+    def __read_header(self) -> dict[str]:
+        mtime_ns = os.stat(self.__get_existing_data_path()).st_mtime_ns
+
+        if self.__header is None or self.__header_mtime_ns != mtime_ns:
+            with self.__open_text_reader() as text_file:
+                self.__header = json.loads(next(text_file))
+                self.__header_mtime_ns = mtime_ns
+
+        return self.__header
+
+    def __read_legacy_data(self) -> (dict[str] | None):
+        try:
+            with open(self.__legacy_data_path) as legacy_file:
+                library_data = json.load(legacy_file)
+
+            library_data["games_data"] = {int(steam_appid): GameRecord.from_dict(game) for steam_appid, game in library_data.get("games_data", {}).items()}
+            return library_data
+
+        except (OSError, ValueError) as e:
+            logger.info(f"No se pudo leer el archivo {self.__legacy_data_path}: {e!r}")
+
+        return None
@@ -2,21 +2,41 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 
 from apis import SteamAPI, SteamGridAPI
+from atomic_file import atomic_write
 from databases import GamesDatabase
+from game_record import GameRecord
+from http_cache import HTTPCache
+from image_downloader import ImageDownloader
+from image_store import ImageStore
+from image_variants import ImageVariantsProcessor
+from library_data_file import LibraryDataFile
 from logger import logger
-from typing import Iterable, Any
+from metrics import metrics
+from requests import ConnectionError, RequestException
+from typing import Any, Callable, Iterable
 from user import User
 
 
 class LibraryDataManager:
 
-    def __init__(self, steam_id: str, steam_api_key: str, steam_grid_api_key: str) -> None:
+    def __init__(self, steam_id: str, steam_api_key: str, steam_grid_api_key: str, steam_api: (SteamAPI | None) = None, steam_grid_api: (SteamGridAPI | None) = None,
+                 games_db: (GamesDatabase | None) = None, image_store: (ImageStore | None) = None) -> None:
+        http_cache = HTTPCache() if steam_api is None or steam_grid_api is None else None
         self.__user: User = User(steam_id)
-        self.__steam_api: SteamAPI = SteamAPI(steam_api_key)
-        self.__steam_grid_api: SteamGridAPI = SteamGridAPI(steam_grid_api_key)
-        self.__games_db: GamesDatabase = GamesDatabase()
+        self.__steam_api: SteamAPI = steam_api or SteamAPI(steam_api_key, http_cache=http_cache)
+        self.__steam_grid_api: SteamGridAPI = steam_grid_api or SteamGridAPI(steam_grid_api_key, http_cache=http_cache)
+        self.__games_db: GamesDatabase = games_db or GamesDatabase()
+        self.__owned_resources: list[SteamAPI | SteamGridAPI | GamesDatabase | HTTPCache] = [resource for resource, injected in ((http_cache, None), (self.__steam_api, steam_api), 
+                                                                                                                  (self.__steam_grid_api, steam_grid_api), (self.__games_db, games_db)) 
+                                                                                            if resource is not None and injected is None]
+        self.__image_downloader: ImageDownloader = ImageDownloader()
+        self.__image_store: ImageStore = image_store or ImageStore()
+        self.__image_variants_processor: ImageVariantsProcessor = ImageVariantsProcessor(self.__image_store)
+        self.__library_data_file: LibraryDataFile = LibraryDataFile(self.__user.user_folder)
+        self.__revalidation_thread: (threading.Thread | None) = None
         
     def get_user_data(self) -> (dict[str, str] | None):
         try:
@@ -48,99 +68,177 @@ class LibraryDataManager:
         except Exception as e:
             logger.error(f"Ocurrio un error mientras se obtenia la lista de juegos de la cuenta {self.__user} desde la API de Steam")
         
+        return self.get_saved_owned_games()
+    
+    def get_saved_owned_games(self) -> (dict[int, str] | None):
         owned_games = self.__read_user_json_file("owned_games", None)
         owned_games = {int(steam_appid): name for steam_appid, name in owned_games.items()} if owned_games else None
         
         return owned_games
     
-    def get_games_data(self, owned_games: dict[int, str]) -> dict[str, dict]:
-        games_dict = {"games_data": self.__games_db.get_games(owned_games)}
-        
-        requested_games_data = self.__steam_api.get_apps_details((steam_appid for steam_appid in owned_games if steam_appid not in games_dict["games_data"]), owned_games)
-        self.__games_db.add_games(requested_games_data)
+    def get_saved_library_data(self, include_descriptions: bool = False) -> (dict[str] | None):
+        return self.__library_data_file.read(include_descriptions)
+    
+    def get_saved_game_description(self, steam_appid: int) -> (str | None):
+        try:
+            return self.__library_data_file.read_description(steam_appid)
         
-        games_dict["games_data"].update(requested_games_data)
-        games_dict["categories"] = self.__summarize_game_classifications(games_dict["games_data"], "categories")
-        games_dict["genres"] = self.__summarize_game_classifications(games_dict["games_data"], "genres")
-        games_dict["favorite_games"] = self.__read_user_json_file("favorite_games", {})
-        games_dict["eliminated_games"] = self.__read_user_json_file("eliminated_games", {})
+        except (OSError, ValueError, KeyError) as e:
+            logger.info(f"No se pudo leer la descripcion del juego {steam_appid}")
+            
+        return None
+    
+    def write_library_data(self, library_data: dict[str]) -> None:
+        try:
+            self.__library_data_file.write(library_data)
         
-        return games_dict
+        except IOError as e:
+            logger.error(f"No se pudo escribir la informacion de la libreria de la cuenta {self.__user}")
     
-    def get_images(self, owned_games: dict[int, str]) -> None:
-        images = self.__games_with_images(owned_games)
+    def get_games_details(self, owned_games: dict[int, str], max_revalidations: int = 200) -> dict[int, GameRecord]:
+        games_data = self.__games_db.get_games(owned_games)
+        recently_failed_apps_ids = self.__games_db.get_recently_failed_appids(steam_appid for steam_appid in owned_games if steam_appid not in games_data)
         
-        try:
-            for steam_appid in owned_games:
-                
-                if steam_appid not in images["library_600x900_2x"]:
-                    self.__get_grid(steam_appid)
-                
-                if steam_appid not in images["library_hero"]:
-                    self.__get_heroe(steam_appid)
+        self.__games_db.add_pending_appdetails({steam_appid: name for steam_appid, name in owned_games.items() if steam_appid not in games_data and steam_appid not in recently_failed_apps_ids})
+        pending_games = self.__games_db.get_pending_appdetails()
         
-        except Exception as e:
-            logger.error(f"Se perdio la conexion mientras se conseguian las imagenes de los juegos de la cuenta {self.__user}")
+        if pending_games:
+            logger.info(f"Obteniendo informacion de {len(pending_games)} juegos pendientes")
+        
+        metrics.set_gauge("build_appdetails_total", len(pending_games))
+        metrics.set_gauge("build_appdetails_done", 0)
+        requested_games_data, _ = self.__steam_api.get_apps_details(pending_games, pending_games, self.__add_crawled_games_chunk)
+        requested_games_data = {steam_appid: game for steam_appid, game in requested_games_data.items() if steam_appid in owned_games}
+        
+        stale_apps_ids = self.__games_db.get_stale_appids(games_data)[:max_revalidations]
+        
+        games_data.update(requested_games_data)
+        games_data.update({steam_appid: self.__create_placeholder_game(name) for steam_appid, name in owned_games.items() if steam_appid not in games_data})
+        
+        if stale_apps_ids:
+            self.__revalidate_games_in_background(stale_apps_ids, owned_games)
+        
+        return games_data
+    
+    def __add_crawled_games_chunk(self, games_data: dict[int, GameRecord], failed_apps_ids: list[int]) -> None:
+        self.__games_db.add_crawled_games(games_data, failed_apps_ids)
+        metrics.increment("build_appdetails_done", len(games_data) + len(failed_apps_ids))
     
-    def __get_grid(self, steam_appid: int) -> None:
-        grid = self.__steam_api.get_grid(steam_appid)
-        grid = self.__steam_grid_api.get_grid(steam_appid) if not grid else grid
+    def __revalidate_games_in_background(self, steam_apps_ids: list[int], owned_games: dict[int, str]) -> None:
+        if self.__revalidation_thread is not None and self.__revalidation_thread.is_alive():
+            return
         
-        if grid:
-            grid_bytes, file_type = grid
-            self.__write_image_bytes(steam_appid, grid_bytes,"library_600x900_2x", file_type)
+        def revalidate_games() -> None:
+            try:
+                revalidated_games_data, failed_apps_ids = self.__steam_api.get_apps_details(steam_apps_ids, owned_games, self.__games_db.add_crawled_games)
+                logger.info(f"Se actualizaron {len(revalidated_games_data)} de {len(steam_apps_ids)} juegos desactualizados de la cuenta {self.__user}")
             
-    def __get_heroe(self, steam_appid: int) -> None:
-        heroe = self.__steam_api.get_heroe(steam_appid)
-        heroe = self.__steam_grid_api.get_heroe(steam_appid) if not heroe else heroe
+            except Exception as e:
+                logger.error(f"Ocurrio un error mientras se actualizaban los juegos desactualizados de la cuenta {self.__user}: {e!r}")
+            
+            finally:
+                self.__games_db.close_thread_connection()
+        
+        self.__revalidation_thread = threading.Thread(target=revalidate_games, daemon=True)
+        self.__revalidation_thread.start()
         
-        if heroe:
-            heroe_bytes, file_type = heroe
-            self.__write_image_bytes(steam_appid, heroe_bytes, "library_hero", file_type)
+    def close(self) -> None:
+        for resource in self.__owned_resources:
+            resource.close()
+            
+        self.__owned_resources.clear()
+    
+    def __create_placeholder_game(self, name: str) -> GameRecord:
+        return GameRecord(name, "")
+    
+    def get_release_dates(self, steam_apps_ids: Iterable[int]) -> dict[int, tuple[(str | None), str]]:
+        return self.__games_db.get_release_dates(steam_apps_ids)
+    
+    def get_games_classifications(self, steam_apps_ids: Iterable[int]) -> dict[str, dict[str, list[int]]]:
+        steam_apps_ids = list(steam_apps_ids)
+        return {"categories": self.__games_db.summarize_classifications("categories", steam_apps_ids), 
+                "genres": self.__games_db.summarize_classifications("genres", steam_apps_ids)}
     
-    def __write_image_bytes(self, steam_appid: int, image_bytes: bytes, file_name: str, file_type: str) -> None:
-        game_folder_path = os.path.join("src", "images", str(steam_appid))
-        os.makedirs(game_folder_path, exist_ok=True)
-        image_path = os.path.join(game_folder_path, file_name + "." + file_type)
+    def get_games_data(self, owned_games: dict[int, str], max_revalidations: int = 200) -> dict[str, dict]:
+        return self.__create_games_dict(self.get_games_details(owned_games, max_revalidations))
+    
+    def get_stored_games_data(self, owned_games: dict[int, str]) -> dict[str, dict]:
+        games_data = self.__games_db.get_games(owned_games)
+        games_data.update({steam_appid: self.__create_placeholder_game(name) for steam_appid, name in owned_games.items() if steam_appid not in games_data})
+        
+        return self.__create_games_dict(games_data)
+    
+    def __create_games_dict(self, games_data: dict[int, GameRecord]) -> dict[str, dict]:
+        games_dict = {"games_data": games_data}
+        
+        games_dict.update(self.get_games_classifications(games_dict["games_data"]))
+        games_dict["favorite_games"] = self.__read_user_json_file("favorite_games", {})
+        games_dict["eliminated_games"] = self.__read_user_json_file("eliminated_games", {})
+        
+        return games_dict
+    
+    def get_images(self, owned_games: dict[int, str]) -> dict[str, float]:
+        missing_images = self.__image_store.get_missing_images(owned_games)
+        tasks = [(steam_appid, image_name) for steam_appid in owned_games for image_name in missing_images if steam_appid in missing_images[image_name]]
         
         try:
-            with open(image_path, "wb") as image:
-                image.write(image_bytes) 
+            statistics = self.__image_downloader.download(tasks, self.__get_image, self.__write_image_bytes)
         
-        except IOError as e:
-            logger.error(f"Ocurrio un error mientras se escribian los bits de la imagen {file_name} del juego {steam_appid}") 
+        finally:
+            self.__image_store.save_manifest()
             
-    def __games_with_images(self, steam_apps_ids: Iterable[int]) -> dict[str, set[int]]:
-        images_folder_path = os.path.join("src", "images")
-        accepted_file_types = {".jpg", ".png", ".webp"}
-        images = {"library_600x900_2x": set(), "library_hero": set()}
+        statistics["variants"] = self.__image_variants_processor.process(owned_games)
         
-        if os.path.exists(images_folder_path):
+        return statistics
+    
+    def get_grid_image_path(self, steam_appid: int) -> (str | None):
+        return self.__image_store.get_relative_image_path(steam_appid, "library_600x900_2x", "tile")
+    
+    def __get_image(self, steam_appid: int, image_name: str) -> (tuple[bytes, str, str] | None):
+        return self.__get_grid(steam_appid) if image_name == "library_600x900_2x" else self.__get_heroe(steam_appid)
+    
+    def __get_grid(self, steam_appid: int) -> (tuple[bytes, str, str] | None):
+        return self.__get_image_from_sources(steam_appid, "library_600x900_2x", (("steam", self.__steam_api.get_grid), ("steamgriddb", self.__steam_grid_api.get_grid)))
             
-            for steam_appid in steam_apps_ids:
-                game_folder = os.path.join(images_folder_path, str(steam_appid))
-                if not os.path.exists(game_folder):
+    def __get_heroe(self, steam_appid: int) -> (tuple[bytes, str, str] | None):
+        return self.__get_image_from_sources(steam_appid, "library_hero", (("steam", self.__steam_api.get_heroe), ("steamgriddb", self.__steam_grid_api.get_heroe)))
+    
+    def __get_image_from_sources(self, steam_appid: int, image_name: str, sources: tuple[tuple[str, Callable[[int], (tuple[bytes, str] | None)]], ...]) -> (tuple[bytes, str, str] | None):
+        missing_sources = self.__games_db.get_missing_image_sources(steam_appid, image_name)
+        new_missing_images = []
+        
+        try:
+            for source, get_image in sources:
+                
+                if source in missing_sources:
                     continue
                 
-                for file in os.listdir(game_folder):
-                    name, file_type = os.path.splitext(file) 
-                    if name in images and file_type in accepted_file_types:
-                        images[name].add(steam_appid) 
-
-        return images
-    
-    def __summarize_game_classifications(self, games_data: dict[int, dict[str]], classification_type: str) -> dict[str, list[int]]:
-        classifications = {}
+                try:
+                    image = get_image(steam_appid)
+                
+                except ConnectionError:
+                    raise
+                
+                except RequestException as e:
+                    logger.warning(f"No se pudo conseguir la imagen {image_name} del juego {steam_appid} desde {source}: {e!r}")
+                    continue
+                
+                if image:
+                    return image + (source,)
+                
+                new_missing_images.append((steam_appid, image_name, source))
         
-        for game_data in games_data.values():
-            for classification in game_data[classification_type]:
-                classifications[classification] = []
-             
-        for steam_appid, game_data in games_data.items(): 
-            for classification in game_data[classification_type]:  
-                classifications[classification].append(steam_appid)
+        finally:
+            if new_missing_images:
+                self.__games_db.add_missing_images(new_missing_images)
+                
+        return None
+    
+    def __write_image_bytes(self, steam_appid: int, image_bytes: bytes, file_name: str, file_type: str, source: str) -> None:
+        with metrics.timer("image_write_seconds", source=source):
+            self.__image_store.write_image(steam_appid, file_name, image_bytes, file_type, source)
         
-        return classifications
+        metrics.increment("image_bytes_written_total", len(image_bytes), source=source)
     
     def __read_user_json_file(self, file_name: str, default_value) -> (dict | Any):
         file_path = os.path.join(self.__user.user_folder, file_name + ".json")
@@ -159,7 +257,7 @@ class LibraryDataManager:
         file_path = os.path.join(self.__user.user_folder, file_name + ".json")
         
         try:
-            with open(file_path, "w") as file:    
+            with atomic_write(file_path, "w") as file:    
                 json.dump(file_data, file, indent=5)
 
         except IOError as e:
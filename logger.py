@@ -1,27 +1,33 @@
 from __future__ import annotations
 
 import logging
+import os
 
 class Logger:
 
-    def __init__(self, log_file: str) -> None:
-        self.__logger = self.__create_logger(log_file)
+    def __init__(self, log_file: str, level: (int | str) = logging.ERROR) -> None:
+        self.__logger = self.__create_logger(log_file, level)
 
-    def __create_logger(self, log_file: str) -> logging.Logger:
+    def __create_logger(self, log_file: str, level: (int | str)) -> logging.Logger:
 
         logger = logging.getLogger()
-        logger.setLevel(logging.ERROR)
+        logger.setLevel(level)
         
         file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.ERROR)
+        file_handler.setLevel(level)
         
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         file_handler.setFormatter(formatter)
         
         logger.addHandler(file_handler)
+        self.__file_handler = file_handler
 
         return logger
     
+    def set_level(self, level: (int | str)) -> None:
+        self.__logger.setLevel(level)
+        self.__file_handler.setLevel(level)
+    
     def info(self, message: str) -> None:
         self.__logger.info(message)
         
@@ -34,4 +40,4 @@ class Logger:
     def critical(self, message: str) -> None:
         self.__logger.critical(message)
 
-logger = Logger("app.log")
\ No newline at end of file
+logger = Logger("app.log", os.environ.get("STEAM_LIBRARY_LOG_LEVEL", "ERROR").upper())
\ No newline at end of file
@@ -1,7 +1,15 @@
 from __future__ import annotations
 
 import eel
+import gevent
+import multiprocessing
+from game_record import games_to_dicts
 from library import Library
+from metrics import metrics
+
+
+def convertir_juegos(respuesta: dict[str]) -> dict[str]:
+    return dict(respuesta, **{clave: games_to_dicts(respuesta[clave]) for clave in ("games_data", "added_games") if clave in respuesta})
 
 
 def main():
@@ -18,11 +26,81 @@ def main():
     def actualizar_juegos_eliminados(juegos_favoritos: dict[str, int]):
         libreria.update_favorite_games(juegos_favoritos)
     
+    def reemplazar_libreria(libreria_anterior: (Library | None), usuario: dict[str, str]) -> Library:
+        if libreria_anterior is not None:
+            libreria_anterior.close()
+        
+        return Library(usuario["steam_id"], usuario["steam_api_key"], usuario["steam_grid_api_key"])
+    
     @eel.expose
     def crear_libreria(usuario: dict[str, str]):
-        libreria = Library(usuario["steam_id"], usuario["steam_api_key"], usuario["steam_grid_api_key"])
+        nonlocal libreria
+        libreria = reemplazar_libreria(libreria, usuario)
         info_libreria = libreria.create_user_library()
-        return info_libreria
+        return convertir_juegos(info_libreria)
+    
+    @eel.expose
+    def iniciar_libreria(usuario: dict[str, str]):
+        nonlocal libreria
+        libreria = reemplazar_libreria(libreria, usuario)
+        resumen_libreria = libreria.load_user_library()
+        
+        if resumen_libreria.get("cached"):
+            eel.spawn(refrescar_libreria, libreria)
+            
+        return resumen_libreria
+    
+    def refrescar_libreria(libreria_a_refrescar: Library) -> None:
+        # El refresco hace peticiones HTTP, consultas a sqlite y espera a sus hilos, asi que se ejecuta fuera del hub de gevent
+        cambios_libreria = gevent.get_hub().threadpool.spawn(libreria_a_refrescar.refresh_user_library).get()
+        
+        if cambios_libreria.get("added_games") or cambios_libreria.get("removed_games"):
+            eel.libreria_actualizada(libreria_a_refrescar.get_library_summary())
+    
+    @eel.expose
+    def obtener_resumen_libreria():
+        return libreria.get_library_summary() if libreria else {"response": "library not loaded"}
+    
+    @eel.expose
+    def obtener_juegos(desplazamiento: int = 0, limite: int = 100, opciones: (dict[str] | None) = None):
+        if libreria is None:
+            return {"response": "library not loaded"}
+        
+        opciones = opciones or {}
+        return libreria.get_games_page(desplazamiento, limite, opciones.get("sort_by", "name"), opciones.get("descending", False), 
+                                       opciones.get("genre"), opciones.get("category"), opciones.get("developer"), opciones.get("search"))
+    
+    @eel.expose
+    def filtrar_juegos(opciones: (dict[str] | None) = None):
+        if libreria is None:
+            return {"response": "library not loaded"}
+        
+        opciones = opciones or {}
+        return libreria.filter_games(opciones.get("genres", ()), opciones.get("categories", ()), opciones.get("developers", ()), opciones.get("publishers", ()), 
+                                     opciones.get("search"), opciones.get("sort_by", "name"), opciones.get("descending", False))
+    
+    @eel.expose
+    def obtener_estados_juegos():
+        return libreria.get_games_states() if libreria else {}
+    
+    @eel.expose
+    def obtener_descripcion_juego(steam_appid: int | str):
+        return libreria.get_game_description(int(steam_appid)) if libreria else None
+    
+    @eel.expose
+    def actualizar_libreria(usuario: dict[str, str]):
+        nonlocal libreria
+        libreria = reemplazar_libreria(libreria, usuario)
+        cambios_libreria = libreria.refresh_user_library()
+        return convertir_juegos(cambios_libreria)
+    
+    @eel.expose
+    def obtener_progreso_libreria():
+        return Library.get_build_progress()
+    
+    @eel.expose
+    def obtener_metricas(formato: str = "json"):
+        return metrics.to_prometheus() if formato == "prometheus" else metrics.to_dict()
     
     libreria = None
     
@@ -30,6 +108,7 @@ def main():
     eel.start("views/login.html")
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
 # 76561198941605330
 # EA29ED634385FF016C0B0363F3F23D27
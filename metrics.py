@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Iterator
+
+
+LabelsKey = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets: tuple[float, ...] = buckets
+        self.counts: list[int] = [0] * (len(buckets) + 1)
+        self.count: int = 0
+        self.sum: float = 0
+        self.min: float = float("inf")
+        self.max: float = float("-inf")
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, quantile: float) -> float:
+        rank = quantile * self.count
+        cumulative_count = 0
+
+        for bucket, count in zip(self.buckets + (self.max,), self.counts):
+            cumulative_count += count
+
+            if cumulative_count >= rank:
+                return min(bucket, self.max)
+
+        return self.max
+
+    def summarize(self) -> dict[str, float]:
+        return {"count": self.count, "sum": self.sum, "min": self.min, "max": self.max, "mean": self.sum / self.count,
+                "p50": self.quantile(0.5), "p95": self.quantile(0.95), "p99": self.quantile(0.99)}
+
+
+class Metrics:
+
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.__enabled: bool = enabled
+        self.__lock: threading.Lock = threading.Lock()
+        self.__counters: dict[str, dict[LabelsKey, float]] = {}
+        self.__gauges: dict[str, dict[LabelsKey, float]] = {}
+        self.__histograms: dict[str, dict[LabelsKey, Histogram]] = {}
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        if not self.__enabled:
+            return
+
+        labels_key = tuple(sorted(labels.items()))
+
+        with self.__lock:
+            counter = self.__counters.setdefault(name, {})
+            counter[labels_key] = counter.get(labels_key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        if not self.__enabled:
+            return
+
+        with self.__lock:
+            self.__gauges.setdefault(name, {})[tuple(sorted(labels.items()))] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        if not self.__enabled:
+            return
+
+        labels_key = tuple(sorted(labels.items()))
+
+        with self.__lock:
+            histograms = self.__histograms.setdefault(name, {})
+
+            if labels_key not in histograms:
+                histograms[labels_key] = Histogram(self.DEFAULT_BUCKETS)
+
+            histograms[labels_key].observe(value)
+
+    def timer(self, name: str, **labels: str) -> ContextManager[None]:
+        return self.__time(name, labels) if self.__enabled else nullcontext()
+
+    def get_gauges(self, name: str) -> dict[LabelsKey, float]:
+        with self.__lock:
+            return dict(self.__gauges.get(name, {}))
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.__counters.clear()
+            self.__gauges.clear()
+            self.__histograms.clear()
+
+    def to_dict(self) -> dict[str, list[dict]]:
+        with self.__lock:
+            return {"counters": [{"name": name, "labels": dict(labels_key), "value": value} for name, values in self.__counters.items() for labels_key, value in values.items()],
+                    "gauges": [{"name": name, "labels": dict(labels_key), "value": value} for name, values in self.__gauges.items() for labels_key, value in values.items()],
+                    "histograms": [dict(histogram.summarize(), name=name, labels=dict(labels_key)) for name, histograms in self.__histograms.items() for labels_key, histogram in histograms.items()]}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    def to_prometheus(self) -> str:
+        lines = []
+
+        with self.__lock:
+            for metric_type, metrics in (("counter", self.__counters), ("gauge", self.__gauges)):
+                for name, values in metrics.items():
+                    lines.append(f"# TYPE {name} {metric_type}")
+                    lines.extend(f"{name}{self.__format_labels(labels_key)} {value}" for labels_key, value in values.items())
+
+            for name, histograms in self.__histograms.items():
+                lines.append(f"# TYPE {name} histogram")
+
+                for labels_key, histogram in histograms.items():
+                    cumulative_count = 0
+
+                    for bucket, count in zip(histogram.buckets, histogram.counts):
+                        cumulative_count += count
+                        lines.append(f"{name}_bucket{self.__format_labels(labels_key + (('le', str(bucket)),))} {cumulative_count}")
+
+                    lines.append(f"{name}_bucket{self.__format_labels(labels_key + (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{name}_sum{self.__format_labels(labels_key)} {histogram.sum}")
+                    lines.append(f"{name}_count{self.__format_labels(labels_key)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    @contextmanager
+    def __time(self, name: str, labels: dict[str, str]) -> Iterator[None]:
+        start = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def __format_labels(self, labels_key: LabelsKey) -> str:
+        if not labels_key:
+            return ""
+
+        labels = ",".join('{}="{}"'.format(label, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for label, value in labels_key)
+        return "{" + labels + "}"
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        self.__enabled = enabled
+
+
+metrics = Metrics(os.environ.get("STEAM_LIBRARY_METRICS", "1") != "0")
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+import time
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, capacity: float, min_rate: (float | None) = None, max_back_off_sec: float = 60) -> None:
+        self.__target_rate: float = rate
+        self.__rate: float = rate
+        self.__min_rate: float = min_rate if min_rate is not None else rate / 8
+        self.__capacity: float = capacity
+        self.__tokens: float = capacity
+        self.__last_refill: float = time.monotonic()
+        self.__paused_until: float = 0
+        self.__back_off_sec: float = 1
+        self.__max_back_off_sec: float = max_back_off_sec
+        self.__lock: threading.Lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__refill(now)
+                wait_sec = self.__paused_until - now
+
+                if wait_sec <= 0:
+                    if self.__tokens >= 1:
+                        self.__tokens -= 1
+                        return
+
+                    wait_sec = (1 - self.__tokens) / self.__rate
+
+            time.sleep(wait_sec)
+
+    def throttle(self, retry_after_sec: (float | None) = None) -> None:
+        with self.__lock:
+            now = time.monotonic()
+            self.__refill(now)
+
+            pause_sec = retry_after_sec if retry_after_sec is not None else self.__back_off_sec
+            self.__paused_until = max(self.__paused_until, now + pause_sec)
+            self.__back_off_sec = min(self.__back_off_sec * 2, self.__max_back_off_sec)
+            self.__rate = max(self.__rate / 2, self.__min_rate)
+            self.__tokens = 0
+
+    def reward(self) -> None:
+        with self.__lock:
+            self.__refill(time.monotonic())
+            self.__back_off_sec = 1
+            self.__rate = min(self.__rate + self.__target_rate / 20, self.__target_rate)
+
+    def __refill(self, now: float) -> None:
+        refill_from = max(self.__last_refill, self.__paused_until)
+
+        if now > refill_from:
+            self.__tokens = min(self.__capacity, self.__tokens + (now - refill_from) * self.__rate)
+        self.__last_refill = now
+
+    @property
+    def rate(self) -> float:
+        return self.__rate
+
+    @property
+    def capacity(self) -> float:
+        return self.__capacity
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import re
+
+from datetime import date
+
+
+PRECISIONS = ("day", "month", "year", "unknown")
+MONTHS = {"jan": 1, "january": 1, "ene": 1, "enero": 1, "janv": 1, "januar": 1, "gen": 1,
+          "feb": 2, "february": 2, "febrero": 2, "fev": 2, "févr": 2, "februar": 2,
+          "mar": 3, "march": 3, "marzo": 3, "mars": 3, "mär": 3, "märz": 3,
+          "apr": 4, "april": 4, "abr": 4, "abril": 4, "avr": 4, "avril": 4,
+          "may": 5, "mayo": 5, "mai": 5, "mag": 5,
+          "jun": 6, "june": 6, "junio": 6, "juin": 6, "juni": 6, "giu": 6,
+          "jul": 7, "july": 7, "julio": 7, "juil": 7, "juli": 7, "lug": 7,
+          "aug": 8, "august": 8, "ago": 8, "agosto": 8, "août": 8,
+          "sep": 9, "sept": 9, "september": 9, "septiembre": 9, "set": 9, "septembre": 9,
+          "oct": 10, "october": 10, "octubre": 10, "okt": 10, "octobre": 10, "oktober": 10, "ott": 10,
+          "nov": 11, "november": 11, "noviembre": 11, "novembre": 11,
+          "dec": 12, "december": 12, "dic": 12, "diciembre": 12, "déc": 12, "dez": 12, "décembre": 12, "dezember": 12}
+
+DAY_MONTH_YEAR_PATTERN = re.compile(r"^(\d{1,2})\.?\s*(?:de\s+)?([^\W\d_]+)\.?,?\s*(?:de\s+)?(\d{4})$")
+MONTH_DAY_YEAR_PATTERN = re.compile(r"^([^\W\d_]+)\.?\s+(\d{1,2}),?\s+(\d{4})$")
+MONTH_YEAR_PATTERN = re.compile(r"^([^\W\d_]+)\.?,?\s+(?:de\s+)?(\d{4})$")
+NUMERIC_PATTERN = re.compile(r"^(\d{1,4})[./-](\d{1,2})[./-](\d{1,4})$")
+QUARTER_PATTERN = re.compile(r"^q([1-4])\s+(\d{4})$")
+YEAR_PATTERN = re.compile(r"^(\d{4})$")
+
+
+def parse_release_date(release_date: (str | None)) -> tuple[(str | None), str]:
+    text = " ".join((release_date or "").lower().split())
+    
+    if match := DAY_MONTH_YEAR_PATTERN.match(text):
+        return _format_date(int(match[3]), MONTHS.get(match[2]), int(match[1]), "day")
+    
+    if match := MONTH_DAY_YEAR_PATTERN.match(text):
+        return _format_date(int(match[3]), MONTHS.get(match[1]), int(match[2]), "day")
+    
+    if match := MONTH_YEAR_PATTERN.match(text):
+        return _format_date(int(match[2]), MONTHS.get(match[1]), 1, "month")
+    
+    if match := NUMERIC_PATTERN.match(text):
+        first, second, third = (int(group) for group in match.groups())
+        return _format_date(first, second, third, "day") if len(match[1]) == 4 else _format_date(third, second, first, "day")
+    
+    if match := QUARTER_PATTERN.match(text):
+        return _format_date(int(match[2]), int(match[1]) * 3 - 2, 1, "month")
+    
+    if match := YEAR_PATTERN.match(text):
+        return _format_date(int(match[1]), 1, 1, "year")
+    
+    return None, "unknown"
+
+
+def _format_date(year: int, month: (int | None), day: int, precision: str) -> tuple[(str | None), str]:
+    try:
+        return date(year, month, day).isoformat(), precision
+    
+    except (TypeError, ValueError):
+        return None, "unknown"
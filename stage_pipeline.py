@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import time
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from logger import logger
+from metrics import metrics
+from typing import Any, Callable, Iterable
+
+
+class StagePipeline:
+
+    def __init__(self, max_workers: int = 4) -> None:
+        self.__max_workers: int = max_workers
+        self.__stages: dict[str, tuple[Callable[..., Any], tuple[str, ...]]] = {}
+        self.__timings: dict[str, float] = {}
+
+    def add_stage(self, name: str, function: Callable[..., Any], dependencies: Iterable[str] = ()) -> None:
+        dependencies = tuple(dependencies)
+
+        for dependency in dependencies:
+            if dependency not in self.__stages:
+                raise ValueError(f"La etapa {name} depende de una etapa desconocida: {dependency}")
+
+        self.__stages[name] = (function, dependencies)
+
+    def run(self) -> dict[str, Any]:
+        results = {}
+        skipped_stages = set()
+        pending_stages = dict(self.__stages)
+        running_stages: dict[Future, str] = {}
+        error = None
+        start = time.perf_counter()
+        self.__timings = {}
+
+        with ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix="stage") as executor:
+            while pending_stages or running_stages:
+                for name, (function, dependencies) in list(pending_stages.items()):
+                    if error is not None or any(dependency in skipped_stages for dependency in dependencies):
+                        skipped_stages.add(name)
+                        del pending_stages[name]
+
+                    elif all(dependency in results for dependency in dependencies):
+                        running_stages[executor.submit(self.__run_stage, name, function, *(results[dependency] for dependency in dependencies))] = name
+                        del pending_stages[name]
+
+                if not running_stages:
+                    continue
+
+                done, _ = wait(running_stages, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = running_stages.pop(future)
+
+                    try:
+                        result = future.result()
+
+                    except Exception as e:
+                        logger.error(f"La etapa {name} fallo: {e!r}")
+                        error = error or e
+                        skipped_stages.add(name)
+                        continue
+
+                    if result is None:
+                        skipped_stages.add(name)
+                    else:
+                        results[name] = result
+
+        self.__timings["total"] = time.perf_counter() - start
+        logger.info("Tiempos por etapa: " + ", ".join(f"{name}={elapsed_sec:.2f}s" for name, elapsed_sec in self.__timings.items()))
+
+        if error is not None:
+            raise error
+
+        return results
+
+    def __run_stage(self, name: str, function: Callable[..., Any], *arguments: Any) -> Any:
+        start = time.perf_counter()
+        metrics.set_gauge("build_stage_running", 1, stage=name)
+
+        try:
+            return function(*arguments)
+
+        finally:
+            self.__timings[name] = time.perf_counter() - start
+            metrics.set_gauge("build_stage_running", 0, stage=name)
+            metrics.observe("stage_seconds", self.__timings[name], stage=name)
+
+    @property
+    def timings(self) -> dict[str, float]:
+        return dict(self.__timings)
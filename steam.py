@@ -3,16 +3,23 @@ from __future__ import annotations
 import os
 import platform
 import subprocess
-import winreg
 
+from app_manifests import AppManifestScanner
 from logger import logger
+from typing import Iterable
+
+try:
+    import winreg
+except ImportError:
+    winreg = None
 
 class Steam:
 
-    def __init__(self) -> None:
-        self.__steam_path = self.__find_windows_steam_path()
+    def __init__(self, steam_path: (str | None) = None) -> None:
+        self.__steam_path = steam_path if steam_path is not None else self.__find_windows_steam_path()
         self.__steam_exe_path = os.path.join(self.__steam_path, "Steam.exe")
         self.__steam_apps_path = os.path.join(self.__steam_path, "steamapps")
+        self.__app_manifest_scanner = AppManifestScanner(self.__steam_path)
     
     def play_game(self, game_id: str) -> None:
         subprocess.run(f"{self.__steam_exe_path} -applaunch {game_id}")
@@ -24,35 +31,22 @@ class Steam:
         return {"is_steam_installed": os.path.exists(self.__steam_exe_path) and os.path.exists(self.__steam_apps_path)}
         
     def get_game_state(self, game_id: str) -> str:
+        return self.get_games_states([int(game_id)])[int(game_id)]
+    
+    def get_games_states(self, steam_apps_ids: (Iterable[int] | None) = None) -> dict[int, str]:
+        installed_games_states = self.__app_manifest_scanner.get_games_states() if self.is_steam_installed()["is_steam_installed"] else None
         
-        if not (os.path.exists(self.__steam_exe_path) and os.path.exists(self.__steam_apps_path)):
-            return "Steam deleted"
-        
-        appmanifest_path = os.path.join(self.__steam_apps_path, f"appmanifest_{game_id}") + ".acf"
-        
-        if not os.path.exists(appmanifest_path):
-            return "Not installed"
-        
-        state_flags = ""
-        
-        with open(appmanifest_path) as appmanifest_file:
-            state_flags = list(appmanifest_file)[6]
-            
-        if '"4"' in state_flags:
-            return "Installed"
-        
-        if '"6"' in state_flags:
-            return "Installed, need to update"
+        if steam_apps_ids is None:
+            return installed_games_states or {}
         
-        if '"1026"' in state_flags:
-            return "Not installed, updating"
+        if installed_games_states is None:
+            return {steam_appid: "Steam deleted" for steam_appid in steam_apps_ids}
         
-        else:
-            return "?"  
+        return {steam_appid: installed_games_states.get(steam_appid, "Not installed") for steam_appid in steam_apps_ids}
         
     def __find_windows_steam_path(self) -> str:
         steam_path = ""
-        if platform.system() == "Windows":
+        if platform.system() == "Windows" and winreg is not None:
             steam_registry_key = r"Software\Valve\Steam"
             try:
                 # Open the Steam registry key for the currently logged-in user
@@ -0,0 +1,164 @@
+import json
+import time
+import unittest
+
+from apis import API, Request, SteamAPI
+from fake_http_server import FakeHTTPServer
+from rate_limiter import TokenBucket
+
+
+def json_route(path, query, headers):
+    return 200, {"Content-Type": "application/json"}, json.dumps({"path": path}).encode()
+
+
+class FakeAPI(API):
+    pass
+
+
+class ConcurrentRequestsTestCase(unittest.TestCase):
+
+    def test_rate_limiter_keeps_budget(self):
+        rate, capacity, total_requests = 40, 2, 30
+
+        with FakeHTTPServer({"/": json_route}, latency_sec=0.01) as server:
+            api = FakeAPI("key", {"127.0.0.1": TokenBucket(rate, capacity)})
+            responses = api._make_concurrent_get_requests([Request(f"{server.url}/app/{i}") for i in range(total_requests)], max_in_flight=8)
+            timestamps = [timestamp for timestamp, _, _ in server.requests_log]
+
+        self.assertEqual(len(responses), total_requests)
+        self.assertGreaterEqual(max(timestamps) - min(timestamps), (total_requests - capacity) / rate * 0.9)
+
+        for start in timestamps:
+            in_window = sum(1 for timestamp in timestamps if start <= timestamp < start + 0.25)
+            self.assertLessEqual(in_window, capacity + rate * 0.25 + 1)
+
+    def test_max_in_flight_is_respected(self):
+        with FakeHTTPServer({"/": json_route}, latency_sec=0.05) as server:
+            api = FakeAPI("key")
+            responses = api._make_concurrent_get_requests([Request(f"{server.url}/app/{i}") for i in range(20)], max_in_flight=4)
+
+            self.assertEqual(len(responses), 20)
+            self.assertLessEqual(server.max_in_flight, 4)
+            self.assertGreater(server.max_in_flight, 1)
+
+    def test_too_many_requests_backs_off_and_retries(self):
+        rate_limiter = TokenBucket(100, 1)
+
+        with FakeHTTPServer({"/": json_route}, too_many_requests=2, retry_after_sec=0) as server:
+            api = FakeAPI("key", {"127.0.0.1": rate_limiter})
+            responses = api._make_concurrent_get_requests([Request(f"{server.url}/app/{i}") for i in range(5)], max_in_flight=1)
+            statuses = [status for _, _, status in server.requests_log]
+
+        self.assertEqual(len(responses), 5)
+        self.assertEqual(statuses.count(429), 2)
+        self.assertLess(rate_limiter.rate, 100)
+
+    def test_periodic_too_many_requests_are_retried(self):
+        with FakeHTTPServer({"/": json_route}, retry_after_sec=0, too_many_requests_every=4) as server:
+            api = FakeAPI("key", {"127.0.0.1": TokenBucket(100, 1)})
+            responses = api._make_concurrent_get_requests([Request(f"{server.url}/app/{i}") for i in range(9)], max_in_flight=1)
+            statuses = [status for _, _, status in server.requests_log]
+
+        self.assertEqual(len(responses), 9)
+        self.assertEqual(statuses, [200, 200, 200, 429] * 2 + [200, 200, 200])
+
+    def test_failed_requests_are_skipped(self):
+        with FakeHTTPServer({"/ok": json_route}) as server:
+            api = FakeAPI("key")
+            responses = api._make_concurrent_get_requests([Request(f"{server.url}/ok"), Request(f"{server.url}/missing")])
+
+        self.assertEqual([response.json()["path"] for response in responses], ["/ok"])
+
+
+class PooledSessionTestCase(unittest.TestCase):
+
+    def test_connections_are_reused(self):
+        with FakeHTTPServer({"/": json_route}) as server:
+            api = FakeAPI("key")
+            for i in range(10):
+                api._make_get_request(Request(f"{server.url}/app/{i}"))
+
+            statistics = api.pool_statistics()[server.url.removeprefix("http://")]
+            api.close()
+
+        self.assertEqual(statistics["connections"], 1)
+        self.assertEqual(statistics["requests"], 10)
+
+    def test_server_errors_are_retried(self):
+        attempts = []
+
+        def flaky_route(path, query, headers):
+            attempts.append(path)
+            return (503, {}, b"") if len(attempts) < 3 else json_route(path, query, headers)
+
+        class RetryingAPI(API):
+            _retry_backoff_factor = 0
+
+        with FakeHTTPServer({"/": flaky_route}) as server:
+            response = RetryingAPI("key")._make_get_request(Request(f"{server.url}/app"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(attempts), 3)
+
+    def test_server_error_retries_acquire_rate_limiter_tokens(self):
+        attempts = []
+
+        class CountingTokenBucket(TokenBucket):
+            acquired = 0
+
+            def acquire(self):
+                CountingTokenBucket.acquired += 1
+                super().acquire()
+
+        def flaky_route(path, query, headers):
+            attempts.append(path)
+            return (503, {}, b"") if len(attempts) < 3 else json_route(path, query, headers)
+
+        class RetryingAPI(API):
+            _retry_backoff_factor = 0
+
+        with FakeHTTPServer({"/": flaky_route}) as server:
+            response = RetryingAPI("key", {"127.0.0.1": CountingTokenBucket(100, 1)})._make_get_request(Request(f"{server.url}/app"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(CountingTokenBucket.acquired, 3)
+
+
+class SteamAPITestCase(unittest.TestCase):
+
+    def test_app_details_are_requested_with_filters(self):
+        queries = []
+
+        def app_details_route(path, query, headers):
+            queries.append(query)
+            steam_appid = query["appids"][0]
+            data = {"detailed_description": "Game", "developers": ["Valve"], "release_date": {"date": "10 Oct, 2007"}} if steam_appid == "10" else []
+            return 200, {"Content-Type": "application/json"}, json.dumps({steam_appid: {"success": True, "data": data}}).encode()
+
+        with FakeHTTPServer({"/api/appdetails": app_details_route}) as server:
+            class FakeSteamAPI(SteamAPI):
+                _store_url = server.url
+
+            apps_details, failed_apps_ids = FakeSteamAPI("key").get_apps_details([10, 20], {10: "Game 10", 20: "Game 20"})
+
+        self.assertEqual([query["filters"] for query in queries], [["basic,developers,publishers,categories,genres,release_date"]] * 2)
+        self.assertEqual(apps_details[10]["developers"], ("Valve",))
+        self.assertEqual(apps_details[10]["release_date"], "10 Oct, 2007")
+        self.assertEqual(failed_apps_ids, [20])
+
+
+class TokenBucketTestCase(unittest.TestCase):
+
+    def test_throttle_pauses_acquire(self):
+        rate_limiter = TokenBucket(1000, 1)
+        rate_limiter.throttle(0.2)
+
+        start = time.monotonic()
+        rate_limiter.acquire()
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+
+if __name__ == "__main__":
+    unittest.main()
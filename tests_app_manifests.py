@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from app_manifests import AppManifestScanner
+from steam import Steam
+
+
+def write_manifest(steam_apps_path, steam_appid, state_flags, extra=""):
+    os.makedirs(steam_apps_path, exist_ok=True)
+    manifest_path = os.path.join(steam_apps_path, f"appmanifest_{steam_appid}.acf")
+
+    with open(manifest_path, "w") as manifest_file:
+        manifest_file.write(f'"AppState"\n{{\n\t"appid"\t\t"{steam_appid}"\n{extra}\t"name"\t\t"Game {steam_appid}"\n\t"StateFlags"\t\t"{state_flags}"\n'
+                            '\t"InstalledDepots"\n\t{\n\t\t"1" { "manifest" "2" }\n\t}\n}\n')
+
+    return manifest_path
+
+
+class AppManifestScannerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.steam_path = tempfile.mkdtemp()
+        self.steam_apps_path = os.path.join(self.steam_path, "steamapps")
+        self.other_library_path = os.path.join(self.steam_path, "Other Library")
+
+        with open(os.path.join(self.steam_path, "Steam.exe"), "w"):
+            pass
+
+        write_manifest(self.steam_apps_path, 10, 4)
+        write_manifest(self.steam_apps_path, 20, 6, extra='\t"universe"\t\t"1"\n\t"LastOwner"\t\t"1"\n')
+        write_manifest(os.path.join(self.other_library_path, "steamapps"), 30, 1026)
+        write_manifest(os.path.join(self.other_library_path, "steamapps"), 40, 1)
+
+        with open(os.path.join(self.steam_apps_path, "libraryfolders.vdf"), "w") as library_folders_file:
+            library_folders_file.write('"libraryfolders"\n{\n\t"0"\n\t{\n\t\t"path"\t\t"' + self.steam_path.replace("\\", "\\\\") + '"\n\t}\n'
+                                       '\t"1"\n\t{\n\t\t"path"\t\t"' + self.other_library_path.replace("\\", "\\\\") + '"\n\t\t"apps" { "30" "1" }\n\t}\n}\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.steam_path, ignore_errors=True)
+
+    def test_states_of_every_library_folder(self):
+        self.assertEqual(AppManifestScanner(self.steam_path).get_games_states(), {10: "Installed", 20: "Installed, need to update", 30: "Not installed, updating", 40: "?"})
+
+    def test_legacy_library_folders_format(self):
+        with open(os.path.join(self.steam_apps_path, "libraryfolders.vdf"), "w") as library_folders_file:
+            library_folders_file.write('"LibraryFolders"\n{\n\t"TimeNextStatsReport"\t\t"1"\n\t"1"\t\t"' + self.other_library_path.replace("\\", "\\\\") + '"\n}\n')
+
+        self.assertEqual(AppManifestScanner(self.steam_path).get_library_folders(), [self.steam_apps_path, os.path.join(self.other_library_path, "steamapps")])
+
+    def test_manifests_are_cached_by_mtime(self):
+        scanner = AppManifestScanner(self.steam_path)
+        scanner.get_games_states()
+
+        manifest_path = os.path.join(self.steam_apps_path, "appmanifest_10.acf")
+        stat = os.stat(manifest_path)
+
+        with open(manifest_path, "r+") as manifest_file:
+            content = manifest_file.read()
+            manifest_file.seek(0)
+            manifest_file.write(content.replace('"StateFlags"\t\t"4"', '"StateFlags"\t\t"6"'))
+
+        os.utime(manifest_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(scanner.get_games_states()[10], "Installed")
+
+        os.utime(manifest_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(scanner.get_games_states()[10], "Installed, need to update")
+
+        os.remove(manifest_path)
+        self.assertNotIn(10, scanner.get_games_states())
+
+    def test_broken_manifest_is_skipped(self):
+        with open(os.path.join(self.steam_apps_path, "appmanifest_50.acf"), "w") as manifest_file:
+            manifest_file.write('"AppState"\n{\n\t"appid"\t\t"50"\n')
+
+        self.assertNotIn(50, AppManifestScanner(self.steam_path).get_games_states())
+
+    def test_steam_states_for_library_games(self):
+        self.assertEqual(Steam(self.steam_path).get_games_states([10, 30, 60]), {10: "Installed", 30: "Not installed, updating", 60: "Not installed"})
+        self.assertEqual(Steam(self.steam_path).get_game_state("20"), "Installed, need to update")
+        self.assertEqual(Steam(os.path.join(self.steam_path, "missing")).get_games_states([10]), {10: "Steam deleted"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import time
+import unittest
+
+from apis import SteamAPI
+from async_apis import AsyncSteamAPI, run_blocking
+from fake_http_server import FakeHTTPServer
+
+
+def app_details_route(path, query, headers):
+    steam_appid = query["appids"][0]
+    success = steam_appid != "3"
+    body = {steam_appid: {"success": success, "data": {"detailed_description": f"Game {steam_appid}", "genres": [{"description": "Action"}]}}}
+    return 200, {"Content-Type": "application/json"}, json.dumps(body).encode()
+
+
+def create_steam_api(server_url):
+    class FakeSteamAPI(SteamAPI):
+        _api_url = server_url
+        _store_url = server_url
+
+    return FakeSteamAPI("key")
+
+
+class AsyncSteamAPITestCase(unittest.TestCase):
+
+    def test_apps_details_are_requested_concurrently(self):
+        owned_games = {steam_appid: f"Game {steam_appid}" for steam_appid in range(1, 21)}
+
+        with FakeHTTPServer({"/api/appdetails": app_details_route}, latency_sec=0.05) as server:
+            api = AsyncSteamAPI(create_steam_api(server.url), max_in_flight=10)
+            start = time.monotonic()
+            apps_details, failed_apps_ids = run_blocking(api.get_apps_details(owned_games, owned_games))
+            elapsed_sec = time.monotonic() - start
+            api.close()
+
+        self.assertEqual(len(apps_details), 19)
+        self.assertEqual(failed_apps_ids, [3])
+        self.assertEqual(apps_details[5]["genres"], ("Action",))
+        self.assertLessEqual(server.max_in_flight, 10)
+        self.assertLess(elapsed_sec, 20 * 0.05 / 2)
+
+    def test_pending_requests_can_be_cancelled(self):
+        owned_games = {steam_appid: f"Game {steam_appid}" for steam_appid in range(1, 41)}
+
+        async def get_apps_details_with_timeout(api):
+            try:
+                await asyncio.wait_for(api.get_apps_details(owned_games, owned_games), 0.1)
+            except asyncio.TimeoutError:
+                return True
+            return False
+
+        with FakeHTTPServer({"/api/appdetails": app_details_route}, latency_sec=0.05) as server:
+            api = AsyncSteamAPI(create_steam_api(server.url), max_in_flight=2)
+            cancelled = run_blocking(get_apps_details_with_timeout(api))
+            time.sleep(0.1)
+            requests_count = len(server.requests_log)
+            api.close()
+
+        self.assertTrue(cancelled)
+        self.assertLess(requests_count, len(owned_games))
+
+    def test_cancelled_requests_keep_their_slots(self):
+        owned_games = {steam_appid: f"Game {steam_appid}" for steam_appid in range(1, 9)}
+
+        async def get_apps_details_after_timeout(api):
+            try:
+                await asyncio.wait_for(api.get_apps_details(owned_games, owned_games), 0.02)
+            except asyncio.TimeoutError:
+                pass
+            return await api.get_apps_details(owned_games, owned_games)
+
+        with FakeHTTPServer({"/api/appdetails": app_details_route}, latency_sec=0.1) as server:
+            api = AsyncSteamAPI(create_steam_api(server.url), max_in_flight=2)
+            apps_details, _ = run_blocking(get_apps_details_after_timeout(api))
+            api.close()
+
+        self.assertEqual(len(apps_details), 7)
+        self.assertLessEqual(server.max_in_flight, 2)
+
+    def test_run_blocking_works_inside_a_running_loop(self):
+        async def get_value():
+            return 42
+
+        async def main():
+            return run_blocking(get_value())
+
+        self.assertEqual(asyncio.run(main()), 42)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from apis import SteamAPI, SteamGridAPI
+from batch_library_builder import BatchLibraryBuilder
+from databases import GamesDatabase
+from fake_http_server import FakeHTTPServer
+from image_store import ImageStore
+from library_data_file import LibraryDataFile
+
+
+OWNED_GAMES = {"1": [10, 20, 30], "2": [20, 30, 40], "3": [30]}
+
+
+def json_response(body):
+    return 200, {"Content-Type": "application/json"}, json.dumps(body).encode()
+
+
+def player_summaries_route(path, query, headers):
+    steam_id = query["steamids"][0]
+    players = [{"personaname": f"User {steam_id}", "avatarfull": "", "profileurl": ""}] if steam_id != "4" else []
+    return json_response({"response": {"players": players}})
+
+
+def owned_games_route(path, query, headers):
+    return json_response({"response": {"games": [{"appid": steam_appid, "name": f"Game {steam_appid}"} for steam_appid in OWNED_GAMES[query["steamid"][0]]]}})
+
+
+def app_details_route(path, query, headers):
+    steam_appid = query["appids"][0]
+    return json_response({steam_appid: {"success": True, "data": {"detailed_description": f"Game {steam_appid}", "genres": [{"description": "Action"}]}}})
+
+
+def failing_app_details_route(path, query, headers):
+    return (500, {}, b"") if query["appids"][0] == "30" else app_details_route(path, query, headers)
+
+
+def image_route(path, query, headers):
+    return 200, {"Content-Type": "image/jpeg"}, path.encode()
+
+
+class BatchLibraryBuilderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_directory = os.getcwd()
+        self.working_directory = tempfile.mkdtemp()
+        os.chdir(self.working_directory)
+
+    def tearDown(self):
+        os.chdir(self.previous_directory)
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def test_accounts_share_deduplicated_requests(self):
+        routes = {"/ISteamUser": player_summaries_route, "/IPlayerService": owned_games_route, "/api/appdetails": app_details_route, "/steam/apps": image_route}
+
+        with FakeHTTPServer(routes) as server:
+            class FakeSteamAPI(SteamAPI):
+                _api_url = server.url
+                _store_url = server.url
+                _cdn_url = server.url
+
+            builder = BatchLibraryBuilder(["1", "2", "3", "4", "1"], "key", "key", steam_api=FakeSteamAPI("key"), steam_grid_api=SteamGridAPI("key"),
+                                          image_store=ImageStore(os.path.join("src", "images")))
+            report = builder.build()
+            paths = [path for _, path, _ in server.requests_log]
+
+        self.assertEqual(sorted(path for path in paths if path.startswith("/api/appdetails")), [f"/api/appdetails?key=key&appids={steam_appid}&filters=basic%2Cdevelopers%2Cpublishers%2Ccategories%2Cgenres%2Crelease_date" for steam_appid in (10, 20, 30, 40)])
+        self.assertEqual(len([path for path in paths if path.startswith("/steam/apps")]), 8)
+        self.assertEqual(report["unique_games"], 4)
+        self.assertEqual(report["deduplicated_games"], 3)
+        self.assertEqual(report["accounts"]["2"], {"response": "success", "games_count": 3})
+        self.assertEqual(report["accounts"]["4"], {"response": "account information error"})
+        self.assertTrue(os.path.exists(os.path.join("library", "data", "batch_report.json")))
+
+        with open(os.path.join("library", "data", "3", "owned_games.json")) as owned_games_file:
+            self.assertEqual(json.load(owned_games_file), {"30": "Game 30"})
+
+    def test_failed_apps_are_only_requested_by_the_shared_stage(self):
+        routes = {"/ISteamUser": player_summaries_route, "/IPlayerService": owned_games_route, "/api/appdetails": failing_app_details_route, "/steam/apps": image_route}
+
+        with FakeHTTPServer(routes) as server:
+            class FakeSteamAPI(SteamAPI):
+                _api_url = server.url
+                _store_url = server.url
+                _cdn_url = server.url
+                _retry_total = 0
+
+            builder = BatchLibraryBuilder(["1", "2", "3"], "key", "key", steam_api=FakeSteamAPI("key"), steam_grid_api=SteamGridAPI("key"),
+                                          image_store=ImageStore(os.path.join("src", "images")))
+            report = builder.build()
+            paths = [path for _, path, _ in server.requests_log]
+
+        self.assertEqual(len([path for path in paths if path.startswith("/api/appdetails?key=key&appids=30&")]), 1)
+        self.assertEqual(report["accounts"]["3"], {"response": "success", "games_count": 1})
+
+        self.assertEqual(LibraryDataFile(os.path.join("library", "data", "3")).read()["games_data"][30]["name"], "Game 30")
+
+    def test_stale_games_are_not_revalidated_in_the_background(self):
+        routes = {"/ISteamUser": player_summaries_route, "/IPlayerService": owned_games_route, "/api/appdetails": app_details_route, "/steam/apps": image_route}
+        games_db = GamesDatabase()
+        games_db.add_games({10: {"description": "", "developers": [], "publishers": [], "categories": [], "genres": [], "release_date": "", "name": "Game 10"}}, fetched_at=0)
+
+        with FakeHTTPServer(routes) as server:
+            class FakeSteamAPI(SteamAPI):
+                _api_url = server.url
+                _store_url = server.url
+                _cdn_url = server.url
+
+            with BatchLibraryBuilder(["1"], "key", "key", steam_api=FakeSteamAPI("key"), steam_grid_api=SteamGridAPI("key"), games_db=games_db,
+                                     image_store=ImageStore(os.path.join("src", "images"))) as builder:
+                builder.build()
+
+            time.sleep(0.2)
+            paths = [path for _, path, _ in server.requests_log]
+
+        games_db.close()
+
+        self.assertEqual(sorted(path.split("&")[1] for path in paths if path.startswith("/api/appdetails")), ["appids=20", "appids=30"])
+
+
+if __name__ == "__main__":
+    unittest.main()
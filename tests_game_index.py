@@ -0,0 +1,58 @@
+import unittest
+
+from game_index import GameIndex
+
+
+GAMES_DATA = {
+    10: {"name": "Portal 2", "developers": ["Valve"], "publishers": ["Valve"], "categories": ["Single-player", "Co-op"], "genres": ["Action", "Adventure"], "release_date": "18 Apr, 2011"},
+    20: {"name": "Half-Life", "developers": ["Valve"], "publishers": ["Valve"], "categories": ["Single-player"], "genres": ["Action"], "release_date": "8 Nov, 1998"},
+    30: {"name": "Celeste", "developers": ["Maddy Makes Games"], "publishers": ["Maddy Makes Games"], "categories": ["Single-player"], "genres": ["Indie", "Action"], "release_date": "25 Jan, 2018"},
+    40: {"name": "Stardew Valley", "developers": ["ConcernedApe"], "publishers": ["ConcernedApe"], "categories": ["Single-player", "Co-op"], "genres": ["Indie"], "release_date": "Coming soon"},
+}
+
+
+class GameIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.games_index = GameIndex(GAMES_DATA)
+
+    def test_combined_filters_sorted_by_release_date(self):
+        self.assertEqual(self.games_index.query(genres=["Action"], categories=["Single-player"], sort_by="release_date"), [20, 10, 30])
+        self.assertEqual(self.games_index.query(genres=["Indie"], categories=["Co-op"]), [40])
+        self.assertEqual(self.games_index.count(genres=["Action"], developers=["Valve"]), 2)
+
+    def test_unknown_classifications_match_nothing(self):
+        self.assertEqual(self.games_index.query(genres=["Racing"]), [])
+        self.assertEqual(self.games_index.count(publishers=["Nobody"]), 0)
+
+    def test_search_matches_name_and_developer_token_prefixes(self):
+        self.assertEqual(self.games_index.query(search="val"), [20, 10, 40])
+        self.assertEqual(self.games_index.query(search="maddy cel"), [30])
+        self.assertEqual(self.games_index.query(search="half life"), [20])
+        self.assertEqual(self.games_index.query(search="xyz"), [])
+
+    def test_sort_orders(self):
+        self.assertEqual(self.games_index.query(), [30, 20, 10, 40])
+        self.assertEqual(self.games_index.query(sort_by="steam_appid", descending=True), [40, 30, 20, 10])
+
+        self.games_index.add_sort_key("publishers", GAMES_DATA)
+
+        self.assertEqual(self.games_index.query(categories=["Co-op"], sort_by="publishers"), [40, 10])
+
+    def test_stored_release_dates_are_used_for_sorting(self):
+        games_index = GameIndex(GAMES_DATA, {10: ("1990-01-01", "day"), 20: ("2020-06-01", "month"), 30: (None, "unknown")})
+
+        self.assertEqual(games_index.query(sort_by="release_date"), [10, 20, 30, 40])
+        self.assertEqual(games_index.query(genres=["Action"], sort_by="release_date", descending=True), [30, 20, 10])
+
+    def test_sparse_and_dense_classifications_agree(self):
+        games_data = {steam_appid: {"name": f"Game {steam_appid}", "developers": [f"Developer {steam_appid % 100}"], "genres": ["Action"] if steam_appid % 3 else ["Indie"]} 
+                      for steam_appid in range(5000)}
+        games_index = GameIndex(games_data)
+
+        self.assertEqual(games_index.query(developers=["Developer 7"], sort_by="steam_appid"), list(range(7, 5000, 100)))
+        self.assertEqual(games_index.count(genres=["Indie"], developers=["Developer 9"]), len([steam_appid for steam_appid in range(9, 5000, 100) if steam_appid % 3 == 0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import sys
+import unittest
+
+from game_record import GameRecord, games_to_dicts
+
+
+GAME = {"description": "<p>Game</p>", "developers": ["Valve"], "publishers": ["Valve"], "categories": ["Single-player"], "genres": ["Action"],
+        "release_date": "10 Oct, 2007", "name": "Half-Life 2"}
+
+
+class GameRecordTestCase(unittest.TestCase):
+
+    def test_record_reads_like_the_game_dict(self):
+        game = GameRecord.from_dict(GAME)
+
+        self.assertEqual(game, GAME)
+        self.assertEqual(game["name"], "Half-Life 2")
+        self.assertEqual(game.get("genres"), ("Action",))
+        self.assertEqual(game.to_dict(), GAME)
+        self.assertEqual(games_to_dicts({220: game}, include_description=False), {220: {field: value for field, value in GAME.items() if field != "description"}})
+        self.assertFalse(hasattr(game, "__dict__"))
+
+    def test_classifications_are_interned(self):
+        first_game = GameRecord("A", genres=["".join(["Act", "ion"])])
+        second_game = GameRecord("B", genres=["".join(["Acti", "on"])])
+
+        self.assertIs(first_game.genres[0], second_game.genres[0])
+        self.assertIs(first_game.genres[0], sys.intern("Action"))
+
+    def test_missing_description_is_not_a_field(self):
+        game = GameRecord("Portal")
+
+        self.assertNotIn("description", game)
+        self.assertEqual(game.get("description", ""), "")
+        self.assertNotIn("description", game.to_dict())
+
+        game_with_description = game.with_description("<p>Portal</p>")
+
+        self.assertEqual(game_with_description["description"], "<p>Portal</p>")
+        self.assertIsNone(game.description)
+
+    def test_fields_are_read_only(self):
+        game = GameRecord("Portal", genres=["Action"])
+
+        with self.assertRaises(AttributeError):
+            game.description = "<p>Portal</p>"
+
+        with self.assertRaises(AttributeError):
+            game.name = "Portal 2"
+
+
+if __name__ == "__main__":
+    unittest.main()
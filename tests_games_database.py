@@ -1,6 +1,10 @@
 import unittest
 import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from databases import GamesDatabase
+from metrics import metrics
 
 class TestGamesDatabase(unittest.TestCase):
 
@@ -9,6 +13,7 @@ class TestGamesDatabase(unittest.TestCase):
 
     def tearDown(self):
         # Clean up the database file after each test
+        self.games_database.close()
         if os.path.exists(self.games_database._Database__database_path):
             os.remove(self.games_database._Database__database_path)
 
@@ -43,6 +48,157 @@ class TestGamesDatabase(unittest.TestCase):
 
         self.assertEqual(retrieved_games, games_data)
 
+    def test_add_games_updates_existing_games(self):
+        # Test that adding a game that already exists replaces its data instead of failing
+        game = {"description": "", "developers": [], "publishers": [], "categories": [], "genres": [], "release_date": "", "name": "Game 1"}
+        updated_game = dict(game, description="Description 1", genres=["Genre 1"])
+
+        self.games_database.add_games({1: game})
+        self.games_database.add_games({1: updated_game})
+
+        self.assertEqual(self.games_database.get_games([1]), {1: updated_game})
+
+    def test_get_games_in_chunks(self):
+        # Test retrieving more games than fit in a single IN (...) lookup
+        games_data = {app_id: {"description": "", "developers": [], "publishers": [], "categories": [], "genres": [], "release_date": "", "name": f"Game {app_id}"} for app_id in range(1, 1201)}
+
+        self.games_database.add_games(games_data)
+
+        self.assertEqual(self.games_database.get_games(list(games_data) + [5000]), games_data)
+
+    def test_connection_is_reused_per_thread(self):
+        # Test that each thread keeps its own long-lived connection
+        connection = self.games_database._get_connection()
+        thread_connections = []
+
+        thread = threading.Thread(target=lambda: thread_connections.append(self.games_database._get_connection()))
+        thread.start()
+        thread.join()
+
+        self.assertIs(self.games_database._get_connection(), connection)
+        self.assertIsNot(thread_connections[0], connection)
+
+    def test_games_are_shared_across_threads(self):
+        # Test that games written from worker threads are visible to the others
+        def add_game(app_id):
+            self.games_database.add_games({app_id: {"description": "", "developers": [], "publishers": [], "categories": [], "genres": [], "release_date": "", "name": f"Game {app_id}"}})
+
+        threads = [threading.Thread(target=add_game, args=(app_id,)) for app_id in range(1, 9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(self.games_database.get_games(range(1, 9))), list(range(1, 9)))
+
+    def test_finished_threads_connections_are_closed(self):
+        # Test that connections opened by finished worker threads do not pile up across runs
+        for _ in range(5):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda app_id: self.games_database.get_games([app_id]), range(8)))
+
+        self.games_database._get_connection()
+
+        self.assertEqual(len(self.games_database._Database__connections), 1)
+        self.assertEqual(metrics.get_gauges("db_connections")[(("table", "GamesDatabase"),)], 1)
+
+    def test_thread_connection_is_closed(self):
+        # Test that a thread can release its connection when its work finishes
+        connection = self.games_database._get_connection()
+        self.games_database.close_thread_connection()
+
+        self.assertIsNot(self.games_database._get_connection(), connection)
+        self.assertEqual(len(self.games_database._Database__connections), 1)
+
+    def test_classification_names_with_commas(self):
+        # Test that names containing ", " are kept intact
+        game = {"description": "", "developers": ["Feral Interactive (Mac), Ltd."], "publishers": ["SEGA"], "categories": [], "genres": ["Strategy"], "release_date": "", "name": "Game 1"}
+
+        self.games_database.add_games({1: game})
+
+        self.assertEqual(self.games_database.get_games([1]), {1: game})
+        self.assertEqual(list(self.games_database.get_games_by_developer("Feral Interactive (Mac), Ltd.")), [1])
+
+    def test_classification_queries(self):
+        # Test the SQL side aggregation of genres and categories
+        games_data = {app_id: {"description": "", "developers": [f"Developer {app_id % 2}"], "publishers": [], "categories": ["Single-player"] + (["Multi-player"] if app_id % 3 == 0 else []),
+                               "genres": ["Action"] if app_id % 2 else ["Indie", "Action"], "release_date": "", "name": f"Game {app_id}"} for app_id in range(1, 7)}
+
+        self.games_database.add_games(games_data)
+
+        self.assertEqual(self.games_database.get_appids_by_classification("genres", "Indie"), [2, 4, 6])
+        self.assertEqual(self.games_database.count_games_by_classification("categories"), {"Single-player": 6, "Multi-player": 2})
+        self.assertEqual(self.games_database.summarize_classifications("genres", [1, 2, 3]), {"Action": [1, 2, 3], "Indie": [2]})
+        self.assertEqual(self.games_database.get_games([2])[2]["genres"], ("Indie", "Action"))
+
+    def test_legacy_database_is_migrated(self):
+        # Test that a database with comma joined classifications is converted to the normalized schema
+        os.makedirs(os.path.dirname(self.games_database._Database__database_path), exist_ok=True)
+        conn = sqlite3.connect(self.games_database._Database__database_path)
+        conn.execute("CREATE TABLE GamesDatabase (steam_appid INTEGER PRIMARY KEY, description TEXT, developers TEXT, publishers TEXT, categories TEXT, genres TEXT, release_date TEXT, name TEXT)")
+        conn.execute("INSERT INTO GamesDatabase VALUES (1, 'Description 1', 'Developer 1, Developer 2', '', 'Category 1', 'Genre 1, Genre 2', '2022-01-01', 'Game 1')")
+        conn.commit()
+        conn.close()
+
+        games_database = GamesDatabase()
+        games = games_database.get_games([1])
+        games_database.close()
+
+        self.assertEqual(games, {1: {"description": "Description 1", "developers": ["Developer 1", "Developer 2"], "publishers": [], "categories": ["Category 1"],
+                                     "genres": ["Genre 1", "Genre 2"], "release_date": "2022-01-01", "name": "Game 1"}})
+
+    def test_stale_games(self):
+        # Test that games are stale once their app details TTL has expired
+        game = {"description": "", "developers": [], "publishers": [], "categories": [], "genres": [], "release_date": "", "name": "Game"}
+        now = 1000 * 86400
+
+        self.games_database.add_games({1: game}, fetched_at=now - 10 * 86400)
+        self.games_database.add_games({2: game}, fetched_at=now - 86400)
+
+        self.assertEqual(self.games_database.get_stale_appids([1, 2], now=now), [1])
+        self.assertEqual(self.games_database.get_stale_appids([1, 2], ttl_sec=30 * 86400, now=now), [])
+
+    def test_failed_fetches(self):
+        # Test that failed fetches are remembered until their retry interval passes
+        now = 1000 * 86400
+
+        self.games_database.add_failed_fetches([1, 2], failed_at=now - 2 * 86400)
+        self.games_database.add_failed_fetches([3], failed_at=now - 3600)
+
+        self.assertEqual(self.games_database.get_recently_failed_appids([1, 2, 3, 4], now=now), {3})
+
+        self.games_database.add_games({3: {"description": "", "developers": [], "publishers": [], "categories": [], "genres": [], "release_date": "", "name": "Game"}})
+
+        self.assertEqual(self.games_database.get_recently_failed_appids([3], now=now), set())
+
+    def test_release_date_range_queries(self):
+        # Test that release dates are parsed on insert and can be filtered and sorted by range
+        game = {"description": "", "developers": [], "publishers": [], "categories": [], "genres": [], "name": "Game"}
+        self.games_database.add_games({1: dict(game, release_date="14 Jan, 2021"), 2: dict(game, release_date="Coming soon"), 
+                                       3: dict(game, release_date="March 2019"), 4: dict(game, release_date="8 Nov, 1998")})
+
+        self.assertEqual(self.games_database.get_release_dates([1, 2, 3]), {1: ("2021-01-14", "day"), 2: (None, "unknown"), 3: ("2019-03-01", "month")})
+        self.assertEqual(self.games_database.get_appids_by_release_date(), [4, 3, 1])
+        self.assertEqual(self.games_database.get_appids_by_release_date("2000-01-01", descending=True), [1, 3])
+        self.assertEqual(self.games_database.get_appids_by_release_date(end="2020-12-31", steam_apps_ids=[1, 2, 3]), [3])
+        self.assertEqual(self.games_database.get_games([1])[1]["release_date"], "14 Jan, 2021")
+
+    def test_stored_release_dates_are_parsed_on_upgrade(self):
+        # Test that databases created before the parsed release date columns are backfilled
+        self.games_database.close()
+        os.makedirs(os.path.dirname(self.games_database._Database__database_path), exist_ok=True)
+        conn = sqlite3.connect(self.games_database._Database__database_path)
+        conn.execute("CREATE TABLE GamesDatabase (steam_appid INTEGER PRIMARY KEY, description TEXT, release_date TEXT, name TEXT, fetched_at REAL)")
+        conn.execute("INSERT INTO GamesDatabase VALUES (1, 'Description 1', '25 Jan, 2018', 'Game 1', 0)")
+        conn.execute("PRAGMA user_version = 4")
+        conn.commit()
+        conn.close()
+
+        self.games_database = GamesDatabase()
+
+        self.assertEqual(self.games_database.get_release_dates([1]), {1: ("2018-01-25", "day")})
+        self.assertEqual(self.games_database.get_appids_by_release_date("2018-01-01", "2018-12-31"), [1])
+
 # Run the tests
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,158 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from apis import API, Request, SteamAPI
+from fake_http_server import FakeHTTPServer
+from http_cache import HTTPCache
+
+
+def create_api(http_cache, ttls_sec):
+    class FakeAPI(API):
+        _http_cache_ttls_sec = ttls_sec
+
+    return FakeAPI("key", http_cache=http_cache)
+
+
+def owned_games_route(path, query, headers):
+    return 200, {"Content-Type": "application/json", "Cache-Control": "no-cache"}, json.dumps({"games": [10, 20]}).encode()
+
+
+def image_route(path, query, headers):
+    if headers.get("If-None-Match") == '"v1"':
+        return 304, {"ETag": '"v1"'}, b""
+    return 200, {"Content-Type": "image/jpeg", "ETag": '"v1"'}, b"image"
+
+
+def private_route(path, query, headers):
+    return 200, {"Cache-Control": "no-store"}, b"private"
+
+
+def create_owned_games_route(owned_games):
+    def owned_games_route(path, query, headers):
+        etag = f'"{len(owned_games)}"'
+
+        if headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+
+        games = [{"appid": steam_appid, "name": name} for steam_appid, name in owned_games.items()]
+        return 200, {"Content-Type": "application/json", "ETag": etag, "Cache-Control": "max-age=3600"}, json.dumps({"response": {"games": games}}).encode()
+
+    return owned_games_route
+
+
+class HTTPCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_directory = os.getcwd()
+        self.working_directory = tempfile.mkdtemp()
+        os.chdir(self.working_directory)
+        self.http_cache = HTTPCache()
+
+    def tearDown(self):
+        self.http_cache.close()
+        os.chdir(self.previous_directory)
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def test_fresh_responses_are_served_without_requests(self):
+        with FakeHTTPServer({"/owned": owned_games_route}) as server:
+            first_api = create_api(self.http_cache, {"/owned": 300})
+            second_api = create_api(self.http_cache, {"/owned": 300})
+            first_response = first_api._make_get_request(Request(f"{server.url}/owned", {"key": "first", "steamid": 1}))
+            second_response = second_api._make_get_request(Request(f"{server.url}/owned", {"key": "second", "steamid": 1}))
+
+        self.assertEqual(len(server.requests_log), 1)
+        self.assertEqual(second_response.json(), first_response.json())
+        self.assertEqual(self.http_cache.create_key(f"{server.url}/owned", {"key": "first", "steamid": 1}), self.http_cache.create_key(f"{server.url}/owned", {"steamid": "1"}))
+
+    def test_stale_responses_are_revalidated_with_etag(self):
+        with FakeHTTPServer({"/steam/apps/": image_route}) as server:
+            api = create_api(self.http_cache, {"/steam/apps/": None})
+            responses = [api._make_get_request(Request(f"{server.url}/steam/apps/10/library_hero.jpg")) for _ in range(2)]
+            statuses = [status for _, _, status in server.requests_log]
+
+        self.assertEqual(statuses, [200, 304])
+        self.assertEqual([response.content for response in responses], [b"image", b"image"])
+        self.assertEqual(responses[1].status_code, 200)
+
+    def test_owned_games_are_always_revalidated(self):
+        owned_games = {10: "Game 10"}
+
+        with FakeHTTPServer({"/IPlayerService/GetOwnedGames/": create_owned_games_route(owned_games)}) as server:
+            class FakeSteamAPI(SteamAPI):
+                _api_url = server.url
+
+            api = FakeSteamAPI("key", http_cache=self.http_cache)
+            first_owned_games = api.get_owned_games("1")
+            cached_owned_games = api.get_owned_games("1")
+            owned_games[20] = "Game 20"
+            second_owned_games = api.get_owned_games("1")
+            statuses = [status for _, _, status in server.requests_log]
+
+        self.assertEqual(statuses, [200, 304, 200])
+        self.assertEqual(first_owned_games, {10: "Game 10"})
+        self.assertEqual(cached_owned_games, {10: "Game 10"})
+        self.assertEqual(second_owned_games, {10: "Game 10", 20: "Game 20"})
+
+    def test_no_store_responses_are_not_cached(self):
+        with FakeHTTPServer({"/private": private_route}) as server:
+            api = create_api(self.http_cache, {"/private": 300})
+            api._make_get_request(Request(f"{server.url}/private"))
+            api._make_get_request(Request(f"{server.url}/private"))
+
+        self.assertEqual(len(server.requests_log), 2)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        self.http_cache.close()
+        self.http_cache = HTTPCache(max_size_bytes=12)
+
+        with FakeHTTPServer({"/steam/apps/": lambda path, query, headers: (200, {"Cache-Control": "max-age=300"}, b"12345")}) as server:
+            api = create_api(self.http_cache, {"/steam/apps/": None})
+            urls = [f"{server.url}/steam/apps/{steam_appid}" for steam_appid in range(3)]
+
+            for now, url in enumerate(urls[:2]):
+                self.http_cache.store(url, None, api._session.get(url), now=1000 + now)
+
+            self.http_cache.get(urls[0], now=1010)
+            self.http_cache.store(urls[2], None, api._session.get(urls[2]), now=1020)
+
+        self.assertIsNotNone(self.http_cache.get(urls[0], now=1030))
+        self.assertIsNone(self.http_cache.get(urls[1], now=1030))
+        self.assertIsNotNone(self.http_cache.get(urls[2], now=1030))
+
+    def test_replaced_entries_are_not_counted_twice(self):
+        self.http_cache.close()
+        self.http_cache = HTTPCache(max_size_bytes=12)
+
+        with FakeHTTPServer({"/steam/apps/": lambda path, query, headers: (200, {"Cache-Control": "max-age=300"}, b"12345")}) as server:
+            api = create_api(self.http_cache, {"/steam/apps/": None})
+            urls = [f"{server.url}/steam/apps/{steam_appid}" for steam_appid in range(2)]
+
+            for now, url in enumerate([urls[0], urls[0], urls[0], urls[1]]):
+                self.http_cache.store(url, None, api._session.get(url), now=1000 + now)
+
+        self.assertIsNotNone(self.http_cache.get(urls[0], now=1010))
+        self.assertIsNotNone(self.http_cache.get(urls[1], now=1010))
+
+    def test_total_size_is_counted_once_after_opening(self):
+        with FakeHTTPServer({"/steam/apps/": lambda path, query, headers: (200, {"Cache-Control": "max-age=300"}, b"x" * int(query.get("size", ["100"])[0]))}) as server:
+            api = create_api(self.http_cache, {})
+            url = f"{server.url}/steam/apps/10"
+            self.http_cache.store(url, None, api._session.get(url, params={"size": 100}))
+            fresh_total_size = self.http_cache.get_total_size()
+            self.http_cache.close()
+
+            self.http_cache = HTTPCache(max_size_bytes=1000)
+            self.http_cache.store(f"{server.url}/steam/apps/20", None, api._session.get(f"{server.url}/steam/apps/20", params={"size": 100}))
+            first_total_size = self.http_cache.get_total_size()
+            self.http_cache.store(url, None, api._session.get(url, params={"size": 250}))
+
+        self.assertEqual(fresh_total_size, 100)
+        self.assertEqual(first_total_size, 200)
+        self.assertEqual(self.http_cache.get_total_size(), 350)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import threading
+import time
+import unittest
+
+from image_downloader import ImageDownloader
+from requests import ConnectionError
+
+
+class ImageDownloaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.written = {}
+        self.writer_threads = set()
+
+    def write(self, steam_appid, image_bytes, image_name, file_type, source):
+        self.writer_threads.add(threading.current_thread().name)
+        self.written[(steam_appid, image_name)] = (image_bytes, file_type)
+
+    def test_failed_titles_do_not_stop_the_run(self):
+        def fetch(steam_appid, image_name):
+            if steam_appid == 2:
+                raise ValueError("bad response")
+            return (b"x" * steam_appid, "jpg", "steam") if steam_appid != 3 else None
+
+        tasks = [(steam_appid, image_name) for steam_appid in range(1, 6) for image_name in ("library_600x900_2x", "library_hero")]
+        statistics = ImageDownloader(max_workers=4).download(tasks, fetch, self.write)
+
+        self.assertEqual(statistics["downloaded"], 6)
+        self.assertEqual(statistics["failed"], 2)
+        self.assertEqual(statistics["missing"], 2)
+        self.assertEqual(statistics["bytes"], 2 * (1 + 4 + 5))
+        self.assertEqual(self.written[(5, "library_hero")], (b"xxxxx", "jpg"))
+        self.assertEqual(len(self.writer_threads), 1)
+
+    def test_fetches_run_in_parallel(self):
+        def fetch(steam_appid, image_name):
+            time.sleep(0.05)
+            return b"x", "png", "steamgriddb"
+
+        start = time.monotonic()
+        ImageDownloader(max_workers=10).download([(steam_appid, "library_hero") for steam_appid in range(20)], fetch, self.write)
+
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(len(self.written), 20)
+
+    def test_connection_loss_stops_remaining_fetches(self):
+        def fetch(steam_appid, image_name):
+            raise ConnectionError("offline")
+
+        statistics = ImageDownloader(max_workers=1, max_consecutive_connection_errors=3).download([(steam_appid, "library_hero") for steam_appid in range(10)], fetch, self.write)
+
+        self.assertEqual(statistics["failed"], 3)
+        self.assertEqual(statistics["skipped"], 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
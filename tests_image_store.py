@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from image_store import ImageStore
+
+
+class ImageStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.images_folder_path = tempfile.mkdtemp()
+        self.image_store = ImageStore(self.images_folder_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.images_folder_path)
+
+    def test_missing_images(self):
+        self.image_store.write_image(1, "library_hero", b"hero", "jpg", "steam")
+
+        missing_images = self.image_store.get_missing_images([1, 2])
+
+        self.assertEqual(missing_images, {"library_600x900_2x": {1, 2}, "library_hero": {2}})
+
+    def test_manifest_is_persisted(self):
+        self.image_store.write_image(1, "library_600x900_2x", b"grid", "png", "steamgriddb")
+        self.image_store.save_manifest()
+
+        image = ImageStore(self.images_folder_path).get_image(1, "library_600x900_2x")
+
+        self.assertEqual((image["size"], image["format"], image["source"]), (4, "png", "steamgriddb"))
+
+    def test_identical_images_are_deduplicated(self):
+        first_path = self.image_store.write_image(1, "library_hero", b"same bytes", "jpg", "steam")
+        second_path = self.image_store.write_image(2, "library_hero", b"same bytes", "jpg", "steam")
+
+        self.assertTrue(os.path.samefile(first_path, second_path))
+
+    def test_replacing_an_image_removes_the_previous_file(self):
+        first_path = self.image_store.write_image(1, "library_hero", b"jpg bytes", "jpg", "steam")
+        second_path = self.image_store.write_image(1, "library_hero", b"webp bytes", "webp", "steamgriddb")
+
+        self.assertFalse(os.path.exists(first_path))
+        with open(second_path, "rb") as image_file:
+            self.assertEqual(image_file.read(), b"webp bytes")
+        self.assertEqual(sorted(os.listdir(os.path.join(self.images_folder_path, "1"))), ["library_hero.webp"])
+
+    def test_variants_are_indexed_and_dropped_with_their_image(self):
+        self.image_store.write_image(1, "library_600x900_2x", b"grid", "jpg", "steam")
+        variant_path = self.image_store.create_variant_path(1, "library_600x900_2x", "tile", "webp")
+
+        with open(os.path.join(self.images_folder_path, variant_path), "wb") as variant_file:
+            variant_file.write(b"tile")
+
+        self.image_store.add_image_variant(1, "library_600x900_2x", "tile", {"path": variant_path, "format": "webp", "size": 4})
+
+        self.assertEqual(self.image_store.get_relative_image_path(1, "library_600x900_2x", "tile"), variant_path)
+        self.assertEqual(self.image_store.get_images_without_variants([1], {"library_600x900_2x": ["tile"]}), [])
+
+        self.image_store.write_image(1, "library_600x900_2x", b"new grid", "jpg", "steam")
+
+        self.assertFalse(os.path.exists(os.path.join(self.images_folder_path, variant_path)))
+        self.assertEqual(self.image_store.get_relative_image_path(1, "library_600x900_2x", "tile"), os.path.join("1", "library_600x900_2x.jpg"))
+        self.assertEqual(self.image_store.get_images_without_variants([1], {"library_600x900_2x": ["tile"]}), [(1, "library_600x900_2x", ["tile"])])
+
+    def test_existing_images_are_indexed_without_manifest(self):
+        os.makedirs(os.path.join(self.images_folder_path, "10"))
+        with open(os.path.join(self.images_folder_path, "10", "library_hero.jpg"), "wb") as image_file:
+            image_file.write(b"old image")
+
+        missing_images = ImageStore(self.images_folder_path).get_missing_images([10])
+
+        self.assertEqual(missing_images, {"library_600x900_2x": {10}, "library_hero": set()})
+        self.assertTrue(os.path.exists(os.path.join(self.images_folder_path, "manifest.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import io
+import shutil
+import tempfile
+import unittest
+
+from image_store import ImageStore
+from image_variants import Image, ImageVariantsProcessor
+
+
+class ImageVariantsProcessorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.images_folder_path = tempfile.mkdtemp()
+        self.image_store = ImageStore(self.images_folder_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.images_folder_path)
+
+    @unittest.skipUnless(Image, "Pillow is not installed")
+    def test_variants_are_smaller_and_recorded_in_the_manifest(self):
+        grid_file = io.BytesIO()
+        Image.effect_noise((600, 900), 64).convert("RGB").save(grid_file, format="JPEG", quality=95)
+        self.image_store.write_image(1, "library_600x900_2x", grid_file.getvalue(), "jpg", "steam")
+
+        statistics = ImageVariantsProcessor(self.image_store, max_workers=2).process([1])
+        variant = ImageStore(self.images_folder_path).get_image(1, "library_600x900_2x")["variants"]["tile"]
+
+        self.assertEqual(statistics["created"], 1)
+        self.assertEqual((variant["width"], variant["height"], variant["format"]), (200, 300, "webp"))
+        self.assertLess(variant["size"] * 5, len(grid_file.getvalue()))
+
+    @unittest.skipUnless(Image, "Pillow is not installed")
+    def test_small_batches_are_processed_in_process(self):
+        for steam_appid in range(1, 4):
+            grid_file = io.BytesIO()
+            Image.new("RGB", (600, 900)).save(grid_file, format="JPEG")
+            self.image_store.write_image(steam_appid, "library_600x900_2x", grid_file.getvalue(), "jpg", "steam")
+
+        small_batch_statistics = ImageVariantsProcessor(self.image_store, max_workers=2).process([1])
+        large_batch_statistics = ImageVariantsProcessor(self.image_store, max_workers=2, process_pool_min_variants=2).process([2, 3])
+
+        self.assertEqual((small_batch_statistics["created"], small_batch_statistics["processes"]), (1, False))
+        self.assertEqual((large_batch_statistics["created"], large_batch_statistics["processes"]), (2, True))
+
+    @unittest.skipIf(Image, "Pillow is installed")
+    def test_variants_are_skipped_without_pillow(self):
+        self.image_store.write_image(1, "library_600x900_2x", b"grid", "jpg", "steam")
+
+        statistics = ImageVariantsProcessor(self.image_store).process([1])
+
+        self.assertEqual((statistics["total"], statistics["skipped"], statistics["created"]), (1, 1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
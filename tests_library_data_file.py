@@ -0,0 +1,59 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from library_data_file import LibraryDataFile
+
+
+def create_library_data():
+    return {"response": "success",
+            "user_data": {"steamid": "1", "personaname": "Player"},
+            "games_data": {app_id: {"description": f"<p>Description {app_id}</p>", "developers": ["Developer"], "publishers": [], "categories": ["Single-player"],
+                                    "genres": ["Action"], "release_date": "14 Jan, 2021", "name": f"Game {app_id}"} for app_id in (10, 20, 30)},
+            "genres": {"Action": [10, 20, 30]},
+            "is_steam_installed": False}
+
+
+class LibraryDataFileTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.folder_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder_path)
+
+    def test_round_trip(self):
+        for compress in (False, True):
+            library_data = create_library_data()
+            LibraryDataFile(self.folder_path, compress=compress).write(library_data)
+
+            self.assertEqual(LibraryDataFile(self.folder_path, compress=compress).read(include_descriptions=True), library_data)
+
+    def test_descriptions_are_loaded_lazily(self):
+        library_data_file = LibraryDataFile(self.folder_path, compress=True)
+        library_data_file.write(create_library_data())
+
+        library_data = library_data_file.read()
+
+        self.assertNotIn("description", library_data["games_data"][20])
+        self.assertEqual(library_data_file.read_description(20), "<p>Description 20</p>")
+        self.assertEqual(library_data_file.read_descriptions([30, 10]), {10: "<p>Description 10</p>", 30: "<p>Description 30</p>"})
+
+    def test_legacy_file_is_read_and_replaced(self):
+        library_data = create_library_data()
+        with open(os.path.join(self.folder_path, "data.json"), "w") as legacy_file:
+            json.dump(library_data, legacy_file, indent=5)
+
+        library_data_file = LibraryDataFile(self.folder_path)
+        self.assertEqual(library_data_file.read(), library_data)
+
+        library_data_file.write(library_data)
+
+        self.assertFalse(os.path.exists(os.path.join(self.folder_path, "data.json")))
+        self.assertEqual(len([file_name for file_name in os.listdir(self.folder_path) if file_name.startswith("data_descriptions_")]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from apis import SteamAPI, SteamGridAPI
+from databases import GamesDatabase
+from fake_http_server import FakeHTTPServer
+from image_store import ImageStore
+from library_data_manager import LibraryDataManager
+
+
+def not_found_route(path, query, headers):
+    return 404, {"Content-Type": "application/json"}, b'{"success": false}'
+
+
+def unavailable_route(path, query, headers):
+    return 500, {}, b""
+
+
+def app_details_route(path, query, headers):
+    steam_appid = query["appids"][0]
+    return 200, {"Content-Type": "application/json"}, json.dumps({steam_appid: {"success": steam_appid != "30", "data": {"detailed_description": f"Game {steam_appid}"}}}).encode()
+
+
+class LibraryDataManagerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_directory = os.getcwd()
+        self.working_directory = tempfile.mkdtemp()
+        os.chdir(self.working_directory)
+        self.games_db = GamesDatabase()
+
+    def tearDown(self):
+        self.games_db.close()
+        os.chdir(self.previous_directory)
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def create_apis(self, server_url):
+        class FakeSteamAPI(SteamAPI):
+            _cdn_url = server_url
+            _store_url = server_url
+            _retry_total = 0
+
+        class FakeSteamGridAPI(SteamGridAPI):
+            _api_url = server_url + "/api/v2"
+            _retry_total = 0
+
+        return FakeSteamAPI("key"), FakeSteamGridAPI("key")
+
+    def create_data_manager(self, server_url):
+        return LibraryDataManager("1", "key", "key", *self.create_apis(server_url), self.games_db, ImageStore(os.path.join("src", "images")))
+
+    def test_missing_artwork_is_not_requested_again(self):
+        with FakeHTTPServer({"/": not_found_route}) as server:
+            data_manager = self.create_data_manager(server.url)
+            first_statistics = data_manager.get_images({10: "Game 10", 20: "Game 20"})
+            first_requests_count = len(server.requests_log)
+            second_statistics = data_manager.get_images({10: "Game 10", 20: "Game 20"})
+
+        self.assertEqual(first_requests_count, 8)
+        self.assertEqual(len(server.requests_log), first_requests_count)
+        self.assertEqual(first_statistics["missing"], 4)
+        self.assertEqual(second_statistics["missing"], 4)
+        self.assertEqual(self.games_db.get_missing_image_sources(10, "library_hero"), {"steam", "steamgriddb"})
+
+    def test_server_errors_are_not_cached_as_missing(self):
+        with FakeHTTPServer({"/": unavailable_route}) as server:
+            self.create_data_manager(server.url).get_images({10: "Game 10"})
+
+        self.assertEqual(self.games_db.get_missing_image_sources(10, "library_hero"), set())
+
+    def test_missing_artwork_expires(self):
+        self.games_db.add_missing_images([(10, "library_hero", "steam")], checked_at=0)
+
+        self.assertEqual(self.games_db.get_missing_image_sources(10, "library_hero", now=GamesDatabase.MISSING_IMAGE_RETRY_SEC - 1), {"steam"})
+        self.assertEqual(self.games_db.get_missing_image_sources(10, "library_hero", now=GamesDatabase.MISSING_IMAGE_RETRY_SEC + 1), set())
+
+    def test_interrupted_crawl_keeps_pending_games(self):
+        with FakeHTTPServer({"/": not_found_route}) as server:
+            server_url = server.url
+
+        games_data = self.create_data_manager(server_url).get_games_details({10: "Game 10", 20: "Game 20"})
+
+        self.assertEqual(games_data[10]["name"], "Game 10")
+        self.assertEqual(self.games_db.get_pending_appdetails(), {10: "Game 10", 20: "Game 20"})
+
+    def test_pending_games_are_resumed_and_saved_per_chunk(self):
+        self.games_db.add_pending_appdetails({40: "Game 40"}, queued_at=0)
+
+        with FakeHTTPServer({"/api/appdetails": app_details_route}) as server:
+            data_manager = self.create_data_manager(server.url)
+            games_data = data_manager.get_games_details({10: "Game 10", 20: "Game 20", 30: "Game 30"})
+
+        self.assertEqual(sorted(games_data), [10, 20, 30])
+        self.assertEqual(games_data[20]["description"], "Game 20")
+        self.assertEqual(sorted(self.games_db.get_games([10, 20, 30, 40])), [10, 20, 40])
+        self.assertEqual(self.games_db.get_recently_failed_appids([30]), {30})
+        self.assertEqual(self.games_db.get_pending_appdetails(), {})
+
+    def test_apps_details_are_reported_per_chunk(self):
+        chunks = []
+
+        with FakeHTTPServer({"/api/appdetails": app_details_route}) as server:
+            steam_api, _ = self.create_apis(server.url)
+            apps_details, failed_apps_ids = steam_api.get_apps_details([10, 20, 30, 40, 50], {steam_appid: "Game" for steam_appid in range(10, 60, 10)}, 
+                                                                       lambda games_data, failed_apps_ids: chunks.append((sorted(games_data), failed_apps_ids)), chunk_size=2)
+
+        self.assertEqual(chunks, [([10, 20], []), ([40], [30]), ([50], [])])
+        self.assertEqual((sorted(apps_details), failed_apps_ids), ([10, 20, 40, 50], [30]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from apis import SteamAPI, SteamGridAPI
+from databases import GamesDatabase
+from fake_http_server import FakeHTTPServer
+from http_cache import HTTPCache
+from image_store import ImageStore
+from library import Library
+from library_data_manager import LibraryDataManager
+
+
+GENRES = {10: "Action", 20: "RPG", 30: "Action", 40: "Strategy", 50: "RPG"}
+RELEASE_DATES = {10: "14 Jan, 2015", 20: "2 Mar, 2021", 30: "Q3 2009", 40: "Coming soon", 50: "7 Nov, 2018"}
+
+
+def json_response(body, headers=None):
+    return 200, dict({"Content-Type": "application/json"}, **(headers or {})), json.dumps(body).encode()
+
+
+def player_summaries_route(path, query, headers):
+    return json_response({"response": {"players": [{"personaname": "User", "avatarfull": "", "profileurl": ""}]}})
+
+
+def create_owned_games_route(owned_games):
+    def owned_games_route(path, query, headers):
+        body = json.dumps({"response": {"games": [{"appid": steam_appid, "name": name} for steam_appid, name in owned_games.items()]}}).encode()
+        etag = '"' + hashlib.sha256(body).hexdigest() + '"'
+
+        if headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+
+        return 200, {"Content-Type": "application/json", "ETag": etag}, body
+
+    return owned_games_route
+
+
+def app_details_route(path, query, headers):
+    steam_appid = int(query["appids"][0])
+    return json_response({str(steam_appid): {"success": True, "data": {"detailed_description": f"Description {steam_appid}",
+                                                                       "developers": [f"Studio {steam_appid % 20}"],
+                                                                       "genres": [{"description": GENRES[steam_appid]}],
+                                                                       "release_date": {"date": RELEASE_DATES[steam_appid]}}}})
+
+
+def not_found_route(path, query, headers):
+    return 404, {}, b""
+
+
+class LibraryOfflineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_directory = os.getcwd()
+        self.working_directory = tempfile.mkdtemp()
+        os.chdir(self.working_directory)
+        self.games_db = GamesDatabase()
+        self.http_cache = HTTPCache()
+        self.owned_games = {10: "Game 10", 20: "Game 20"}
+        self.server = FakeHTTPServer({"/ISteamUser": player_summaries_route, "/IPlayerService": create_owned_games_route(self.owned_games),
+                                      "/api/appdetails": app_details_route, "/": not_found_route})
+        self.server.__enter__()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        self.http_cache.close()
+        self.games_db.close()
+        os.chdir(self.previous_directory)
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def create_library(self):
+        server_url = self.server.url
+
+        class FakeSteamAPI(SteamAPI):
+            _api_url = server_url
+            _cdn_url = server_url
+            _store_url = server_url
+            _rate_limits = {}
+            _retry_total = 0
+
+        class FakeSteamGridAPI(SteamGridAPI):
+            _api_url = server_url + "/api/v2"
+            _rate_limits = {}
+            _retry_total = 0
+
+        data_manager = LibraryDataManager("1", "key", "key", FakeSteamAPI("key", http_cache=self.http_cache), FakeSteamGridAPI("key", http_cache=self.http_cache),
+                                          self.games_db, ImageStore(os.path.join("src", "images")))
+
+        return Library("1", "key", "key", data_manager)
+
+    def test_refresh_applies_added_and_removed_games(self):
+        self.create_library().create_user_library()
+        self.owned_games.pop(10)
+        self.owned_games.update({30: "Game 30", 40: "Game 40"})
+
+        library = self.create_library()
+        library_delta = library.refresh_user_library()
+
+        self.assertTrue(library_delta["incremental"])
+        self.assertEqual(sorted(library_delta["added_games"]), [30, 40])
+        self.assertEqual(library_delta["added_games"][30]["genres"], ("Action",))
+        self.assertEqual(library_delta["removed_games"], [10])
+        self.assertEqual(library_delta["genres"], {"RPG": [20], "Action": [30], "Strategy": [40]})
+        self.assertEqual(library.get_library_summary()["games_count"], 3)
+
+    def test_refresh_saves_the_updated_library(self):
+        self.create_library().create_user_library()
+        self.owned_games[30] = "Game 30"
+        self.create_library().refresh_user_library()
+
+        library = self.create_library()
+        library_summary = library.load_user_library()
+
+        self.assertTrue(library_summary["cached"])
+        self.assertEqual(library_summary["games_count"], 3)
+        self.assertEqual(library_summary["genres"], {"Action": 2, "RPG": 1})
+        self.assertEqual(library.get_game_description(30), "Description 30")
+
+        with open(os.path.join("library", "data", "1", "owned_games.json")) as owned_games_file:
+            self.assertEqual(json.load(owned_games_file), {"10": "Game 10", "20": "Game 20", "30": "Game 30"})
+
+    def test_refresh_without_saved_library_builds_it(self):
+        library = self.create_library()
+        library_data = library.refresh_user_library()
+
+        self.assertEqual(library_data["response"], "success")
+        self.assertNotIn("incremental", library_data)
+        self.assertEqual(sorted(library_data["games_data"]), [10, 20])
+        self.assertEqual(library.get_library_summary()["games_count"], 2)
+        self.assertTrue(self.create_library().load_user_library()["cached"])
+
+    def test_responses_when_library_is_not_loaded(self):
+        library = self.create_library()
+
+        self.assertEqual(library.get_library_summary(), {"response": "library not loaded"})
+        self.assertEqual(library.get_games_page(), {"response": "library not loaded"})
+        self.assertEqual(library.filter_games(), {"response": "library not loaded"})
+        self.assertEqual(library.get_games_states(), {})
+        self.assertIsNone(library.get_game_description(10))
+
+    def test_load_user_library_builds_missing_library(self):
+        library_summary = self.create_library().load_user_library()
+
+        self.assertEqual(library_summary["response"], "success")
+        self.assertFalse(library_summary["cached"])
+        self.assertEqual(library_summary["games_count"], 2)
+
+    def test_games_page_bounds(self):
+        self.owned_games.update({30: "Game 30", 40: "Game 40", 50: "Game 50"})
+        library = self.create_library()
+        library.create_user_library()
+
+        pages = [library.get_games_page(offset, limit) for offset, limit in ((0, 2), (4, 10), (10, 5), (-3, 1), (1, 0))]
+
+        self.assertEqual([[game["steam_appid"] for game in page["games"]] for page in pages], [[10, 20], [50], [], [10], []])
+        self.assertEqual({page["total"] for page in pages}, {5})
+        self.assertNotIn("description", pages[0]["games"][0])
+        self.assertIn("grid_image", pages[0]["games"][0])
+
+    def test_games_page_filters_and_sorting(self):
+        self.owned_games.update({30: "Game 30", 40: "Game 40", 50: "Game 50"})
+        library = self.create_library()
+        library.create_user_library()
+
+        def get_steam_apps_ids(**options):
+            return [game["steam_appid"] for game in library.get_games_page(**options)["games"]]
+
+        self.assertEqual(get_steam_apps_ids(descending=True), [50, 40, 30, 20, 10])
+        self.assertEqual(get_steam_apps_ids(genre="RPG"), [20, 50])
+        self.assertEqual(get_steam_apps_ids(genre="Action", descending=True), [30, 10])
+        self.assertEqual(get_steam_apps_ids(developer="Studio 10"), [10, 30, 50])
+        self.assertEqual(get_steam_apps_ids(search="game 4"), [40])
+        self.assertEqual(get_steam_apps_ids(sort_by="release_date"), [30, 10, 50, 20, 40])
+        self.assertEqual(library.filter_games(genres=["RPG"], sort_by="release_date", descending=True), {"response": "success", "total": 2, "steam_apps_ids": [20, 50]})
+
+    def test_unknown_sort_keys_are_rejected(self):
+        library = self.create_library()
+        library.create_user_library()
+
+        self.assertEqual(library.get_games_page(sort_by="description"), {"response": "invalid sort"})
+        self.assertEqual(library.filter_games(sort_by="publishers"), {"response": "invalid sort"})
+        self.assertEqual(library.get_games_page(sort_by="steam_appid")["total"], 2)
+
+    def test_game_descriptions_are_loaded_lazily(self):
+        self.create_library().create_user_library()
+
+        library = self.create_library()
+        library.load_user_library()
+
+        self.assertEqual(library.get_game_description(20), "Description 20")
+        self.assertIsNone(library.get_game_description(99))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import unittest
+
+from apis import SteamGridAPI
+from fake_http_server import FakeHTTPServer
+from metrics import Histogram, Metrics, metrics
+
+
+class MetricsTestCase(unittest.TestCase):
+
+    def test_counters_and_gauges_are_kept_per_labels(self):
+        metrics = Metrics()
+        metrics.increment("http_requests_total", status="200")
+        metrics.increment("http_requests_total", 2, status="200")
+        metrics.increment("http_requests_total", status="429")
+        metrics.set_gauge("build_stage_running", 1, stage="images")
+
+        counters = {(counter["name"], counter["labels"]["status"]): counter["value"] for counter in metrics.to_dict()["counters"]}
+
+        self.assertEqual(counters, {("http_requests_total", "200"): 3, ("http_requests_total", "429"): 1})
+        self.assertEqual(metrics.get_gauges("build_stage_running"), {(("stage", "images"),): 1})
+
+    def test_histogram_summary_quantiles(self):
+        histogram = Histogram((0.01, 0.1, 1))
+
+        for value in [0.005] * 90 + [0.05] * 9 + [0.5]:
+            histogram.observe(value)
+
+        summary = histogram.summarize()
+
+        self.assertEqual(summary["count"], 100)
+        self.assertEqual(summary["p50"], 0.01)
+        self.assertEqual(summary["p95"], 0.1)
+        self.assertEqual(summary["p99"], 0.1)
+        self.assertEqual(summary["max"], 0.5)
+
+    def test_timer_records_observation(self):
+        metrics = Metrics()
+
+        with metrics.timer("db_operation_seconds", table="Games", operation="select"):
+            pass
+
+        histogram, = metrics.to_dict()["histograms"]
+
+        self.assertEqual(histogram["name"], "db_operation_seconds")
+        self.assertEqual(histogram["labels"], {"table": "Games", "operation": "select"})
+        self.assertEqual(histogram["count"], 1)
+
+    def test_prometheus_format(self):
+        metrics = Metrics()
+        metrics.increment("http_requests_total", status="200")
+        metrics.observe("stage_seconds", 0.2, stage="images")
+
+        lines = metrics.to_prometheus().splitlines()
+
+        self.assertIn("# TYPE http_requests_total counter", lines)
+        self.assertIn('http_requests_total{status="200"} 1', lines)
+        self.assertIn('stage_seconds_bucket{stage="images",le="0.25"} 1', lines)
+        self.assertIn('stage_seconds_bucket{stage="images",le="+Inf"} 1', lines)
+        self.assertIn('stage_seconds_count{stage="images"} 1', lines)
+
+    def test_disabled_metrics_record_nothing(self):
+        metrics = Metrics(enabled=False)
+        metrics.increment("http_requests_total")
+        metrics.set_gauge("build_images_total", 10)
+
+        with metrics.timer("image_write_seconds"):
+            pass
+
+        self.assertEqual(metrics.to_dict(), {"counters": [], "gauges": [], "histograms": []})
+
+    def test_http_endpoints_labels_are_bounded(self):
+        def grids_route(path, query, headers):
+            steam_appid = path.split("?")[0].rsplit("/", 1)[-1]
+            return 200, {"Content-Type": "application/json"}, json.dumps({"success": True, "data": [{"url": f"{server.url}/grid/{steam_appid}f3a9c0e1b2.png"}]}).encode()
+
+        def image_route(path, query, headers):
+            return 200, {"Content-Type": "image/png"}, b"image"
+
+        metrics.reset()
+
+        with FakeHTTPServer({"/api/v2/grids/steam/": grids_route, "/grid/": image_route}) as server:
+            class FakeSteamGridAPI(SteamGridAPI):
+                _api_url = server.url + "/api/v2"
+                _rate_limits = {}
+
+            api = FakeSteamGridAPI("key")
+
+            for steam_appid in range(10, 15):
+                api.get_grid(steam_appid)
+
+        endpoints = {counter["labels"]["endpoint"]: counter["value"] for counter in metrics.to_dict()["counters"] if counter["name"] == "http_requests_total"}
+        metrics.reset()
+
+        self.assertEqual(endpoints, {"/api/v2/grids/steam/": 5, "/grid/": 5})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from release_dates import parse_release_date
+
+
+class ReleaseDatesTestCase(unittest.TestCase):
+
+    def test_store_formats(self):
+        self.assertEqual(parse_release_date("14 Jan, 2021"), ("2021-01-14", "day"))
+        self.assertEqual(parse_release_date("Jan 14, 2021"), ("2021-01-14", "day"))
+        self.assertEqual(parse_release_date("2021-01-14"), ("2021-01-14", "day"))
+
+    def test_localized_formats(self):
+        self.assertEqual(parse_release_date("14 ENE 2021"), ("2021-01-14", "day"))
+        self.assertEqual(parse_release_date("14 de enero de 2021"), ("2021-01-14", "day"))
+        self.assertEqual(parse_release_date("14. Jan. 2021"), ("2021-01-14", "day"))
+        self.assertEqual(parse_release_date("14/01/2021"), ("2021-01-14", "day"))
+
+    def test_partial_dates_keep_their_precision(self):
+        self.assertEqual(parse_release_date("January 2021"), ("2021-01-01", "month"))
+        self.assertEqual(parse_release_date("Q3 2022"), ("2022-07-01", "month"))
+        self.assertEqual(parse_release_date("2021"), ("2021-01-01", "year"))
+
+    def test_unparseable_dates_are_unknown(self):
+        for release_date in ("Coming soon", "To be announced", "", None, "31 Feb, 2021"):
+            self.assertEqual(parse_release_date(release_date), (None, "unknown"))
+
+
+if __name__ == "__main__":
+    unittest.main()
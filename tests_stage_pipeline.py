@@ -0,0 +1,64 @@
+import threading
+import time
+import unittest
+
+from stage_pipeline import StagePipeline
+
+
+class StagePipelineTestCase(unittest.TestCase):
+
+    def test_independent_stages_overlap(self):
+        pipeline = StagePipeline()
+        pipeline.add_stage("owned_games", lambda: {1: "Game"})
+        pipeline.add_stage("games_data", lambda owned_games: time.sleep(0.2) or {"games": len(owned_games)}, ("owned_games",))
+        pipeline.add_stage("images", lambda owned_games: time.sleep(0.2) or {"images": len(owned_games)}, ("owned_games",))
+
+        start = time.monotonic()
+        results = pipeline.run()
+
+        self.assertLess(time.monotonic() - start, 0.35)
+        self.assertEqual(results["games_data"], {"games": 1})
+        self.assertEqual(results["images"], {"images": 1})
+        self.assertGreaterEqual(pipeline.timings["games_data"], 0.2)
+        self.assertIn("total", pipeline.timings)
+
+    def test_dependencies_receive_results_in_order(self):
+        owned_games_ready = threading.Event()
+        pipeline = StagePipeline()
+        pipeline.add_stage("user_data", lambda: {"name": "user"})
+        pipeline.add_stage("owned_games", lambda: owned_games_ready.set() or {1: "Game"})
+        pipeline.add_stage("games_data", lambda user_data, owned_games: (owned_games_ready.is_set(), user_data["name"], list(owned_games)), ("user_data", "owned_games"))
+
+        self.assertEqual(pipeline.run()["games_data"], (True, "user", [1]))
+
+    def test_missing_results_skip_dependent_stages(self):
+        calls = []
+        pipeline = StagePipeline()
+        pipeline.add_stage("user_data", lambda: None)
+        pipeline.add_stage("owned_games", lambda: {1: "Game"})
+        pipeline.add_stage("images", lambda user_data, owned_games: calls.append("images") or {}, ("user_data", "owned_games"))
+
+        results = pipeline.run()
+
+        self.assertNotIn("user_data", results)
+        self.assertIn("owned_games", results)
+        self.assertEqual(calls, [])
+
+    def test_stage_errors_are_raised_after_running_stages_finish(self):
+        finished = threading.Event()
+        pipeline = StagePipeline()
+        pipeline.add_stage("slow", lambda: time.sleep(0.1) or finished.set() or True)
+        pipeline.add_stage("broken", lambda: 1 / 0)
+
+        with self.assertRaises(ZeroDivisionError):
+            pipeline.run()
+
+        self.assertTrue(finished.is_set())
+
+    def test_unknown_dependencies_are_rejected(self):
+        with self.assertRaises(ValueError):
+            StagePipeline().add_stage("images", lambda owned_games: {}, ("owned_games",))
+
+
+if __name__ == "__main__":
+    unittest.main()
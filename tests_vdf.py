@@ -0,0 +1,21 @@
+import unittest
+
+from vdf import parse_vdf
+
+
+class ParseVDFTestCase(unittest.TestCase):
+
+    def test_nested_objects_comments_and_escapes(self):
+        text = ('\ufeff"AppState"\n{\n\t// comment\n\t"appid"\t\t"440"\n\t"name"\t\t"Team \\"Fortress\\" 2"\n\t"installdir"\t\t"C:\\\\Games\\\\TF2"\n'
+                '\tUserConfig\n\t{\n\t\tlanguage\t\tenglish [$WIN32]\n\t}\n}\n')
+
+        self.assertEqual(parse_vdf(text), {"AppState": {"appid": "440", "name": 'Team "Fortress" 2', "installdir": "C:\\Games\\TF2", "UserConfig": {"language": "english"}}})
+
+    def test_malformed_text_raises_value_error(self):
+        for text in ('"AppState" {', '"AppState" { "appid" }', '"appid" "440" }', '"appid"', '"appid" "44'):
+            with self.assertRaises(ValueError):
+                parse_vdf(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
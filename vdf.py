@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import re
+
+from typing import Any
+
+
+TOKEN_PATTERN = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"|([{}])|//[^\n]*|\[[^\]\n]*\]|([^\s{}"]+)', re.DOTALL)
+ESCAPE_PATTERN = re.compile(r"\\(.)", re.DOTALL)
+ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
+
+VDFObject = dict[str, Any]
+
+
+def parse_vdf(text: str) -> VDFObject:
+    text = text.lstrip("\ufeff")
+    root = {}
+    objects = [root]
+    key = None
+    position = 0
+
+    for match in TOKEN_PATTERN.finditer(text):
+        quoted_value, brace, unquoted_value = match.groups()
+
+        if position != match.start() and not text[position:match.start()].isspace():
+            raise ValueError(f"Unexpected character at {position}")
+
+        position = match.end()
+
+        if brace == "{":
+            if key is None:
+                raise ValueError(f"Object without key at {match.start()}")
+
+            objects[-1][key] = objects[-1].get(key) if isinstance(objects[-1].get(key), dict) else {}
+            objects.append(objects[-1][key])
+            key = None
+
+        elif brace == "}":
+            if key is not None or len(objects) == 1:
+                raise ValueError(f"Unexpected '}}' at {match.start()}")
+
+            objects.pop()
+
+        elif quoted_value is not None or unquoted_value is not None:
+            value = quoted_value if quoted_value is not None else unquoted_value
+
+            if quoted_value is not None and "\\" in value:
+                value = ESCAPE_PATTERN.sub(lambda escape: ESCAPES.get(escape.group(1), escape.group()), value)
+
+            if key is None:
+                key = value
+            else:
+                objects[-1][key] = value
+                key = None
+
+    if key is not None or len(objects) != 1 or text[position:].strip():
+        raise ValueError("Unexpected end of file")
+
+    return root
+
+
+def lower_keys(vdf_object: VDFObject) -> VDFObject:
+    return {key.lower(): value for key, value in vdf_object.items()}